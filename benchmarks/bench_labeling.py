@@ -0,0 +1,775 @@
+"""
+SASA POY - Video Etiketleme Sistemi
+Performans ölçüm seti (benchmark)
+
+ffmpeg `lavfi` kaynaklarıyla deterministik HEVC/H.264 test videoları ve
+10-100k segmentlik sentetik etiket setleri üretir; okuyucu ve etiketleme
+sıcak yollarını ölçüp sonuçları JSON olarak yazar.
+
+Kullanım:
+  python benchmarks/bench_labeling.py                   # tam set
+  python benchmarks/bench_labeling.py --quick           # kısa set
+  python benchmarks/bench_labeling.py --out sonuc.json
+  python benchmarks/bench_labeling.py --compare eski.json yeni.json
+
+Ölçülenler:
+  probe       : ffprobe süresi ve .prep.json kaydından FFmpegVideoReader açılışı
+  seek        : read_frame_at gecikme yüzdelikleri
+  playback    : her hızda sürdürülebilir oynatma fps'i (_play_loop mantığı)
+  playback_roi: ffmpeg içinde kırpılan merkez bölge (ROI) ile aynı ölçüm
+  canvas      : okuma + tuvale hazırlama (_display_frame'in resize/renk adımları), tam kare ve ROI
+  display     : _display_frame maliyeti (Tk ekranı varsa)
+  save        : .labels.json yazma gecikmesi
+  load        : .labels.json okuma gecikmesi ve etiket listesinin bellek tutarı
+  stats       : istatistik paneli metni
+  timeline    : zaman çizelgesi için piksel sütunu başına kategori aralıkları
+  report      : metin raporu
+  startup     : soğuk içe aktarma süreleri (çekirdek / arayüz)
+  multiview   : 3 kameralı tek-süreç mozaik oynatma (kod çözme kademeleriyle) ve seek
+  session     : bölünmüş dosyalar arası sınır geçişinde kare gecikmesi
+  agreement   : 24 saatlik iki etiketleyici setinin kare düzeyi uyumu ve uzlaşısı
+  server      : yerel sunucudan iki istemcinin eşzamanlı kare akışı (soğuk/önbellekli)
+  burnin      : etiketleri kareye yakarak dışa aktarma hızı (gerçek zamanın katı)
+  precompute  : arka plan ön hesaplama işlerinin süresi; klasör taşındıktan sonra tekrar eden iş
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from labeling_core import (  # noqa: E402
+    FFmpegVideoReader,
+    MultiViewReader,
+    PerfMonitor,
+    RemoteClient,
+    RemoteVideoReader,
+    SessionReader,
+    LABEL_KATMA_DEGERLI,
+    LABEL_DIGER,
+    calculate_cycle_times,
+    format_stats,
+    load_label_file,
+    make_entry,
+    normalize_roi,
+    save_label_file,
+    set_cache_dir,
+    timeline_runs,
+    write_report,
+)
+from labeling_core import cache  # noqa: E402
+from labeling_core.lazy import lazy_import  # noqa: E402
+from labeling_core.burnin import export_burnin  # noqa: E402
+from labeling_core.precompute import PrecomputeScheduler, job_proxy  # noqa: E402
+from labeling_core.reader import probe_video  # noqa: E402
+from labeling_core.agreement import analyze_agreement  # noqa: E402
+
+cv2 = lazy_import("cv2")
+
+# ─── Sabitler ───────────────────────────────────────────────────────
+FIXTURE_FPS = 25
+TIMELINE_WIDTH = 1600   # zaman çizelgesi tuvali (piksel)
+CANVAS_SIZE = (960, 540)   # labeling_app.CANVAS_W/H
+
+# (codec, genişlik, yükseklik, GOP)
+FIXTURES_FULL = [
+    ("hevc", 1920, 1080, 25),
+    ("hevc", 1920, 1080, 250),
+    ("hevc", 1280, 720, 50),
+    ("h264", 1920, 1080, 250),
+    ("h264", 640, 360, 25),
+]
+FIXTURES_QUICK = [
+    ("hevc", 1280, 720, 50),
+    ("h264", 640, 360, 25),
+]
+
+LABEL_SET_SIZES_FULL = [10, 1_000, 10_000, 100_000]
+LABEL_SET_SIZES_QUICK = [10, 10_000]
+
+PLAYBACK_SPEEDS = [0.25, 0.5, 1.0, 1.5, 2.0, 4.0, 8.0]
+ROI_SPEEDS = [1.0, 4.0]
+
+# Çoklu kamera: (codec, genişlik, yükseklik, GOP), kamera sayısı
+MULTIVIEW_FULL = (("hevc", 1920, 1080, 250), 3)
+MULTIVIEW_QUICK = (("hevc", 1280, 720, 50), 3)
+MULTIVIEW_SPEEDS = [1.0, 2.0]
+MULTIVIEW_LEVELS = ("full", "proxy", "skip_loop_filter")   # MultiViewReader.decode_level sırası
+
+ENCODERS = {
+    "hevc": ["-c:v", "libx265", "-x265-params", "log-level=error"],
+    "h264": ["-c:v", "libx264"],
+}
+
+
+def _percentiles(samples):
+    """Örneklerden ms cinsinden özet yüzdelikler."""
+    if not samples:
+        return {}
+    s = sorted(samples)
+    n = len(s)
+
+    def pick(p):
+        return round(s[min(n - 1, int(p / 100.0 * n))] * 1000, 3)
+
+    return {
+        "n": n,
+        "mean_ms": round(sum(s) / n * 1000, 3),
+        "p50_ms": pick(50),
+        "p90_ms": pick(90),
+        "p99_ms": pick(99),
+        "max_ms": round(s[-1] * 1000, 3),
+    }
+
+
+# ─── Test verisi ────────────────────────────────────────────────────
+def make_fixture(out_dir, codec, width, height, gop, duration):
+    """lavfi testsrc2 ile deterministik test videosu üret (varsa yeniden kullan)."""
+    name = f"bench_{codec}_{width}x{height}_g{gop}_{duration}s.mp4"
+    path = os.path.join(out_dir, name)
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        return path
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={FIXTURE_FPS}:duration={duration}",
+        *ENCODERS[codec],
+        "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+        "-pix_fmt", "yuv420p", "-preset", "veryfast",
+        path,
+    ]
+    subprocess.run(cmd, check=True)
+    return path
+
+
+def make_label_set(count, fps=FIXTURE_FPS, seed=1234):
+    """Ardışık KDİ/Diğer segmentlerinden oluşan sentetik etiket listesi."""
+    rng = random.Random(seed + count)
+    labels = []
+    frame = 0
+    for i in range(count):
+        label = LABEL_KATMA_DEGERLI if i % 2 == 0 else LABEL_DIGER
+        length = rng.randint(2 * int(fps), 90 * int(fps))
+        start, end = frame, frame + length
+        labels.append(make_entry(start, end, label))
+        frame = end + rng.randint(0, 5 * int(fps))
+    return labels, frame
+
+
+# ─── Uygulama iskeleti ──────────────────────────────────────────────
+def _make_tk_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        return root
+    except Exception:
+        return None
+
+
+def _bench_app(tk_root):
+    """Pencere açmadan _display_frame çalıştıracak VideoLabelingApp örneği."""
+    import tkinter as tk
+    import labeling_app
+
+    app = labeling_app.VideoLabelingApp.__new__(labeling_app.VideoLabelingApp)
+    app.root = tk_root
+    app.fps = float(FIXTURE_FPS)
+    app.current_frame = 0
+    app.current_label = None
+    app.perf = PerfMonitor()
+    app.canvas = tk.Canvas(tk_root, width=labeling_app.CANVAS_W, height=labeling_app.CANVAS_H)
+    return app
+
+
+# ─── Ölçümler ───────────────────────────────────────────────────────
+def bench_probe(path, repeat):
+    """ffprobe ile soğuk probe; okuyucu açılışı ise .prep.json kaydından."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        probe_video(path)
+        samples.append(time.perf_counter() - t0)
+    FFmpegVideoReader(path)
+    cached = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        FFmpegVideoReader(path)
+        cached.append(time.perf_counter() - t0)
+    return {**_percentiles(samples), "cached": _percentiles(cached)}
+
+
+def bench_seek(reader, repeat, seed=42):
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(repeat):
+        t = rng.uniform(0, max(0.0, reader.duration - 0.5))
+        t0 = time.perf_counter()
+        ok, _ = reader.read_frame_at(t)
+        samples.append(time.perf_counter() - t0)
+        if not ok:
+            return {"error": f"seek başarısız: {t:.3f}s"}
+    return _percentiles(samples)
+
+
+def bench_playback(reader, speed, seconds, to_canvas=False):
+    """_play_loop'un okuma + kare atlama mantığını uykusuz koştur.
+
+    Sonuç, ulaşılabilen gösterim fps'ini ve hedefe oranını verir
+    (realtime_factor >= 1 ise bu hız takılmadan oynatılabilir).
+    decoder_lead_frames, okuyucu konumunun gösterilen karenin kaç kare
+    önünde olduğudur: sınırı okuyucu konumundan alan eski yolun hatası.
+    to_canvas=True gösterilen kareyi _display_frame gibi tuval boyutuna
+    getirip RGB'ye çevirir (Tk olmadan arayüz maliyeti).
+    """
+    skip = max(1, int(speed)) - 1
+    reader.start_streaming(0.0)
+    shown = decoded = lead = 0
+    frame_samples = []
+    t_start = time.perf_counter()
+    try:
+        while time.perf_counter() - t_start < seconds:
+            t0 = time.perf_counter()
+            frame_no = reader.current_frame_number
+            ret, frame = reader.read_next_frame()
+            if not ret:
+                break
+            decoded += 1
+            if to_canvas:
+                if frame.shape[1] != CANVAS_SIZE[0] or frame.shape[0] != CANVAS_SIZE[1]:
+                    frame = cv2.resize(frame, CANVAS_SIZE)
+                cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if reader.skip_frames(skip):
+                decoded += skip
+            lead = max(lead, reader.current_frame_number - frame_no)
+            shown += 1
+            frame_samples.append(time.perf_counter() - t0)
+    finally:
+        reader.stop_streaming()
+    wall = time.perf_counter() - t_start
+    target_fps = reader.fps * speed
+    achieved = shown / wall if wall else 0.0
+    return {
+        "speed": speed,
+        "shown_frames": shown,
+        "decoded_frames": decoded,
+        "achieved_fps": round(achieved, 2),
+        "target_fps": round(target_fps, 2),
+        "realtime_factor": round(achieved / target_fps, 3) if target_fps else 0.0,
+        "decoder_lead_frames": lead,
+        "frame": _percentiles(frame_samples),
+    }
+
+
+def bench_display(tk_root, reader, repeat):
+    if tk_root is None:
+        return {"skipped": "Tk ekranı yok"}
+    app = _bench_app(tk_root)
+    ok, frame = reader.read_frame_at(min(1.0, reader.duration / 2))
+    if not ok:
+        return {"error": "kare okunamadı"}
+    results = {}
+    for name, active in (("idle", None), ("recording", LABEL_KATMA_DEGERLI)):
+        app.current_label = {"label": active, "start_frame": 0, "start_time": 0.0} if active else None
+        samples = []
+        for i in range(repeat):
+            app.current_frame = i
+            t0 = time.perf_counter()
+            app._display_frame(frame)
+            app.root.update_idletasks()
+            samples.append(time.perf_counter() - t0)
+        results[name] = _percentiles(samples)
+    app.current_label = None
+    return results
+
+
+def bench_labels(sizes, repeat, work_dir):
+    results = []
+    for count in sizes:
+        labels, last_frame = make_label_set(count)
+        total_frames = last_frame + 1
+        video_path = os.path.join(work_dir, f"synthetic_{count}.mp4")
+        label_file = video_path + ".labels.json"
+        report_file = video_path + ".report.txt"
+
+        save, load, stats, timeline, report, cycles = [], [], [], [], [], []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            calculate_cycle_times(labels, FIXTURE_FPS)
+            cycles.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            # Uygulamanın her etikette yaptığı otomatik kayıt (çevrim analizi yok)
+            save_label_file(label_file, labels, video_path, FIXTURE_FPS, total_frames, analytics=False)
+            save.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            load_label_file(label_file)
+            load.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            format_stats(labels, total_frames, FIXTURE_FPS)
+            stats.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            timeline_runs(labels, total_frames, TIMELINE_WIDTH)
+            timeline.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            write_report(report_file, labels, video_path, total_frames, FIXTURE_FPS)
+            report.append(time.perf_counter() - t0)
+
+        tracemalloc.start()
+        loaded = load_label_file(label_file)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del loaded
+
+        results.append({
+            "segments": count,
+            "label_file_bytes": os.path.getsize(label_file),
+            "memory_bytes": memory,
+            "cycle_times": _percentiles(cycles),
+            "save": _percentiles(save),
+            "load": _percentiles(load),
+            "stats": _percentiles(stats),
+            "timeline": _percentiles(timeline),
+            "report": _percentiles(report),
+        })
+    return results
+
+
+def bench_agreement(hours, repeat, seed=7):
+    """`hours` saatlik etiket seti ile sınırları ±0,5 sn oynatılmış kopyasının karşılaştırması."""
+    rng = random.Random(seed)
+    fps = FIXTURE_FPS
+    target = hours * 3600 * fps
+    count = 0
+    labels, last_frame = make_label_set(10)
+    while last_frame < target:
+        count += 1000
+        labels, last_frame = make_label_set(count)
+    jitter = fps // 2
+    other = []
+    for e in labels:
+        start = max(0, e["start_frame"] + rng.randint(-jitter, jitter))
+        end = max(start + 1, e["end_frame"] + rng.randint(-jitter, jitter))
+        other.append(make_entry(start, end, e["label"]))
+    total_frames = last_frame + jitter + 1
+
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result, merged = analyze_agreement([labels, other], ["a", "b"], total_frames, fps)
+        samples.append(time.perf_counter() - t0)
+    pair = result["pairs"][0]
+    return {
+        "segments": len(labels),
+        "frames": total_frames,
+        "analyze": _percentiles(samples),
+        "kappa": pair["kappa"],
+        "consensus_labels": len(merged),
+    }
+
+
+def bench_multiview(path, cameras, repeat, seconds):
+    """Aynı fixture'ı farklı ofsetlerle N kamera gibi tek süreçte oynat.
+
+    Oynatma her kod çözme kademesinde ölçülür (tam, proxy, döngü filtresiz);
+    proxy geçici önbellekte üretilir.
+    """
+    offsets = [float(i) for i in range(cameras)]
+    with tempfile.TemporaryDirectory() as work_dir:
+        set_cache_dir(os.path.join(work_dir, "cache"))
+        reader = MultiViewReader([path] * cameras, offsets)
+        try:
+            t0 = time.perf_counter()
+            cache.store(path, "proxy", job_proxy(path, os.cpu_count() or 1))
+            proxy_seconds = round(time.perf_counter() - t0, 2)
+            reader.refresh_proxies()
+            result = {
+                "cameras": cameras,
+                "frame_size": list(reader.frame_size),
+                "seek": bench_seek(reader, repeat),
+                "proxy_build_seconds": proxy_seconds,
+                "playback": {},
+            }
+            for level, name in enumerate(MULTIVIEW_LEVELS):
+                reader.decode_level = level
+                result["playback"][name] = [bench_playback(reader, s, seconds) for s in MULTIVIEW_SPEEDS]
+            return result
+        finally:
+            reader.release()
+            set_cache_dir(None)
+
+
+def bench_session(path, files):
+    """Aynı dosyayı `files` kez uç uca ekleyip sınırlardaki kare aralığını ölç."""
+    perf = PerfMonitor()
+    perf.set_hud(True)
+    reader = SessionReader([path] * files, perf=perf)
+    start = max(0.0, reader._start_times[1] - 2.0)
+    reader.start_streaming(start)
+    intervals, boundary = [], []
+    last = time.perf_counter()
+    prev_segment = reader.segment_at(start)
+    try:
+        while True:
+            ok, _ = reader.read_next_frame()
+            now = time.perf_counter()
+            if not ok:
+                break
+            segment = reader.segment_at(reader.current_time)
+            (boundary if segment != prev_segment else intervals).append(now - last)
+            prev_segment, last = segment, now
+    finally:
+        reader.stop_streaming()
+    return {
+        "files": files,
+        "frame": _percentiles(intervals),
+        "boundary_frame": _percentiles(boundary),
+    }
+
+
+def bench_server(path, clients, frames):
+    """Yerel sunucu örneğinden `clients` istemcinin aynı videoyu eşzamanlı akışı.
+
+    İlk tur kod çözücü havuzundan (soğuk), ikinci tur paylaşılan kare
+    önbelleğinden gelir. Etiket ekleme gidiş-dönüş süresi de ölçülür.
+    """
+    from labeling_core.server import LabelingServer
+
+    with tempfile.TemporaryDirectory() as archive:
+        video_id = os.path.basename(path)
+        shutil.copy(path, archive)  # etiket dosyaları fixture klasörünü kirletmesin
+        app = LabelingServer(archive, decoders=clients, cache_mb=256)
+        httpd = app.make_httpd("127.0.0.1", 0)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        url = f"127.0.0.1:{httpd.server_address[1]}"
+
+        def stream(intervals):
+            reader = RemoteVideoReader(RemoteClient(url), video_id)
+            reader.start_streaming(0.0)
+            last = time.perf_counter()
+            for _ in range(frames):
+                ok, _ = reader.read_next_frame()
+                now = time.perf_counter()
+                if not ok:
+                    break
+                intervals.append(now - last)
+                last = now
+            reader.release()
+
+        results = {"clients": clients, "frames": frames}
+        try:
+            for phase in ("cold", "cached"):
+                intervals = [[] for _ in range(clients)]
+                threads = [threading.Thread(target=stream, args=(iv,)) for iv in intervals]
+                t0 = time.perf_counter()
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                elapsed = time.perf_counter() - t0
+                results[phase] = {
+                    "fps_per_client": round(min(len(iv) for iv in intervals) / elapsed, 2),
+                    "frame": _percentiles([x for iv in intervals for x in iv]),
+                }
+            client = RemoteClient(url)
+            samples = []
+            for i in range(20):
+                t0 = time.perf_counter()
+                client.add_label(video_id, make_entry(i * 10, i * 10 + 5, LABEL_DIGER))
+                samples.append(time.perf_counter() - t0)
+            results["label_add"] = _percentiles(samples)
+            results["server"] = app.stats()
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            app.close()
+    return results
+
+
+STARTUP_TARGETS = {
+    "core": "labeling_core",
+    "app": "labeling_app",
+    "eager_heavy": "numpy, cv2, PIL.ImageTk",
+}
+
+
+def bench_burnin(path):
+    """Fixture'ın yarısı etiketliyken ekran boyutunda etiketli video aktarımı."""
+    reader = FFmpegVideoReader(path)
+    fps, total = reader.fps, reader.total_frames
+    reader.release()
+    step = int(fps * 2)
+    labels = [make_entry(s, s + step // 2, LABEL_KATMA_DEGERLI if (s // step) % 2 == 0 else LABEL_DIGER)
+              for s in range(0, total - step, step)]
+    with tempfile.TemporaryDirectory() as work_dir:
+        result = export_burnin(path, labels, os.path.join(work_dir, "out.mp4"))
+    return {
+        "frames": result["frames"],
+        "seconds": result["seconds"],
+        "realtime_factor": result["realtime_factor"],
+        "fps": round(result["frames"] / result["seconds"], 1) if result["seconds"] else None,
+    }
+
+
+def bench_precompute(path):
+    """Tek videonun tüm ön hesaplama işleri; klasör taşındıktan sonraki tarama hiçbir işi tekrarlamamalı."""
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Boş önbellekle başla; kullanıcının önbelleğindeki sonuçlar ölçümü bozmasın
+        set_cache_dir(os.path.join(work_dir, "cache"))
+        video_dir = os.path.join(work_dir, "videos")
+        os.makedirs(video_dir)
+        shutil.copy(path, os.path.join(video_dir, os.path.basename(path)))
+        jobs = {}
+        last = [time.perf_counter()]
+
+        def done(p, job, result):
+            now = time.perf_counter()
+            jobs[job] = round((now - last[0]) * 1000, 1)
+            last[0] = now
+
+        scheduler = PrecomputeScheduler(video_dir, workers=1, on_done=done, settle=0).start()
+        t0 = time.perf_counter()
+        scheduler.scan()
+        scheduler.wait_idle()
+        elapsed = time.perf_counter() - t0
+        first = scheduler.completed
+        # Klasör taşınmış gibi: içerik aynı, yol farklı
+        moved = os.path.join(work_dir, "tasindi")
+        os.rename(video_dir, moved)
+        scheduler.set_dir(moved)
+        scheduler.scan()
+        scheduler.wait_idle()
+        scheduler.stop(wait=True)
+        set_cache_dir(None)
+    duration = FFmpegVideoReader(path).duration
+    return {
+        "job_ms": jobs,
+        "seconds": round(elapsed, 2),
+        "realtime_factor": round(duration / elapsed, 2) if elapsed else None,
+        "jobs": first,
+        "repeated_jobs": scheduler.completed - first,
+    }
+
+
+def bench_startup(repeat):
+    """Ayrı süreçte soğuk içe aktarma süresi ve yüklenen ağır modüller."""
+    probe = (
+        "import sys, time; t = time.perf_counter(); import {mods}; "
+        "print((time.perf_counter() - t) * 1000); "
+        "print(','.join(m for m in ('numpy', 'cv2', 'PIL.ImageTk') if m in sys.modules))"
+    )
+    results = {}
+    for name, mods in STARTUP_TARGETS.items():
+        samples, heavy = [], ""
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, "-c", probe.format(mods=mods)],
+                                 capture_output=True, text=True, cwd=REPO_DIR)
+            if out.returncode != 0:
+                samples = None
+                break
+            lines = out.stdout.splitlines()
+            samples.append(float(lines[0]) / 1000)
+            heavy = lines[1] if len(lines) > 1 else ""
+        if samples is None:
+            results[name] = {"error": out.stderr.strip().splitlines()[-1:]}
+            continue
+        results[name] = {**_percentiles(samples), "heavy_modules": heavy.split(",") if heavy else []}
+    return results
+
+
+# ─── Çalıştırma ─────────────────────────────────────────────────────
+def _ffmpeg_version():
+    try:
+        out = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True).stdout
+        return out.splitlines()[0] if out else ""
+    except OSError:
+        return ""
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(args):
+    quick = args.quick
+    fixtures = FIXTURES_QUICK if quick else FIXTURES_FULL
+    sizes = LABEL_SET_SIZES_QUICK if quick else LABEL_SET_SIZES_FULL
+    duration = 10 if quick else 60
+    repeat = 5 if quick else 20
+    play_seconds = 1.5 if quick else 5.0
+
+    fixture_dir = args.fixtures or os.path.join(tempfile.gettempdir(), "sasa_bench_fixtures")
+    os.makedirs(fixture_dir, exist_ok=True)
+    tk_root = _make_tk_root()
+
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "quick": quick,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": _ffmpeg_version(),
+            "commit": _git_commit(),
+            "tk": tk_root is not None,
+        },
+        "videos": [],
+        "labels": [],
+        "startup": {},
+        "multiview": {},
+        "session": {},
+        "server": {},
+        "agreement": {},
+        "burnin": {},
+        "precompute": {},
+    }
+
+    for codec, w, h, gop in fixtures:
+        path = make_fixture(fixture_dir, codec, w, h, gop, duration)
+        print(f"[video] {os.path.basename(path)}", flush=True)
+        reader = FFmpegVideoReader(path)
+        entry = {
+            "fixture": {"codec": codec, "width": w, "height": h, "gop": gop, "duration": duration},
+            "probe": bench_probe(path, repeat),
+            "seek": bench_seek(reader, repeat),
+            "playback": [bench_playback(reader, s, play_seconds) for s in PLAYBACK_SPEEDS],
+            "display": bench_display(tk_root, reader, repeat * 5),
+        }
+        # Merkez çeyrek bölge ffmpeg içinde kırpılır (görüntülemeden büyükse küçültülür)
+        entry["canvas"] = {"full": [bench_playback(reader, s, play_seconds, to_canvas=True) for s in ROI_SPEEDS]}
+        reader.set_roi(normalize_roi((w // 4, h // 4, w // 2, h // 2), w, h, aspect=reader.roi_aspect()))
+        entry["playback_roi"] = [bench_playback(reader, s, play_seconds) for s in ROI_SPEEDS]
+        entry["canvas"]["roi"] = [bench_playback(reader, s, play_seconds, to_canvas=True) for s in ROI_SPEEDS]
+        reader.set_roi(None)
+        reader.release()
+        results["videos"].append(entry)
+
+    (codec, w, h, gop), cameras = MULTIVIEW_QUICK if quick else MULTIVIEW_FULL
+    path = make_fixture(fixture_dir, codec, w, h, gop, duration)
+    print(f"[multiview] {cameras} x {os.path.basename(path)}", flush=True)
+    results["multiview"] = bench_multiview(path, cameras, repeat, play_seconds)
+
+    codec, w, h, gop = fixtures[-1]
+    path = make_fixture(fixture_dir, codec, w, h, gop, duration)
+    print(f"[session] 3 x {os.path.basename(path)}", flush=True)
+    results["session"] = bench_session(path, 3)
+
+    codec, w, h, gop = fixtures[0]
+    path = make_fixture(fixture_dir, codec, w, h, gop, duration)
+    print(f"[server] 2 istemci x {os.path.basename(path)}", flush=True)
+    results["server"] = bench_server(path, 2, int(play_seconds * 2 * FIXTURE_FPS))
+
+    print(f"[burnin] {os.path.basename(path)}", flush=True)
+    results["burnin"] = bench_burnin(path)
+
+    print(f"[precompute] {os.path.basename(path)}", flush=True)
+    results["precompute"] = bench_precompute(path)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        print("[labels] " + ", ".join(str(s) for s in sizes), flush=True)
+        results["labels"] = bench_labels(sizes, max(3, repeat // 4), work_dir)
+
+    print("[agreement] 24 saat", flush=True)
+    results["agreement"] = bench_agreement(24, 3)
+
+    print("[startup]", flush=True)
+    results["startup"] = bench_startup(repeat)
+
+    if tk_root is not None:
+        tk_root.destroy()
+
+    out = args.out or f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar: {out}")
+    return results
+
+
+# ─── Karşılaştırma ──────────────────────────────────────────────────
+def _flatten(obj, prefix=""):
+    """İç içe sonuçları 'yol -> sayı' sözlüğüne indir (karşılaştırma için)."""
+    flat = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            flat.update(_flatten(v, f"{prefix}.{k}" if prefix else k))
+    elif isinstance(obj, list):
+        for i, v in enumerate(obj):
+            key = _list_key(v, i)
+            flat.update(_flatten(v, f"{prefix}[{key}]"))
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        flat[prefix] = obj
+    return flat
+
+
+def _list_key(item, index):
+    if isinstance(item, dict):
+        if "fixture" in item:
+            fx = item["fixture"]
+            return f"{fx['codec']}_{fx['width']}x{fx['height']}_g{fx['gop']}"
+        if "speed" in item:
+            return f"{item['speed']}x"
+        if "segments" in item:
+            return str(item["segments"])
+    return str(index)
+
+
+def compare(base_path, new_path, threshold):
+    with open(base_path, encoding="utf-8") as f:
+        base = _flatten({k: v for k, v in json.load(f).items() if k != "meta"})
+    with open(new_path, encoding="utf-8") as f:
+        new = _flatten({k: v for k, v in json.load(f).items() if k != "meta"})
+
+    regressions = 0
+    print(f"{'Ölçüm':<70} {'Önce':>10} {'Sonra':>10} {'Fark':>8}")
+    for key in sorted(set(base) & set(new)):
+        if not key.endswith(("_ms", "achieved_fps", "realtime_factor")):
+            continue
+        a, b = base[key], new[key]
+        if not a:
+            continue
+        change = (b - a) / a * 100
+        higher_is_better = key.endswith(("achieved_fps", "realtime_factor"))
+        worse = change < -threshold if higher_is_better else change > threshold
+        mark = " !" if worse else ""
+        regressions += worse
+        print(f"{key:<70} {a:>10.3f} {b:>10.3f} {change:>+7.1f}%{mark}")
+    print(f"\n{regressions} ölçümde %{threshold:.0f} üzeri kötüleşme")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video etiketleme performans ölçümü")
+    parser.add_argument("--quick", action="store_true", help="kısa video ve küçük etiket setleri")
+    parser.add_argument("--fixtures", help="test videolarının tutulacağı klasör")
+    parser.add_argument("--out", help="sonuç JSON dosyası")
+    parser.add_argument("--compare", nargs=2, metavar=("ONCE", "SONRA"), help="iki sonuç dosyasını karşılaştır")
+    parser.add_argument("--threshold", type=float, default=10.0, help="kötüleşme eşiği (yüzde)")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
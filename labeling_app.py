@@ -3,6 +3,7 @@ SASA Polyester - POY Fabrikası Masura Bölümü
 Video Etiketleme Sistemi (Zaman Etüdü)
 
 HEVC/H.265 uyumlu - ffmpeg tabanlı video okuma
+Okuyucu, etiket modeli, istatistik ve dışa aktarma: labeling_core (Tk'siz)
 
 Kullanım:
   python labeling_app.py
@@ -11,153 +12,128 @@ Kısayollar:
   Space      : Oynat / Duraklat
   K          : Katma Değerli İş - segment başlat/bitir
   D          : Diğer - segment başlat/bitir
+               (kategoriler ve kısayolları --taxonomy ile yapılandırılır)
   Left/Right : 5 saniye geri/ileri
   Shift+Left/Right : 30 saniye geri/ileri
   S          : Mevcut etiketi kaydet
   Z          : Son etiketi geri al
+  R          : Bölge yakınlaştırma (ROI) seç / tam kareye dön
+  F2         : Performans göstergesi (HUD) aç/kapat
+  F3         : Kare izi (JSONL) kaydını başlat/durdur
   Q          : Çıkış
+
+Seçenekler:
+  --hud          : Performans göstergesi açık başla
+  --trace DOSYA  : Kare başına süre izini JSONL dosyasına yaz
+  --multiview VIDEO VIDEO [...] [--offsets S S ...]
+                 : Kameraları ortak zaman çizelgesinde döşeli oynat
+  --session VIDEO [...]
+                 : Bölünmüş kayıt dosyalarını tek oturum olarak aç
+  --server URL [--annotator AD]
+                 : Videoları ve etiketleri etiketleme sunucusundan al
+                   (bkz. python -m labeling_core.server)
+  --cache-dir KLASÖR
+                 : Ön hesaplama önbelleği (varsayılan: $SASA_CACHE_DIR ya da
+                   ~/.cache/sasa_labeling); iş istasyonları paylaşabilir
+  --taxonomy JSON
+                 : Etiket kategorileri: ad, görünen ad, kısayol, renk, çevrim
+                   kategorisi (varsayılan: $SASA_TAXONOMY ya da K/D). Sunucu
+                   modunda kategoriler sunucudan alınır.
+  --reaction-ms MS
+                 : Tepki süresi telafisi; oynatılırken etiket sınırı tuştan MS
+                   önce ekranda olan kare olur (varsayılan: $SASA_REACTION_MS ya da 0)
+
+Etiket sınırı, oynatılırken tuşa basıldığı anda ekranda duran karedir (bkz.
+labeling_core.presentation); tuş→kare gecikmesi HUD'da ve kare izinde görülür.
 """
 
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import cv2
-import json
-import os
-import subprocess
-import struct
 import time
-import threading
-import numpy as np
-from datetime import datetime, timedelta
-from pathlib import Path
-from PIL import Image, ImageTk
 
-# ─── Sabitler ───────────────────────────────────────────────────────
-LABEL_KATMA_DEGERLI = "katma_degerli_is"
-LABEL_DIGER = "diger"
+_T_START = time.perf_counter()
 
-LABEL_COLORS = {
-    LABEL_KATMA_DEGERLI: "#2ecc71",  # Yeşil
-    LABEL_DIGER: "#e74c3c",          # Kırmızı
-}
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import argparse
+import os
+import threading
 
-LABEL_DISPLAY = {
-    LABEL_KATMA_DEGERLI: "Katma Değerli İş",
-    LABEL_DIGER: "Diğer",
-}
+from labeling_core import (
+    CATEGORIES,
+    CATEGORY_KEYS,
+    LABEL_COLORS,
+    LABEL_DISPLAY,
+    Label,
+    MultiViewReader,
+    PerfMonitor,
+    PresentationClock,
+    RemoteClient,
+    RemoteError,
+    RemoteVideoReader,
+    SessionReader,
+    csv_path_for,
+    default_reaction_ms,
+    format_stats,
+    format_time,
+    is_manifest,
+    is_session,
+    find_label_file,
+    label_file_path,
+    labels_from_document,
+    lazy_import,
+    list_video_sources,
+    load_label_document,
+    load_label_file,
+    load_taxonomy,
+    make_entry,
+    manifest_path_for,
+    normalize_roi,
+    open_video,
+    preload,
+    recording_start_clock,
+    report_path_for,
+    save_label_file,
+    save_manifest,
+    save_roi,
+    save_session,
+    session_path_for,
+    set_cache_dir,
+    set_taxonomy,
+    timeline_runs,
+    video_fingerprint,
+    write_csv,
+    write_report,
+)
+from labeling_core.cache import proxy_for
+from labeling_core.precompute import PrecomputeScheduler, activity_for
+from labeling_core.burnin import BurnInExporter, burnin_path_for, draw_overlay
+from labeling_core.agreement import (
+    agreement_path_for,
+    analyze_agreement,
+    split_by_annotator,
+    write_agreement_report,
+)
+
+# Ağır modüller ilk karede yüklenir (bkz. labeling_core.lazy)
+cv2 = lazy_import("cv2")
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
 
 CANVAS_W = 960
 CANVAS_H = 540
 
+HUD_REFRESH_MS = 500
+LATE_FRAMES_TO_DEGRADE = 25   # art arda bu kadar geç kare: çoklu kamerada ucuz kod çözmeye geç
+LABEL_POLL_WAIT = 20   # sunucu modunda etiket değişikliği uzun yoklaması (sn)
 
-class FFmpegVideoReader:
-    """HEVC/H.265 uyumlu ffmpeg tabanlı video okuyucu."""
 
-    def __init__(self, path):
-        self.path = path
-        self.width = 0
-        self.height = 0
-        self.fps = 25.0
-        self.total_frames = 0
-        self.duration = 0.0
-        self._pipe_proc = None
-        self._current_time = 0.0  # saniye cinsinden mevcut pozisyon
-
-        self._probe()
-
-    def _probe(self):
-        """ffprobe ile video bilgilerini al."""
-        cmd = [
-            "ffprobe", "-v", "quiet", "-print_format", "json",
-            "-show_streams", "-show_format", self.path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        info = json.loads(result.stdout)
-
-        for s in info.get("streams", []):
-            if s.get("codec_type") == "video":
-                self.width = int(s["width"])
-                self.height = int(s["height"])
-                # FPS
-                r_fps = s.get("r_frame_rate", "25/1")
-                num, den = r_fps.split("/")
-                self.fps = float(num) / float(den) if float(den) != 0 else 25.0
-                # Süre
-                self.duration = float(info.get("format", {}).get("duration", 0))
-                self.total_frames = int(self.duration * self.fps)
-                break
-
-    def read_frame_at(self, time_sec):
-        """Belirtilen zamandaki tek frame'i oku (seek için)."""
-        time_sec = max(0, min(time_sec, self.duration - 0.1))
-        cmd = [
-            "ffmpeg", "-ss", f"{time_sec:.3f}",
-            "-i", self.path,
-            "-frames:v", "1",
-            "-f", "rawvideo", "-pix_fmt", "bgr24",
-            "-v", "quiet", "-"
-        ]
-        proc = subprocess.run(cmd, capture_output=True)
-        expected = self.width * self.height * 3
-        if len(proc.stdout) >= expected:
-            frame = np.frombuffer(proc.stdout[:expected], dtype=np.uint8).reshape(self.height, self.width, 3)
-            self._current_time = time_sec
-            return True, frame
-        return False, None
-
-    def start_streaming(self, start_time=0.0):
-        """Belirtilen zamandan itibaren sıralı frame akışı başlat."""
-        self.stop_streaming()
-        start_time = max(0, min(start_time, self.duration - 0.1))
-        self._current_time = start_time
-        cmd = [
-            "ffmpeg", "-ss", f"{start_time:.3f}",
-            "-i", self.path,
-            "-f", "rawvideo", "-pix_fmt", "bgr24",
-            "-v", "quiet", "-"
-        ]
-        self._pipe_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
-
-    def read_next_frame(self):
-        """Akıştan sonraki frame'i oku."""
-        if not self._pipe_proc or self._pipe_proc.poll() is not None:
-            return False, None
-        expected = self.width * self.height * 3
-        raw = self._pipe_proc.stdout.read(expected)
-        if len(raw) < expected:
-            return False, None
-        frame = np.frombuffer(raw, dtype=np.uint8).reshape(self.height, self.width, 3)
-        self._current_time += 1.0 / self.fps
-        return True, frame
-
-    def stop_streaming(self):
-        """Akışı durdur."""
-        if self._pipe_proc:
-            try:
-                self._pipe_proc.stdout.close()
-                self._pipe_proc.terminate()
-                self._pipe_proc.wait(timeout=2)
-            except Exception:
-                try:
-                    self._pipe_proc.kill()
-                except Exception:
-                    pass
-            self._pipe_proc = None
-
-    @property
-    def current_time(self):
-        return self._current_time
-
-    @property
-    def current_frame_number(self):
-        return int(self._current_time * self.fps)
-
-    def release(self):
-        self.stop_streaming()
+def _darken(color, factor=0.85):
+    """#rrggbb rengin koyusu (aktif etiket butonu)."""
+    r, g, b = (int(int(color[i:i + 2], 16) * factor) for i in (1, 3, 5))
+    return f"#{r:02x}{g:02x}{b:02x}"
 
 
 class VideoLabelingApp:
-    def __init__(self, root):
+    def __init__(self, root, hud=False, trace_path=None, server=None, annotator=None, reaction_ms=0.0):
         self.root = root
         self.root.title("SASA POY - Masura Bölümü Video Etiketleme Sistemi")
         self.root.configure(bg="#1e1e2e")
@@ -176,18 +152,57 @@ class VideoLabelingApp:
         self.labels = []
         self.current_label = None
         self.label_file = None
+        self.label_fingerprint = None   # etiket yedeğinin anahtarı; video açılırken bir kez alınır
 
         # Video listesi
         self.video_dir = "C:/Users/USER/Desktop/Video_20260212091342"
         self.video_files = []
 
+        # Sunucu modu: videolar ve etiketler paylaşılan sunucudan
+        self.remote = RemoteClient(server, annotator) if server else None
+        if self.remote:
+            # Etiket kategorileri sunucudakiyle aynı olmalı
+            try:
+                set_taxonomy(self.remote.taxonomy())
+            except (RemoteError, OSError, ValueError):
+                pass  # eski sunucu: yerel kategoriler
+        self._label_version = None
+        self._poll_gen = 0
+        self._burnin = None  # süren etiketli video aktarımı
+
+        # Arka plan ön hesaplama (probe, anahtar kare, etkinlik, küçük resim, proxy)
+        self.precompute = None if self.remote else PrecomputeScheduler(
+            self.video_dir, on_done=self._on_precomputed, busy=lambda: self.playing)
+        self._activity = None
+
+        # ROI (bölge yakınlaştırma)
+        self.roi_select = False
+        self._roi_drag = None
+
         # Threading
         self.play_thread = None
         self.lock = threading.Lock()
 
+        # Performans ölçümü
+        self.perf = PerfMonitor()
+        # Ekrandaki kare saati: etiket sınırı ve tuş→kare gecikmesi
+        self.presentation = PresentationClock(reaction_ms)
+        self._hud_after = None   # bekleyen gösterge yenilemesi (after kimliği)
+
         self._build_ui()
         self._bind_keys()
         self._load_video_list()
+        if self.precompute:
+            self.precompute.start()
+
+        if trace_path:
+            self.perf.start_trace(trace_path)
+        if hud:
+            self._toggle_hud()
+
+        # Açılış süresi: modül yüklemesinden ilk boşta döngüsüne kadar
+        self.startup_ms = None
+        self.root.after_idle(self._on_ready)
 
     # ─── UI ────────────────────────────────────────────────────────
     def _build_ui(self):
@@ -218,6 +233,8 @@ class VideoLabelingApp:
         self.video_listbox.bind("<<ListboxSelect>>", self._on_video_select)
 
         ttk.Button(left_panel, text="Klasör Seç", command=self._select_folder).pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(left_panel, text="Çoklu Kamera", command=self._select_multiview).pack(fill=tk.X, padx=5, pady=(0, 5))
+        ttk.Button(left_panel, text="Oturum Oluştur", command=self._select_session).pack(fill=tk.X, padx=5, pady=(0, 5))
 
         # Orta panel
         center = ttk.Frame(main)
@@ -228,6 +245,9 @@ class VideoLabelingApp:
 
         self.canvas = tk.Canvas(center, width=CANVAS_W, height=CANVAS_H, bg="#11111b", highlightthickness=0)
         self.canvas.pack()
+        self.canvas.bind("<ButtonPress-1>", self._on_canvas_press)
+        self.canvas.bind("<B1-Motion>", self._on_canvas_drag)
+        self.canvas.bind("<ButtonRelease-1>", self._on_canvas_release)
 
         # Timeline
         self.timeline_canvas = tk.Canvas(center, height=50, bg="#181825", highlightthickness=0)
@@ -259,6 +279,7 @@ class VideoLabelingApp:
 
         ttk.Button(ctrl_frame, text="5s >", command=lambda: self._seek(5)).pack(side=tk.LEFT, padx=2)
         ttk.Button(ctrl_frame, text="30s >>", command=lambda: self._seek(30)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(ctrl_frame, text="Bölge [R]", command=self._toggle_roi_mode).pack(side=tk.LEFT, padx=(10, 2))
 
         # Hız kontrolü
         speed_frame = ttk.Frame(ctrl_frame)
@@ -275,21 +296,18 @@ class VideoLabelingApp:
         label_frame = ttk.Frame(center)
         label_frame.pack(pady=10)
 
-        self.btn_katma = tk.Button(
-            label_frame, text="[K] Katma Değerli İş\nBaşlat",
-            bg="#2ecc71", fg="white", font=("Segoe UI", 12, "bold"),
-            width=22, height=2, relief=tk.FLAT,
-            command=lambda: self._toggle_label(LABEL_KATMA_DEGERLI)
-        )
-        self.btn_katma.pack(side=tk.LEFT, padx=10)
-
-        self.btn_diger = tk.Button(
-            label_frame, text="[D] Diğer\nBaşlat",
-            bg="#e74c3c", fg="white", font=("Segoe UI", 12, "bold"),
-            width=22, height=2, relief=tk.FLAT,
-            command=lambda: self._toggle_label(LABEL_DIGER)
-        )
-        self.btn_diger.pack(side=tk.LEFT, padx=10)
+        # Kategori başına bir buton (kategori kaydından; bkz. --taxonomy)
+        self.label_buttons = {}
+        width = 22 if len(CATEGORIES) <= 3 else max(10, 66 // len(CATEGORIES))
+        for name in CATEGORIES:
+            btn = tk.Button(
+                label_frame, fg="white", font=("Segoe UI", 12, "bold"),
+                width=width, height=2, relief=tk.FLAT,
+                command=lambda n=name: self._toggle_label(n)
+            )
+            btn.pack(side=tk.LEFT, padx=10 if len(CATEGORIES) <= 3 else 4)
+            self.label_buttons[name] = btn
+        self._update_buttons()
 
         self.btn_undo = tk.Button(
             label_frame, text="[Z] Geri Al",
@@ -355,13 +373,15 @@ class VideoLabelingApp:
         ttk.Button(export_frame, text="JSON Kaydet", command=self._save_labels).pack(fill=tk.X, pady=2)
         ttk.Button(export_frame, text="CSV Dışa Aktar", command=self._export_csv).pack(fill=tk.X, pady=2)
         ttk.Button(export_frame, text="Rapor Oluştur", command=self._generate_report).pack(fill=tk.X, pady=2)
+        ttk.Button(export_frame, text="Etiketçi Uyumu", command=self._compare_annotators).pack(fill=tk.X, pady=2)
+        self.burnin_btn = ttk.Button(export_frame, text="Etiketli Video", command=self._export_burnin)
+        self.burnin_btn.pack(fill=tk.X, pady=2)
 
     def _bind_keys(self):
         self.root.bind("<space>", lambda e: self._toggle_play())
-        self.root.bind("<k>", lambda e: self._toggle_label(LABEL_KATMA_DEGERLI))
-        self.root.bind("<K>", lambda e: self._toggle_label(LABEL_KATMA_DEGERLI))
-        self.root.bind("<d>", lambda e: self._toggle_label(LABEL_DIGER))
-        self.root.bind("<D>", lambda e: self._toggle_label(LABEL_DIGER))
+        for key, name in CATEGORY_KEYS.items():
+            for k in {key, key.upper()}:
+                self.root.bind(f"<{k}>" if k.isalpha() else k, lambda e, n=name: self._toggle_label(n, e))
         self.root.bind("<Left>", lambda e: self._seek(-5))
         self.root.bind("<Right>", lambda e: self._seek(5))
         self.root.bind("<Shift-Left>", lambda e: self._seek(-30))
@@ -370,27 +390,113 @@ class VideoLabelingApp:
         self.root.bind("<S>", lambda e: self._save_labels())
         self.root.bind("<z>", lambda e: self._undo_label())
         self.root.bind("<Z>", lambda e: self._undo_label())
+        self.root.bind("<r>", lambda e: self._toggle_roi_mode())
+        self.root.bind("<R>", lambda e: self._toggle_roi_mode())
+        self.root.bind("<F2>", lambda e: self._toggle_hud())
+        self.root.bind("<F3>", lambda e: self._toggle_trace())
         self.root.bind("<q>", lambda e: self._quit())
         self.root.bind("<Q>", lambda e: self._quit())
 
+    def _on_ready(self):
+        self.startup_ms = (time.perf_counter() - _T_START) * 1000
+        self.status_var.set(f"{self.status_var.get()} | açılış {self.startup_ms:.0f} ms")
+        # İlk kare gösterilmeden önce görüntü modüllerini arka planda ısıt
+        preload("numpy", "cv2", "PIL.Image", "PIL.ImageTk")
+
     # ─── Video Yükleme ─────────────────────────────────────────────
     def _load_video_list(self):
         self.video_listbox.delete(0, tk.END)
         self.video_files = []
-        if os.path.isdir(self.video_dir):
-            for f in sorted(os.listdir(self.video_dir)):
-                if f.lower().endswith(('.mp4', '.avi', '.mkv', '.mov')):
-                    self.video_files.append(f)
-                    display = f
-                    if len(f) > 35:
-                        display = f[:15] + "..." + f[-20:]
-                    self.video_listbox.insert(tk.END, display)
+        if self.remote:
+            try:
+                sources = self.remote.list_videos()
+            except (RemoteError, OSError) as e:
+                self.status_var.set(f"Sunucuya bağlanılamadı: {e}")
+                return
+        else:
+            sources = list_video_sources(self.video_dir)
+        for f in sources:
+            self.video_files.append(f)
+            display = f
+            if len(f) > 35:
+                display = f[:15] + "..." + f[-20:]
+            if is_manifest(f):
+                display = "[Çoklu] " + display
+            elif is_session(f):
+                display = "[Oturum] " + display
+            self.video_listbox.insert(tk.END, display)
+
+    def _local_only(self):
+        """Sunucu modunda yerel dosya işlemlerini engelle."""
+        if self.remote:
+            self.status_var.set(f"Sunucu modunda kullanılamaz ({self.remote.base_url})")
+            return False
+        return True
 
     def _select_folder(self):
+        if not self._local_only():
+            return
         folder = filedialog.askdirectory(initialdir=self.video_dir)
         if folder:
             self.video_dir = folder
             self._load_video_list()
+            self.precompute.set_dir(folder)
+
+    def _select_multiview(self):
+        if not self._local_only():
+            return
+        paths = filedialog.askopenfilenames(
+            initialdir=self.video_dir, title="Kamera videolarını seçin",
+            filetypes=[("Video", "*.mp4 *.avi *.mkv *.mov")]
+        )
+        if len(paths) < 2:
+            if paths:
+                messagebox.showwarning("Uyarı", "Çoklu görünüm için en az iki video seçin")
+            return
+        default = ", ".join("0" for _ in paths)
+        text = simpledialog.askstring(
+            "Zaman Ofsetleri",
+            "Her kamera için başlangıç ofseti (saniye, virgülle):\n" +
+            "\n".join(os.path.basename(p) for p in paths),
+            initialvalue=default, parent=self.root
+        )
+        if text is None:
+            return
+        try:
+            offsets = [float(x) for x in text.replace(";", ",").split(",")]
+        except ValueError:
+            messagebox.showerror("Hata", f"Geçersiz ofset listesi: {text}")
+            return
+        self._open_multiview(list(paths), offsets)
+
+    def _open_multiview(self, paths, offsets):
+        """Kameraları manifest olarak kaydet ve ortak zaman çizelgesinde aç."""
+        if len(offsets) != len(paths):
+            messagebox.showerror("Hata", "Her video için bir ofset girilmeli")
+            return
+        manifest = manifest_path_for(paths[0])
+        save_manifest(manifest, paths, offsets)
+        if os.path.dirname(os.path.abspath(manifest)) == os.path.abspath(self.video_dir):
+            self._load_video_list()
+        self._load_video(manifest)
+
+    def _select_session(self):
+        if not self._local_only():
+            return
+        paths = filedialog.askopenfilenames(
+            initialdir=self.video_dir, title="Oturumun kayıt dosyalarını seçin",
+            filetypes=[("Video", "*.mp4 *.avi *.mkv *.mov")]
+        )
+        if paths:
+            self._open_session(sorted(paths))
+
+    def _open_session(self, paths):
+        """Ardışık dosyaları oturum olarak kaydet ve tek zaman çizelgesinde aç."""
+        session = session_path_for(paths[0])
+        save_session(session, paths)
+        if os.path.dirname(os.path.abspath(session)) == os.path.abspath(self.video_dir):
+            self._load_video_list()
+        self._load_video(session)
 
     def _on_video_select(self, event):
         sel = self.video_listbox.curselection()
@@ -398,7 +504,7 @@ class VideoLabelingApp:
             return
         idx = sel[0]
         video_file = self.video_files[idx]
-        video_path = os.path.join(self.video_dir, video_file)
+        video_path = video_file if self.remote else os.path.join(self.video_dir, video_file)
         self._load_video(video_path)
 
     def _load_video(self, path):
@@ -412,7 +518,15 @@ class VideoLabelingApp:
         self.status_var.set("Video yükleniyor...")
         self.root.update_idletasks()
 
-        self.reader = FFmpegVideoReader(path)
+        try:
+            if self.remote:
+                self.reader = RemoteVideoReader(self.remote, path, perf=self.perf, out_size=(CANVAS_W, CANVAS_H))
+            else:
+                self.reader = open_video(path, perf=self.perf, out_size=(CANVAS_W, CANVAS_H))
+        except (RemoteError, OSError, ValueError) as e:
+            messagebox.showerror("Hata", f"Video açılamadı:\n{path}\n{e}")
+            self.reader = None
+            return
         if self.reader.total_frames == 0:
             messagebox.showerror("Hata", f"Video açılamadı:\n{path}")
             self.reader = None
@@ -422,10 +536,18 @@ class VideoLabelingApp:
         self.total_frames = self.reader.total_frames
         self.fps = self.reader.fps
         self.current_frame = 0
+        self.roi_select = False
+        self._roi_drag = None
 
         self.slider.configure(to=self.total_frames)
 
-        self.label_file = path + ".labels.json"
+        self._activity = None
+        if self.precompute:
+            self.precompute.focus(getattr(self.reader, "paths", [path]))
+            self._activity = activity_for(path)
+
+        self.label_file = None if self.remote else label_file_path(path)
+        self.label_fingerprint = None if self.remote else video_fingerprint(path)
         self._load_labels()
 
         self._show_frame()
@@ -452,6 +574,9 @@ class VideoLabelingApp:
         else:
             self.playing = True
             self.play_btn.configure(text="Duraklat")
+            # Her oynatma tam kaliteyle başlar; geri kalırsa _play_loop düşürür
+            if isinstance(self.reader, MultiViewReader):
+                self.reader.reset_decode()
             # Akış başlat
             current_time = self.current_frame / self.fps
             self.reader.start_streaming(current_time)
@@ -460,30 +585,44 @@ class VideoLabelingApp:
 
     def _play_loop(self):
         skip = max(1, int(self.playback_speed)) - 1  # Hızlı oynatmada frame atla
+        perf = self.perf
+        perf.resume()
+        late_run = 0
         while self.playing and self.reader:
             start_t = time.time()
 
+            shown = self.reader.current_frame_number  # okunacak, yani ekrana gelecek kare
             ret, frame = self.reader.read_next_frame()
             if not ret:
                 self.playing = False
                 self.root.after(0, lambda: self.play_btn.configure(text="Oynat"))
                 break
 
-            # Hızlı oynatmada frame atla
-            for _ in range(skip):
-                if not self.playing:
-                    break
-                self.reader.read_next_frame()
+            # Hızlı oynatmada frame atla (uzak okuyucu için 0 da adımı bildirir)
+            t0 = perf.clock()
+            self.reader.skip_frames(skip)
+            if skip:
+                perf.add("skip", t0)
 
-            self.current_frame = self.reader.current_frame_number
+            # Atlanan kareler değil, gösterilen kare (okuyucu konumu skip+1 ileride)
+            self.current_frame = shown
             self._display_frame(frame)
             self.root.after(0, self._update_ui_during_play)
 
             elapsed = time.time() - start_t
             target_delay = 1.0 / (self.fps * self.playback_speed)
             delay = max(0, target_delay - elapsed)
+            perf.end_frame(self.current_frame, late=delay <= 0, speed=self.playback_speed)
             if delay > 0:
+                late_run = 0
                 time.sleep(delay)
+            else:
+                late_run += 1
+                if (late_run >= LATE_FRAMES_TO_DEGRADE and isinstance(self.reader, MultiViewReader)
+                        and self.reader.degrade()):
+                    late_run = 0
+                    perf.event("degrade", level=self.reader.decode_level)
+                    self.reader.start_streaming(self.reader.current_time)
 
     def _update_ui_during_play(self):
         self._update_time_display()
@@ -495,40 +634,161 @@ class VideoLabelingApp:
             return
         time_sec = self.current_frame / self.fps
         ret, frame = self.reader.read_frame_at(time_sec)
+        self.presentation.reset()
         if ret:
             self._display_frame(frame)
+        self.perf.end_frame(self.current_frame, seek=True)
 
     def _display_frame(self, frame):
-        frame = cv2.resize(frame, (CANVAS_W, CANVAS_H))
+        perf = self.perf
+        t0 = perf.clock()
+        if frame.shape[1] != CANVAS_W or frame.shape[0] != CANVAS_H:
+            frame = cv2.resize(frame, (CANVAS_W, CANVAS_H))
+        t0 = perf.add("resize", t0)
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
-        # Aktif etiket overlay
+        # Etiket bandı, zaman damgası, kare numarası (dışa aktarılan videodakiyle aynı)
+        label = elapsed = None
         if self.current_label:
             label = self.current_label["label"]
-            color = (46, 204, 113) if label == LABEL_KATMA_DEGERLI else (231, 76, 60)
-            overlay = frame_rgb.copy()
-            cv2.rectangle(overlay, (0, 0), (CANVAS_W, 40), color, -1)
-            cv2.addWeighted(overlay, 0.7, frame_rgb, 0.3, 0, frame_rgb)
-
-            text = f"KAYIT: {LABEL_DISPLAY[label]}"
-            cv2.putText(frame_rgb, text, (10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-
             elapsed = (self.current_frame - self.current_label["start_frame"]) / self.fps
-            cv2.putText(frame_rgb, f"{elapsed:.1f}s", (CANVAS_W - 100, 28),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-
-        # Zaman damgası
-        current_time = self._format_time(self.current_frame / self.fps)
-        cv2.putText(frame_rgb, current_time, (CANVAS_W - 130, CANVAS_H - 15),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
-
-        # Frame numarası
-        cv2.putText(frame_rgb, f"F:{self.current_frame}", (10, CANVAS_H - 15),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        draw_overlay(frame_rgb, self.current_frame, self.fps, label, elapsed, caption="KAYIT", rgb=True)
+        t0 = perf.add("overlay", t0)
 
         img = Image.fromarray(frame_rgb)
         self._photo = ImageTk.PhotoImage(img)
+        t0 = perf.add("photo", t0)
         self.canvas.create_image(0, 0, anchor=tk.NW, image=self._photo)
+        if perf.hud:
+            self.canvas.tag_raise("hud")
+        if self._roi_drag:
+            self.canvas.tag_raise("roi_sel")
+        # Tuval yeniden çizimi boşta işidir: burada zorlanır, gösterim anı
+        # görüntüyü değiştiren bu çağrıda, kare ekrana boyandıktan sonra alınır
+        self.canvas.update_idletasks()
+        self.presentation.presented(self.current_frame)
+        perf.add("paint", t0)
+
+    # ─── Bölge Yakınlaştırma (ROI) ──────────────────────────────────
+    def _camera_count(self):
+        return len(getattr(self.reader, "paths", [None]))
+
+    def _toggle_roi_mode(self):
+        if not self.reader:
+            return
+        if self.roi_select:
+            self.roi_select = False
+            self.canvas.configure(cursor="")
+            self.status_var.set("Bölge seçimi iptal edildi")
+        elif any(self.reader.get_roi(i) for i in range(self._camera_count())):
+            self._apply_rois({i: None for i in range(self._camera_count())})
+            self.status_var.set("Tam kareye dönüldü")
+        else:
+            self.roi_select = True
+            self.canvas.configure(cursor="crosshair")
+            self.status_var.set("Yakınlaştırılacak bölgeyi sürükleyin (R: iptal)")
+
+    def _on_canvas_press(self, event):
+        if self.roi_select:
+            self._roi_drag = (event.x, event.y)
+
+    def _on_canvas_drag(self, event):
+        if not self._roi_drag:
+            return
+        x0, y0 = self._roi_drag
+        self.canvas.delete("roi_sel")
+        self.canvas.create_rectangle(x0, y0, event.x, event.y, outline="#f9e2af",
+                                     width=2, dash=(4, 2), tags="roi_sel")
+
+    def _on_canvas_release(self, event):
+        if not self._roi_drag:
+            return
+        x0, y0 = self._roi_drag
+        self._roi_drag = None
+        self.canvas.delete("roi_sel")
+
+        # Tuval -> çıkış karesi -> kaynak pikseli
+        fw, fh = self.reader.frame_size
+        kx, ky = fw / CANVAS_W, fh / CANVAS_H
+        a = self.reader.source_point(x0 * kx, y0 * ky)
+        b = self.reader.source_point(event.x * kx, event.y * ky)
+        if not a or not b or a[0] != b[0]:
+            self.status_var.set("Bölge tek bir kamera görüntüsü içinde seçilmeli")
+            return
+        index = a[0]
+        src_w, src_h = self.reader.source_size(index)
+        roi = normalize_roi((a[1], a[2], b[1] - a[1], b[2] - a[2]), src_w, src_h,
+                            aspect=self.reader.roi_aspect(index))
+        if roi is None:
+            self.status_var.set("Seçilen bölge çok küçük ya da tüm kare")
+            return
+        self.roi_select = False
+        self.canvas.configure(cursor="")
+        self._apply_rois({index: roi})
+        x, y, w, h = roi
+        self.status_var.set(f"Bölge: {w}x{h} @ ({x}, {y}) | R: tam kare")
+
+    def _apply_rois(self, rois):
+        """ROI'leri okuyucuya uygula, kaydet ve akışı aynı karede yeniden başlat."""
+        was_playing = self.playing
+        if was_playing:
+            self.playing = False
+            self.reader.stop_streaming()
+
+        for index, roi in rois.items():
+            self.reader.set_roi(roi, index)
+        if self.remote:
+            pass  # ROI istemciye özeldir, sunucudaki kayıtlar değişmez
+        elif isinstance(self.reader, MultiViewReader):
+            save_manifest(self.video_path, self.reader.paths, self.reader.offsets, self.reader.rois)
+        else:
+            save_roi(self.video_path, self.reader.get_roi())
+
+        self._show_frame()
+
+        if was_playing:
+            self.playing = True
+            current_time = self.current_frame / self.fps
+            self.reader.start_streaming(current_time)
+            self.play_thread = threading.Thread(target=self._play_loop, daemon=True)
+            self.play_thread.start()
+
+    # ─── Performans Göstergesi ──────────────────────────────────────
+    def _toggle_hud(self):
+        self.perf.set_hud(not self.perf.hud)
+        if self.perf.hud:
+            self.perf.reset()
+            self._update_hud()
+        else:
+            if self._hud_after is not None:
+                self.root.after_cancel(self._hud_after)
+                self._hud_after = None
+            self.canvas.delete("hud")
+
+    def _update_hud(self):
+        self._hud_after = None
+        self.canvas.delete("hud")
+        if not self.perf.hud:
+            return
+        text = "\n".join(self.perf.summary_lines() + self.presentation.summary_lines())
+        self.canvas.create_rectangle(5, 45, 260, 60 + 13 * text.count("\n"),
+                                     fill="#11111b", outline="", stipple="gray50", tags="hud")
+        self.canvas.create_text(10, 50, text=text, anchor=tk.NW, fill="#f9e2af",
+                                font=("Consolas", 8), tags="hud")
+        self._hud_after = self.root.after(HUD_REFRESH_MS, self._update_hud)
+
+    def _toggle_trace(self):
+        if self.perf.tracing:
+            path = self.perf.trace_path
+            self.perf.stop_trace()
+            self.status_var.set(f"Kare izi durduruldu: {path}")
+            return
+        if not self.video_path:
+            self.status_var.set("İz kaydı için önce video yükleyin")
+            return
+        path = self.video_path + ".trace.jsonl"
+        self.perf.start_trace(path)
+        self.status_var.set(f"Kare izi kaydediliyor: {path}")
 
     # ─── Navigasyon ─────────────────────────────────────────────────
     def _seek(self, seconds):
@@ -603,52 +863,63 @@ class VideoLabelingApp:
         self.playback_speed = float(speed_str)
 
     # ─── Etiketleme ─────────────────────────────────────────────────
-    def _toggle_label(self, label_type):
+    def _boundary_frame(self, event=None):
+        """Etiket sınırı: oynatılırken tuş anında (tepki telafili) ekranda olan kare."""
+        if not self.playing:
+            return self.current_frame
+        frame = self.presentation.boundary(self.reader.current_frame_number, getattr(event, "time", None))
+        if self.presentation.last:
+            self.perf.event("label_key", **self.presentation.last)
+        return frame
+
+    def _boundary_note(self):
+        last = self.presentation.last if self.playing else None
+        if not last:
+            return ""
+        return (f" | ekrandaki kare {last['frame']} (çözücü {last['decoded_frame'] - last['frame']:+d}, "
+                f"tuş {last['dispatch_ms']:.0f} ms, telafi {last['reaction_ms']:.0f} ms)")
+
+    def _toggle_label(self, label_type, event=None):
         if not self.reader:
             return
 
+        boundary = self._boundary_frame(event)
         if self.current_label is not None:
             start_frame = self.current_label["start_frame"]
-            end_frame = self.current_frame
+            end_frame = boundary
 
             if end_frame <= start_frame:
                 self.status_var.set("Hata: Bitiş zamanı başlangıçtan önce olamaz!")
                 return
 
-            entry = {
-                "start_frame": start_frame,
-                "end_frame": end_frame,
-                "start_time": start_frame / self.fps,
-                "end_time": end_frame / self.fps,
-                "start_str": self._format_time(start_frame / self.fps),
-                "end_str": self._format_time(end_frame / self.fps),
-                "label": self.current_label["label"],
-                "duration": (end_frame - start_frame) / self.fps,
-            }
-            self.labels.append(entry)
+            entry = make_entry(start_frame, end_frame, self.current_label["label"])
+            entry = self._commit_label(entry)
+            if entry is None:
+                return
             self.current_label = None
 
             self._update_label_list()
             self._update_stats()
             self._update_timeline()
             self._update_buttons()
-            self._save_labels(auto=True)
 
-            duration_str = self._format_time(entry["duration"])
+            start_str, end_str = entry.time_strs(self.fps)
+            duration_str = self._format_time(entry.frames / self.fps)
             self.status_var.set(
                 f"Etiket kaydedildi: {LABEL_DISPLAY[entry['label']]} | "
-                f"{entry['start_str']} - {entry['end_str']} ({duration_str})"
+                f"{start_str} - {end_str} ({duration_str}){self._boundary_note()}"
             )
             self.active_label_var.set("Etiket aktif değil")
         else:
             self.current_label = {
                 "label": label_type,
-                "start_frame": self.current_frame,
-                "start_time": self.current_frame / self.fps,
+                "start_frame": boundary,
+                "start_time": boundary / self.fps,
             }
             self._update_buttons()
-            self.active_label_var.set(f"KAYIT: {LABEL_DISPLAY[label_type]} - {self._format_time(self.current_frame / self.fps)}")
-            self.status_var.set(f"{LABEL_DISPLAY[label_type]} etiketi başlatıldı: {self._format_time(self.current_frame / self.fps)}")
+            self.active_label_var.set(f"KAYIT: {LABEL_DISPLAY[label_type]} - {self._format_time(boundary / self.fps)}")
+            self.status_var.set(f"{LABEL_DISPLAY[label_type]} etiketi başlatıldı: "
+                                f"{self._format_time(boundary / self.fps)}{self._boundary_note()}")
 
     def _undo_label(self):
         if self.current_label is not None:
@@ -657,25 +928,59 @@ class VideoLabelingApp:
             self.active_label_var.set("Etiket aktif değil")
             self.status_var.set("Aktif etiket iptal edildi")
         elif self.labels:
-            removed = self.labels.pop()
+            removed = self._remove_last_label()
+            if removed is None:
+                return
             self._update_label_list()
             self._update_stats()
             self._update_timeline()
+            start_str, end_str = removed.time_strs(self.fps)
+            self.status_var.set(f"Son etiket silindi: {LABEL_DISPLAY[removed['label']]} ({start_str} - {end_str})")
+
+    def _commit_label(self, entry):
+        """Etiketi ekleyip kaydet; sunucu modunda sunucuya gönder."""
+        if not self.remote:
+            self.labels.append(entry)
+            self._save_labels(auto=True)
+            return entry
+        try:
+            result = self.remote.add_label(self.video_path, entry)
+        except (RemoteError, OSError) as e:
+            self.status_var.set(f"Etiket sunucuya gönderilemedi: {e}")
+            return None
+        self._apply_remote_labels(result, refresh=False)
+        return Label.from_dict(result["entry"], self.fps)
+
+    def _remove_last_label(self):
+        """Son etiketi sil; sunucu modunda bu etiketleyicinin son etiketini."""
+        if not self.remote:
+            removed = self.labels.pop()
             self._save_labels(auto=True)
-            self.status_var.set(f"Son etiket silindi: {LABEL_DISPLAY[removed['label']]} ({removed['start_str']} - {removed['end_str']})")
+            return removed
+        own = [e for e in self.labels if e.get("annotator") == self.remote.annotator]
+        if not own:
+            self.status_var.set("Silinecek kendi etiketiniz yok")
+            return None
+        removed = own[-1]
+        try:
+            result = self.remote.delete_label(self.video_path, removed["id"])
+        except (RemoteError, OSError) as e:
+            self.status_var.set(f"Etiket sunucuda silinemedi: {e}")
+            return None
+        self._apply_remote_labels(result, refresh=False)
+        return removed
 
     def _update_buttons(self):
-        if self.current_label:
-            label = self.current_label["label"]
-            if label == LABEL_KATMA_DEGERLI:
-                self.btn_katma.configure(text="[K] Katma Değerli İş\nBİTİR", bg="#27ae60")
-                self.btn_diger.configure(text="[D] Diğer\nBaşlat", bg="#e74c3c", state=tk.DISABLED)
+        active = self.current_label["label"] if self.current_label else None
+        keys = {name: key for key, name in CATEGORY_KEYS.items()}
+        for name, btn in self.label_buttons.items():
+            prefix = f"[{keys[name].upper()}] " if name in keys else ""
+            if name == active:
+                btn.configure(text=f"{prefix}{LABEL_DISPLAY[name]}\nBİTİR", bg=_darken(LABEL_COLORS[name]),
+                              state=tk.NORMAL)
             else:
-                self.btn_diger.configure(text="[D] Diğer\nBİTİR", bg="#c0392b")
-                self.btn_katma.configure(text="[K] Katma Değerli İş\nBaşlat", bg="#2ecc71", state=tk.DISABLED)
-        else:
-            self.btn_katma.configure(text="[K] Katma Değerli İş\nBaşlat", bg="#2ecc71", state=tk.NORMAL)
-            self.btn_diger.configure(text="[D] Diğer\nBaşlat", bg="#e74c3c", state=tk.NORMAL)
+                btn.configure(text=f"{prefix}{LABEL_DISPLAY[name]}\nBaşlat", bg=LABEL_COLORS[name],
+                              state=tk.DISABLED if active else tk.NORMAL)
 
     # ─── Etiket Listesi ─────────────────────────────────────────────
     def _update_label_list(self):
@@ -683,16 +988,16 @@ class VideoLabelingApp:
             self.label_tree.delete(item)
 
         for i, entry in enumerate(self.labels):
-            tag = "katma" if entry["label"] == LABEL_KATMA_DEGERLI else "diger"
+            start_str, end_str = entry.time_strs(self.fps)
             self.label_tree.insert("", tk.END, values=(
-                entry["start_str"],
-                entry["end_str"],
-                LABEL_DISPLAY[entry["label"]],
-                self._format_time(entry["duration"]),
-            ), tags=(tag,))
+                start_str,
+                end_str,
+                LABEL_DISPLAY[entry.label],
+                self._format_time(entry.frames / self.fps),
+            ), tags=(f"cat{entry.code}",))
 
-        self.label_tree.tag_configure("katma", foreground="#2ecc71")
-        self.label_tree.tag_configure("diger", foreground="#e74c3c")
+        for code, name in enumerate(CATEGORIES):
+            self.label_tree.tag_configure(f"cat{code}", foreground=LABEL_COLORS[name])
 
     def _on_label_double_click(self, event):
         sel = self.label_tree.selection()
@@ -707,74 +1012,29 @@ class VideoLabelingApp:
             self._update_time_display()
 
     # ─── İstatistikler ───────────────────────────────────────────────
-    def _calculate_cycle_times(self):
-        """Katma değerli işler arası çevrim sürelerini hesapla.
-        Çevrim süresi = Bir KDİ başlangıcından sonraki KDİ başlangıcına kadar geçen süre.
-        """
-        katma_entries = sorted(
-            [e for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI],
-            key=lambda x: x["start_time"]
-        )
-        cycle_times = []
-        for i in range(1, len(katma_entries)):
-            ct = katma_entries[i]["start_time"] - katma_entries[i - 1]["start_time"]
-            cycle_times.append(ct)
-        return cycle_times, katma_entries
-
     def _update_stats(self):
         self.stats_text.delete("1.0", tk.END)
-
-        if not self.labels:
-            self.stats_text.insert(tk.END, "Henüz etiket yok.\n")
-            return
-
-        katma_total = sum(e["duration"] for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI)
-        diger_total = sum(e["duration"] for e in self.labels if e["label"] == LABEL_DIGER)
-        total = katma_total + diger_total
-
-        katma_count = sum(1 for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI)
-        diger_count = sum(1 for e in self.labels if e["label"] == LABEL_DIGER)
-
-        video_duration = self.total_frames / self.fps if self.fps else 0
-        labeled_pct = (total / video_duration * 100) if video_duration else 0
-        katma_pct = (katma_total / total * 100) if total else 0
-
-        stats = (
-            f"Toplam Etiket    : {len(self.labels)}\n"
-            f"─────────────────────────\n"
-            f"Katma Değerli İş : {katma_count} adet\n"
-            f"  Toplam Süre    : {self._format_time(katma_total)}\n"
-            f"  Oran           : {katma_pct:.1f}%\n"
-            f"─────────────────────────\n"
-            f"Diğer            : {diger_count} adet\n"
-            f"  Toplam Süre    : {self._format_time(diger_total)}\n"
-            f"─────────────────────────\n"
-            f"Etiketlenen      : {self._format_time(total)}\n"
-            f"Video Süresi     : {self._format_time(video_duration)}\n"
-            f"Kapsam           : {labeled_pct:.1f}%\n"
-        )
-
-        # Çevrim Süresi Analizi
-        cycle_times, katma_entries = self._calculate_cycle_times()
-        if cycle_times:
-            avg_cycle = sum(cycle_times) / len(cycle_times)
-            min_cycle = min(cycle_times)
-            max_cycle = max(cycle_times)
-            avg_katma_dur = katma_total / katma_count if katma_count else 0
-
-            stats += (
-                f"═════════════════════════\n"
-                f"ÇEVRİM SÜRESİ ANALİZİ\n"
-                f"─────────────────────────\n"
-                f"  Çevrim Sayısı  : {len(cycle_times)}\n"
-                f"  Ort. Çevrim    : {self._format_time(avg_cycle)}\n"
-                f"  Min Çevrim     : {self._format_time(min_cycle)}\n"
-                f"  Max Çevrim     : {self._format_time(max_cycle)}\n"
-                f"  Ort. KDİ Süresi: {self._format_time(avg_katma_dur)}\n"
-                f"  Verimlilik     : {avg_katma_dur / avg_cycle * 100:.1f}%\n"
-            )
-
-        self.stats_text.insert(tk.END, stats)
+        self.stats_text.insert(tk.END, format_stats(self.labels, self.total_frames, self.fps,
+                                                    start_clock=recording_start_clock(self.video_path)))
+
+    # ─── Ön hesaplama ────────────────────────────────────────────────
+    def _on_precomputed(self, path, job, result):
+        # İşçi iş parçacığından çağrılır
+        self.root.after(0, lambda: self._apply_precomputed(path, job, result))
+
+    def _apply_precomputed(self, path, job, result):
+        if (job == "proxy" and not self.playing and isinstance(self.reader, MultiViewReader)
+                and path in self.reader.paths):
+            self.reader.refresh_proxies()
+            return
+        if path != self.video_path or not self.reader:
+            return
+        if job == "activity":
+            self._activity = result
+            self._update_timeline()
+        elif job == "proxy" and not self.playing:
+            # Sonraki seek/oynatmadan itibaren proxy okunur
+            self.reader.proxy = proxy_for(path)
 
     # ─── Timeline ────────────────────────────────────────────────────
     def _update_timeline(self):
@@ -787,11 +1047,21 @@ class VideoLabelingApp:
 
         self.timeline_canvas.create_rectangle(0, 0, w, h, fill="#181825", outline="")
 
-        for entry in self.labels:
-            x1 = int(entry["start_frame"] / self.total_frames * w)
-            x2 = int(entry["end_frame"] / self.total_frames * w)
-            color = LABEL_COLORS[entry["label"]]
-            self.timeline_canvas.create_rectangle(x1, 5, x2, h - 5, fill=color, outline="")
+        # Etkinlik sinyali (ön hesaplanmışsa): piksel sütunu başına en yüksek değer
+        values = self._activity["values"] if self._activity else None
+        if values:
+            peak = max(values) or 1.0
+            per_px = len(values) / w
+            points = []
+            for x in range(0, w, 2):
+                chunk = values[int(x * per_px):int((x + 2) * per_px) + 1]
+                points += [x, h - 5 - (max(chunk) / peak) * (h - 10)]
+            if len(points) >= 4:
+                self.timeline_canvas.create_line(*points, fill="#45475a")
+
+        # Piksel sütunu başına baskın kategori: dikdörtgen sayısı etiket sayısından bağımsız
+        for x1, x2, name in timeline_runs(self.labels, self.total_frames, w):
+            self.timeline_canvas.create_rectangle(x1, 5, x2, h - 5, fill=LABEL_COLORS[name], outline="")
 
         cx = int(self.current_frame / self.total_frames * w)
         self.timeline_canvas.create_line(cx, 0, cx, h, fill="white", width=2)
@@ -811,39 +1081,19 @@ class VideoLabelingApp:
 
     # ─── Kayıt / Yükleme ────────────────────────────────────────────
     def _save_labels(self, auto=False):
+        if self.remote:
+            # Her değişiklik sunucuda anında kaydedilir
+            if not auto and self.video_path:
+                self.status_var.set(f"Etiketler sunucuda kayıtlı: {self.remote.base_url}")
+            return
         if not self.label_file:
             if not auto:
                 messagebox.showwarning("Uyarı", "Önce video yükleyin")
             return
 
-        cycle_times, katma_entries = self._calculate_cycle_times()
-        cycle_data = {}
-        if cycle_times:
-            avg_katma_dur = sum(e["duration"] for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI) / max(1, sum(1 for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI))
-            avg_cycle = sum(cycle_times) / len(cycle_times)
-            cycle_data = {
-                "cycle_count": len(cycle_times),
-                "cycle_times": [round(ct, 2) for ct in cycle_times],
-                "avg_cycle_time": round(avg_cycle, 2),
-                "min_cycle_time": round(min(cycle_times), 2),
-                "max_cycle_time": round(max(cycle_times), 2),
-                "avg_kdi_duration": round(avg_katma_dur, 2),
-                "efficiency_pct": round(avg_katma_dur / avg_cycle * 100, 2) if avg_cycle else 0,
-            }
-
-        data = {
-            "video_file": os.path.basename(self.video_path),
-            "video_path": self.video_path,
-            "fps": self.fps,
-            "total_frames": self.total_frames,
-            "total_duration": self.total_frames / self.fps,
-            "created": datetime.now().isoformat(),
-            "cycle_time_analysis": cycle_data,
-            "labels": self.labels,
-        }
-
-        with open(self.label_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        # Otomatik kayıt her etikette çalışır; çevrim analizi yalnızca açık kayıtta yazılır
+        save_label_file(self.label_file, self.labels, self.video_path, self.fps, self.total_frames,
+                        fingerprint=self.label_fingerprint, analytics=not auto)
 
         if not auto:
             self.status_var.set(f"Etiketler kaydedildi: {self.label_file}")
@@ -851,39 +1101,72 @@ class VideoLabelingApp:
     def _load_labels(self):
         self.labels = []
         self.current_label = None
+        self._label_version = None
+        self._poll_gen += 1
 
-        if self.label_file and os.path.exists(self.label_file):
+        if self.remote:
             try:
-                with open(self.label_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.labels = data.get("labels", [])
-                self.status_var.set(f"{len(self.labels)} etiket yüklendi")
-            except Exception as e:
-                self.status_var.set(f"Etiket dosyası okunamadı: {e}")
+                result = self.remote.labels(self.video_path)
+                self._apply_remote_labels(result, refresh=False)
+                self.status_var.set(f"{len(self.labels)} etiket yüklendi (sunucu)")
+            except (RemoteError, OSError) as e:
+                self.status_var.set(f"Etiketler sunucudan alınamadı: {e}")
+            threading.Thread(target=self._poll_labels, args=(self.video_path, self._poll_gen),
+                             daemon=True).start()
+        elif self.label_file:
+            # Yandaki dosya yoksa (klasör taşınmış) içerik önbelleğindeki yedek okunur
+            source = find_label_file(self.video_path)
+            if os.path.exists(source):
+                try:
+                    self.labels = load_label_file(source)
+                    restored = " (önbellekteki yedekten)" if source != self.label_file else ""
+                    self.status_var.set(f"{len(self.labels)} etiket yüklendi{restored}")
+                except Exception as e:
+                    self.status_var.set(f"Etiket dosyası okunamadı: {e}")
 
         self._update_label_list()
         self._update_stats()
         self._update_buttons()
 
+    def _apply_remote_labels(self, result, refresh=True):
+        """Sunucudaki etiket listesini yerel kopyaya al."""
+        if result["version"] == self._label_version:
+            return
+        self._label_version = result["version"]
+        self.labels = [Label.from_dict(e, self.fps) for e in result["labels"]]
+        if refresh:
+            self._update_label_list()
+            self._update_stats()
+            self._update_timeline()
+
+    def _poll_labels(self, video_id, gen):
+        """Diğer etiketleyicilerin değişikliklerini uzun yoklamayla izle (arka plan)."""
+        since = self._label_version
+        while self._poll_gen == gen:
+            try:
+                result = self.remote.labels(video_id, since=since, wait=LABEL_POLL_WAIT)
+            except (RemoteError, OSError):
+                time.sleep(2.0)
+                continue
+            if result["version"] != since:
+                since = result["version"]
+                self.root.after(0, self._on_remote_labels, result, gen)
+
+    def _on_remote_labels(self, result, gen):
+        if self._poll_gen == gen:
+            self._apply_remote_labels(result)
+
+    def _export_base(self):
+        """Dışa aktarım dosyalarının temel yolu; sunucu modunda çalışma klasörü."""
+        return os.path.basename(self.video_path) if self.remote else self.video_path
+
     def _export_csv(self):
         if not self.labels:
             messagebox.showinfo("Bilgi", "Dışa aktarılacak etiket yok")
             return
 
-        csv_path = self.video_path + ".labels.csv"
-        with open(csv_path, "w", encoding="utf-8") as f:
-            f.write("video_file,start_time,end_time,start_str,end_str,label,label_tr,duration_sec\n")
-            for entry in self.labels:
-                f.write(
-                    f"{os.path.basename(self.video_path)},"
-                    f"{entry['start_time']:.2f},"
-                    f"{entry['end_time']:.2f},"
-                    f"{entry['start_str']},"
-                    f"{entry['end_str']},"
-                    f"{entry['label']},"
-                    f"{LABEL_DISPLAY[entry['label']]},"
-                    f"{entry['duration']:.2f}\n"
-                )
+        csv_path = csv_path_for(self._export_base())
+        write_csv(csv_path, self.labels, self.video_path, self.fps)
 
         self.status_var.set(f"CSV kaydedildi: {csv_path}")
         messagebox.showinfo("CSV Dışa Aktarma", f"Etiketler CSV olarak kaydedildi:\n{csv_path}")
@@ -893,98 +1176,97 @@ class VideoLabelingApp:
             messagebox.showinfo("Bilgi", "Rapor oluşturmak için etiket gerekli")
             return
 
-        report_path = self.video_path + ".report.txt"
-
-        katma_total = sum(e["duration"] for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI)
-        diger_total = sum(e["duration"] for e in self.labels if e["label"] == LABEL_DIGER)
-        total = katma_total + diger_total
-        video_duration = self.total_frames / self.fps
-
-        katma_entries = [e for e in self.labels if e["label"] == LABEL_KATMA_DEGERLI]
-        diger_entries = [e for e in self.labels if e["label"] == LABEL_DIGER]
-
-        avg_katma = katma_total / len(katma_entries) if katma_entries else 0
-        avg_diger = diger_total / len(diger_entries) if diger_entries else 0
-
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write("=" * 60 + "\n")
-            f.write("  SASA POY - MASURA BÖLÜMÜ ZAMAN ETÜDÜ RAPORU\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(f"Video     : {os.path.basename(self.video_path)}\n")
-            f.write(f"Tarih     : {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-            f.write(f"Video Süresi: {self._format_time(video_duration)}\n\n")
-
-            f.write("-" * 60 + "\n")
-            f.write("ÖZET\n")
-            f.write("-" * 60 + "\n")
-            f.write(f"Toplam Etiket Sayısı    : {len(self.labels)}\n")
-            f.write(f"Etiketlenen Süre        : {self._format_time(total)}\n")
-            f.write(f"Kapsam Oranı            : {total / video_duration * 100:.1f}%\n\n")
-
-            f.write(f"KATMA DEĞERLİ İŞ\n")
-            f.write(f"  Adet               : {len(katma_entries)}\n")
-            f.write(f"  Toplam Süre        : {self._format_time(katma_total)}\n")
-            f.write(f"  Ortalama Süre      : {self._format_time(avg_katma)}\n")
-            if total:
-                f.write(f"  Oran (etiketli)    : {katma_total / total * 100:.1f}%\n\n")
-
-            f.write(f"DİĞER\n")
-            f.write(f"  Adet               : {len(diger_entries)}\n")
-            f.write(f"  Toplam Süre        : {self._format_time(diger_total)}\n")
-            f.write(f"  Ortalama Süre      : {self._format_time(avg_diger)}\n")
-            if total:
-                f.write(f"  Oran (etiketli)    : {diger_total / total * 100:.1f}%\n\n")
-
-            # Çevrim Süresi Analizi
-            cycle_times, katma_sorted = self._calculate_cycle_times()
-            if cycle_times:
-                avg_cycle = sum(cycle_times) / len(cycle_times)
-                avg_katma_dur = katma_total / len(katma_entries) if katma_entries else 0
-
-                f.write("-" * 60 + "\n")
-                f.write("ÇEVRİM SÜRESİ ANALİZİ\n")
-                f.write("-" * 60 + "\n")
-                f.write(f"  Çevrim Sayısı      : {len(cycle_times)}\n")
-                f.write(f"  Ortalama Çevrim    : {self._format_time(avg_cycle)}\n")
-                f.write(f"  Minimum Çevrim     : {self._format_time(min(cycle_times))}\n")
-                f.write(f"  Maksimum Çevrim    : {self._format_time(max(cycle_times))}\n")
-                f.write(f"  Ort. KDİ Süresi    : {self._format_time(avg_katma_dur)}\n")
-                f.write(f"  Verimlilik         : {avg_katma_dur / avg_cycle * 100:.1f}%\n\n")
-
-                f.write(f"  {'#':>4}  {'Çevrim Başı':>12}  {'Çevrim Süresi':>14}\n")
-                f.write("  " + "-" * 35 + "\n")
-                for i, ct in enumerate(cycle_times, 1):
-                    start_str = katma_sorted[i - 1]["start_str"]
-                    f.write(f"  {i:>4}  {start_str:>12}  {self._format_time(ct):>14}\n")
-                f.write("\n")
-
-            f.write("-" * 60 + "\n")
-            f.write("DETAYLI ETİKET LİSTESİ\n")
-            f.write("-" * 60 + "\n")
-            f.write(f"{'#':>4}  {'Başlangıç':>10}  {'Bitiş':>10}  {'Süre':>8}  {'Etiket'}\n")
-            f.write("-" * 60 + "\n")
-            for i, entry in enumerate(self.labels, 1):
-                f.write(
-                    f"{i:>4}  {entry['start_str']:>10}  {entry['end_str']:>10}  "
-                    f"{self._format_time(entry['duration']):>8}  {LABEL_DISPLAY[entry['label']]}\n"
-                )
+        report_path = report_path_for(self._export_base())
+        write_report(report_path, self.labels, self.video_path, self.total_frames, self.fps,
+                     start_clock=recording_start_clock(self.video_path))
 
         self.status_var.set(f"Rapor oluşturuldu: {report_path}")
         messagebox.showinfo("Rapor", f"Zaman etüdü raporu oluşturuldu:\n{report_path}")
 
+    def _compare_annotators(self):
+        """Etiketleyiciler arası uyum raporu.
+
+        Sunucu modunda etiketler `annotator` alanına göre ayrılır; tek kişilik
+        etiketlerde karşılaştırılacak diğer .labels.json dosyaları sorulur.
+        """
+        if not self.reader:
+            messagebox.showwarning("Uyarı", "Önce video yükleyin")
+            return
+        groups = split_by_annotator(self.labels)
+        if len(groups) < 2:
+            paths = filedialog.askopenfilenames(
+                initialdir=os.path.dirname(os.path.abspath(self.video_path)),
+                title="Karşılaştırılacak etiket dosyalarını seçin",
+                filetypes=[("Etiket", "*.labels.json"), ("JSON", "*.json")]
+            )
+            if not paths:
+                return
+            groups = {"bu video": self.labels}
+            for p in paths:
+                groups[os.path.basename(p).replace(".labels.json", "")] = labels_from_document(load_label_document(p))
+
+        result, _ = analyze_agreement(list(groups.values()), list(groups), self.total_frames, self.fps)
+        report_path = agreement_path_for(self._export_base())
+        write_agreement_report(report_path, result)
+
+        summary = "\n".join(
+            f"{p['a']} ↔ {p['b']}: kappa {p['kappa']:.3f}, kare uyumu {p['frame_agreement_pct']:.1f}%, "
+            f"çevrim farkı {p['cycles']['difference']:+d}"
+            for p in result["pairs"] if p["kappa"] is not None
+        )
+        self.status_var.set(f"Uyum raporu: {report_path}")
+        messagebox.showinfo("Etiketçi Uyumu", f"{summary}\n\nRapor:\n{report_path}")
+
+    def _export_burnin(self):
+        """Etiketleri kareye yakılmış videoyu arka planda dışa aktar."""
+        if not self.reader or not self._local_only():
+            return
+        if is_manifest(self.video_path) or is_session(self.video_path):
+            messagebox.showwarning("Uyarı", "Etiketli video yalnızca tek video dosyası için oluşturulabilir")
+            return
+        if self._burnin:
+            self._burnin.cancel.set()
+            self.status_var.set("Etiketli video aktarımı iptal ediliyor...")
+            return
+
+        def progress(done, total):
+            self.root.after(0, lambda: self.status_var.set(
+                f"Etiketli video: {done}/{total} kare ({done / max(1, total) * 100:.0f}%)"))
+
+        exporter = BurnInExporter(self.video_path, list(self.labels), burnin_path_for(self.video_path),
+                                  progress=progress)
+        self._burnin = exporter
+        self.burnin_btn.configure(text="Aktarımı İptal Et")
+        threading.Thread(target=self._run_burnin, args=(exporter,), daemon=True).start()
+
+    def _run_burnin(self, exporter):
+        try:
+            result, error = exporter.run(), None
+        except Exception as e:
+            result, error = None, e
+        self.root.after(0, lambda: self._on_burnin_done(result, error))
+
+    def _on_burnin_done(self, result, error):
+        self._burnin = None
+        self.burnin_btn.configure(text="Etiketli Video")
+        if error:
+            self.status_var.set(f"Etiketli video oluşturulamadı: {error}")
+        elif result["cancelled"]:
+            self.status_var.set("Etiketli video aktarımı iptal edildi")
+        else:
+            self.status_var.set(f"Etiketli video: {result['out_path']} ({result['seconds']} sn, "
+                                f"gerçek zamanın {result['realtime_factor']}x'i)")
+
     # ─── Yardımcılar ─────────────────────────────────────────────────
     def _format_time(self, seconds):
-        seconds = max(0, seconds)
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        if h > 0:
-            return f"{h:02d}:{m:02d}:{s:02d}"
-        return f"{m:02d}:{s:02d}"
+        return format_time(seconds)
 
     def _update_time_display(self):
         if self.reader and self.fps > 0:
             current = self._format_time(self.current_frame / self.fps)
+            if isinstance(self.reader, SessionReader):
+                index = self.reader.segment_at(self.current_frame / self.fps)
+                current += f"  [{index + 1}/{len(self.reader.segments)}]"
             total = self._format_time(self.total_frames / self.fps)
             self.time_label_left.configure(text=current)
             self.time_label_right.configure(text=total)
@@ -992,16 +1274,45 @@ class VideoLabelingApp:
     def _quit(self):
         if self.labels and self.video_path:
             self._save_labels(auto=True)
+        self._poll_gen += 1
+        if self._burnin:
+            self._burnin.cancel.set()
+        if self.precompute:
+            self.precompute.stop()
         self.playing = False
         if self.reader:
             self.reader.release()
+        self.perf.stop_trace()
         self.root.quit()
         self.root.destroy()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="SASA POY video etiketleme")
+    parser.add_argument("--hud", action="store_true", help="performans göstergesi açık başla")
+    parser.add_argument("--trace", metavar="DOSYA", help="kare başına süre izini JSONL olarak yaz")
+    parser.add_argument("--multiview", nargs="+", metavar="VIDEO", help="kameraları döşeli, ortak saatle aç")
+    parser.add_argument("--offsets", nargs="+", type=float, metavar="SANIYE", help="--multiview için kamera ofsetleri")
+    parser.add_argument("--session", nargs="+", metavar="VIDEO", help="bölünmüş kayıtları tek oturum olarak aç")
+    parser.add_argument("--server", metavar="URL", help="etiketleme sunucusuna bağlan (ör. http://127.0.0.1:8765)")
+    parser.add_argument("--annotator", metavar="AD", help="sunucu modunda etiketleyici adı (varsayılan: kullanıcı adı)")
+    parser.add_argument("--cache-dir", metavar="KLASÖR", help="ortak ön hesaplama önbelleği (ör. ağ paylaşımı)")
+    parser.add_argument("--taxonomy", metavar="JSON", help="etiket kategorileri yapılandırması (kısayol, renk)")
+    parser.add_argument("--reaction-ms", type=float, default=default_reaction_ms(), metavar="MS",
+                        help="tepki süresi telafisi: etiket sınırı tuştan MS önce ekranda olan kare")
+    args = parser.parse_args()
+    if args.cache_dir:
+        set_cache_dir(args.cache_dir)
+    if args.taxonomy:
+        load_taxonomy(args.taxonomy)
+
     root = tk.Tk()
-    app = VideoLabelingApp(root)
+    app = VideoLabelingApp(root, hud=args.hud, trace_path=args.trace, server=args.server, annotator=args.annotator,
+                           reaction_ms=args.reaction_ms)
+    if args.multiview:
+        app._open_multiview(args.multiview, args.offsets or [0.0] * len(args.multiview))
+    elif args.session:
+        app._open_session(args.session)
     root.protocol("WM_DELETE_WINDOW", app._quit)
     root.mainloop()
 
@@ -0,0 +1,47 @@
+"""
+SASA POY - Video Etiketleme çekirdeği
+
+Tk gerektirmeyen okuyucu, etiket modeli, istatistik ve dışa aktarma.
+Betiklerden arayüz yüklemeden kullanılabilir:
+
+    from labeling_core import FFmpegVideoReader, load_label_file, format_stats
+"""
+
+from .labels import (
+    LABEL_KATMA_DEGERLI,
+    LABEL_DIGER,
+    LABEL_COLORS,
+    LABEL_DISPLAY,
+    CATEGORIES,
+    CATEGORY_KEYS,
+    Label,
+    cycle_category,
+    label_arrays,
+    label_file_path,
+    find_label_file,
+    video_fingerprint,
+    make_entry,
+    build_label_document,
+    save_label_file,
+    load_label_document,
+    load_label_file,
+    labels_from_document,
+    load_taxonomy,
+    set_taxonomy,
+    taxonomy,
+)
+from .stats import calculate_cycle_times, category_totals, cycle_time_analysis, format_stats
+from .timeline import category_coverage, timeline_runs
+from .cycles import analyze_cycles, recording_start_clock
+from .export import csv_path_for, report_path_for, write_csv, write_report
+from .cache import fingerprint, set_cache_dir
+from .perf import PerfMonitor, RollingHistogram
+from .presentation import PresentationClock, default_reaction_ms
+from .reader import FFmpegVideoReader
+from .roi import load_roi, normalize_roi, save_roi
+from .multiview import MultiViewReader, is_manifest, load_manifest, manifest_path_for, save_manifest
+from .session import SessionReader, is_session, load_session, save_session, session_path_for
+from .sources import is_video_source, list_video_sources, open_video
+from .client import RemoteClient, RemoteError, RemoteVideoReader
+from .utils import format_time
+from .lazy import lazy_import, preload
@@ -0,0 +1,424 @@
+"""
+Çoklu etiketleyici karşılaştırması: kare dizileri, uyum ölçütleri ve uzlaşı
+
+Her etiketleyicinin etiketleri, videonun her karesi için bir kategori kodu
+taşıyan uint8 diziye dökülür (0 = etiketsiz). Kare düzeyi Cohen kappa,
+sınır kayması dağılımları ve çevrim sayısı farkları bu diziler ve sıralı
+sınır kareleri üzerinde NumPy ile hesaplanır; 24 saatlik video (25 fps'te
+2,16 milyon kare) saniyeler içinde karşılaştırılır.
+
+Kullanım:
+  python -m labeling_core.agreement a.labels.json b.labels.json
+  python -m labeling_core.agreement a.labels.json b.labels.json c.labels.json \\
+      --merged uzlasi.labels.json --report uyum.txt --json uyum.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+from datetime import datetime
+
+from .labels import (
+    CATEGORIES,
+    CATEGORY_CODE,
+    LABEL_DISPLAY,
+    cycle_category,
+    label_arrays,
+    labels_from_document,
+    load_label_document,
+    load_taxonomy,
+    make_entry,
+    save_label_file,
+)
+from .lazy import lazy_import
+from .utils import format_time
+
+np = lazy_import("numpy")
+
+UNLABELED = 0   # kare dizilerinde kategori kodu + 1; 0 etiketsiz
+
+BOUNDARY_TOLERANCE = 1.0   # sn; bu kadar yakın sınırlar eşleşmiş sayılır
+OFFSET_HISTOGRAM_BINS = 10
+DISPUTED_LIST_LIMIT = 20
+
+
+def agreement_path_for(video_path):
+    return video_path + ".agreement.txt"
+
+
+# ─── Kare dizileri ──────────────────────────────────────────────────
+def _label_arrays(labels, total_frames):
+    """(başlangıç, bitiş, kod) dizileri; kareler videoya kırpılır, boş aralıklar atılır."""
+    starts, ends, codes = label_arrays(labels)
+    starts = np.clip(starts.astype(np.int64), 0, total_frames)
+    ends = np.clip(ends.astype(np.int64), 0, total_frames)
+    codes = codes.astype(np.uint8) + 1   # 0 etiketsiz'e ayrılmış
+    valid = ends > starts
+    return starts[valid], ends[valid], codes[valid]
+
+
+def rasterize(labels, total_frames):
+    """Etiketleri kare başına kategori kodu dizisine dök (0 = etiketsiz).
+
+    Çakışma yoksa (olağan durum) boşluk/etiket uzunluklarından tek np.repeat
+    ile kurulur. Çakışan etiketlerde sonraki kayıt öncekini ezer; zaman
+    çizelgesindeki çizim sırasıyla aynı.
+    """
+    if not labels or total_frames <= 0:
+        return np.zeros(max(0, total_frames), dtype=np.uint8)
+    starts, ends, codes = _label_arrays(labels, total_frames)
+    if starts.size == 0:
+        return np.zeros(total_frames, dtype=np.uint8)
+
+    order = np.argsort(starts, kind="stable")
+    s, e, c = starts[order], ends[order], codes[order]
+    if np.all(s[1:] >= e[:-1]):
+        n = s.size
+        lengths = np.empty(2 * n + 1, dtype=np.int64)
+        lengths[0:-1:2] = s - np.concatenate(([0], e[:-1]))
+        lengths[1::2] = e - s
+        lengths[-1] = total_frames - e[-1]
+        values = np.zeros(2 * n + 1, dtype=np.uint8)
+        values[1::2] = c
+        return np.repeat(values, lengths)
+
+    frames = np.zeros(total_frames, dtype=np.uint8)
+    for start, end, code in zip(starts.tolist(), ends.tolist(), codes.tolist()):
+        frames[start:end] = code
+    return frames
+
+
+def runs(frames):
+    """Ardışık eşit değerli bölümler: (başlangıçlar, bitişler, değerler)."""
+    if frames.size == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, frames[:0]
+    change = np.flatnonzero(frames[1:] != frames[:-1]) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [frames.size]))
+    return starts, ends, frames[starts]
+
+
+def to_labels(frames):
+    """Kare dizisini etiket kayıtlarına geri çevir (etiketsiz bölümler atlanır)."""
+    starts, ends, values = runs(frames)
+    keep = values != UNLABELED
+    return [
+        make_entry(s, e, CATEGORIES[v - 1])
+        for s, e, v in zip(starts[keep].tolist(), ends[keep].tolist(), values[keep].tolist())
+    ]
+
+
+def category_events(labels, label):
+    """Kategorinin sıralı başlangıç ve bitiş kareleri."""
+    starts, ends, codes = label_arrays(labels)
+    selected = codes == CATEGORY_CODE[label]
+    return np.sort(starts[selected].astype(np.int64)), np.sort(ends[selected].astype(np.int64))
+
+
+def split_by_annotator(labels):
+    """Etiketleri `annotator` alanına göre grupla (sunucu modunda tek dosyada birden çok kişi)."""
+    groups = {}
+    for entry in labels:
+        groups.setdefault(entry.get("annotator") or "?", []).append(entry)
+    return groups
+
+
+# ─── Ölçütler ───────────────────────────────────────────────────────
+def confusion_matrix(a, b):
+    """Satır: A'nın kodu, sütun: B'nin kodu; kare sayıları."""
+    num_codes = len(CATEGORIES) + 1
+    return np.bincount(a.astype(np.int64) * num_codes + b, minlength=num_codes * num_codes).reshape(
+        num_codes, num_codes)
+
+
+def cohen_kappa(cm):
+    """Karışıklık matrisinden Cohen kappa (kare yoksa None)."""
+    n = cm.sum()
+    if n == 0:
+        return None
+    po = np.trace(cm) / n
+    pe = float(cm.sum(axis=1) @ cm.sum(axis=0)) / (n * n)
+    if pe >= 1.0:
+        return 1.0
+    return float((po - pe) / (1.0 - pe))
+
+
+def boundary_offsets(ref, other, fps, tolerance=BOUNDARY_TOLERANCE):
+    """Her referans sınırına en yakın diğer sınırın işaretli kayması (sn).
+
+    Pozitif kayma, diğer etiketleyicinin sınırı daha geç işaretlediğini
+    gösterir. Tolerans içindekiler eşleşmiş sayılır; dağılım onlardan.
+    """
+    result = {"count": int(ref.size), "matched": 0, "matched_pct": 0.0}
+    if ref.size == 0 or other.size == 0:
+        return result
+    idx = np.searchsorted(other, ref)
+    left = other[np.clip(idx - 1, 0, other.size - 1)]
+    right = other[np.clip(idx, 0, other.size - 1)]
+    nearest = np.where(np.abs(ref - left) <= np.abs(right - ref), left, right)
+    offsets = (nearest - ref) / fps
+    matched = offsets[np.abs(offsets) <= tolerance]
+    result["matched"] = int(matched.size)
+    result["matched_pct"] = round(matched.size / ref.size * 100, 2)
+    if matched.size:
+        abs_off = np.abs(matched)
+        p50, p90, p95 = np.percentile(abs_off, [50, 90, 95])
+        counts, edges = np.histogram(matched, bins=OFFSET_HISTOGRAM_BINS, range=(-tolerance, tolerance))
+        result.update({
+            "mean_offset": round(float(matched.mean()), 3),
+            "abs_p50": round(float(p50), 3),
+            "abs_p90": round(float(p90), 3),
+            "abs_p95": round(float(p95), 3),
+            "abs_max": round(float(abs_off.max()), 3),
+            "histogram": {"edges": [round(float(x), 3) for x in edges], "counts": counts.tolist()},
+        })
+    return result
+
+
+def cycle_difference(a_labels, b_labels, total_frames, fps):
+    """KDİ başlangıçlarından çevrim sayısı ve ortalama çevrim farkı, saat saat."""
+    a_starts, _ = category_events(a_labels, cycle_category())
+    b_starts, _ = category_events(b_labels, cycle_category())
+    hour_frames = 3600 * fps
+    hours = max(1, int(np.ceil(total_frames / hour_frames)))
+    a_hourly = np.bincount((a_starts // hour_frames).astype(np.int64), minlength=hours)[:hours]
+    b_hourly = np.bincount((b_starts // hour_frames).astype(np.int64), minlength=hours)[:hours]
+
+    def mean_cycle(starts):
+        return round(float(np.diff(starts).mean() / fps), 2) if starts.size > 1 else None
+
+    return {
+        "a_cycles": max(0, int(a_starts.size) - 1),
+        "b_cycles": max(0, int(b_starts.size) - 1),
+        "difference": int(b_starts.size) - int(a_starts.size),
+        "a_avg_cycle_time": mean_cycle(a_starts),
+        "b_avg_cycle_time": mean_cycle(b_starts),
+        "hourly_difference": (b_hourly - a_hourly).tolist(),
+    }
+
+
+def compare(a_labels, b_labels, total_frames, fps, tolerance=BOUNDARY_TOLERANCE, rasters=None):
+    """İki etiketleyicinin kare, sınır ve çevrim düzeyinde uyumu."""
+    a, b = rasters if rasters else (rasterize(a_labels, total_frames), rasterize(b_labels, total_frames))
+    cm = confusion_matrix(a, b)
+    n = cm.sum()
+    both = cm[1:, 1:]
+    category = {}
+    for code, label in enumerate(CATEGORIES, 1):
+        denom = cm[code, :].sum() + cm[:, code].sum()
+        category[label] = round(float(2 * cm[code, code] / denom * 100), 2) if denom else None
+
+    boundaries = {}
+    for code, label in enumerate(CATEGORIES, 1):
+        if not cm[code, :].sum() and not cm[:, code].sum():
+            continue  # iki etiketleyici de kullanmamış
+        a_starts, a_ends = category_events(a_labels, label)
+        b_starts, b_ends = category_events(b_labels, label)
+        boundaries[f"{label}.start"] = boundary_offsets(a_starts, b_starts, fps, tolerance)
+        boundaries[f"{label}.end"] = boundary_offsets(a_ends, b_ends, fps, tolerance)
+
+    kappa = cohen_kappa(cm)
+    kappa_labeled = cohen_kappa(both)
+    return {
+        "frames": int(n),
+        "frame_agreement_pct": round(float(np.trace(cm) / n * 100), 2) if n else None,
+        "kappa": round(kappa, 4) if kappa is not None else None,
+        "kappa_labeled": round(kappa_labeled, 4) if kappa_labeled is not None else None,
+        "confusion": cm.tolist(),
+        "category_agreement_pct": category,
+        "boundaries": boundaries,
+        "cycles": cycle_difference(a_labels, b_labels, total_frames, fps),
+    }
+
+
+# ─── Uzlaşı ─────────────────────────────────────────────────────────
+def consensus(rasters, min_frames=0):
+    """Kare başına salt çoğunluk oyu; çoğunluk yoksa etiketsiz (0).
+
+    İki etiketleyicide bu, yalnızca aynı etiketlenen karelerin kalması
+    demektir. min_frames'ten kısa kalan etiketli bölümler atılır.
+    """
+    stack = np.stack(rasters)
+    # Yalnızca kullanılan kategoriler oylanır; kayıttaki kategori sayısı maliyeti artırmaz
+    used = np.bincount(stack.ravel(), minlength=len(CATEGORIES) + 1)
+    codes = np.flatnonzero(used[1:]).astype(np.uint8) + 1
+    if codes.size == 0:
+        return np.zeros(stack.shape[1], dtype=np.uint8)
+    votes = np.stack([(stack == c).sum(axis=0, dtype=np.int32) for c in codes])
+    best = votes.argmax(axis=0)
+    top = np.take_along_axis(votes, best[None, :], axis=0)[0]
+    merged = np.where(top * 2 > len(rasters), codes[best], UNLABELED).astype(np.uint8)
+    if min_frames > 1:
+        starts, ends, values = runs(merged)
+        values = values.copy()
+        values[(ends - starts < min_frames) & (values != UNLABELED)] = UNLABELED
+        merged = np.repeat(values, ends - starts)
+    return merged
+
+
+def disputed_segments(rasters, merged):
+    """En az bir kişinin etiketleyip uzlaşının boş bıraktığı bölümler."""
+    labeled_any = np.any(np.stack(rasters) != UNLABELED, axis=0)
+    mask = (labeled_any & (merged == UNLABELED)).astype(np.uint8)
+    starts, ends, values = runs(mask)
+    keep = values == 1
+    return starts[keep], ends[keep]
+
+
+def analyze_agreement(label_sets, names, total_frames, fps, tolerance=BOUNDARY_TOLERANCE, min_duration=0.0):
+    """Tüm ikililerin uyumu ve uzlaşı etiketleri.
+
+    Dönüş: (sonuç sözlüğü, uzlaşı etiket listesi).
+    """
+    rasters = [rasterize(labels, total_frames) for labels in label_sets]
+    pairs = []
+    for i, j in itertools.combinations(range(len(label_sets)), 2):
+        result = compare(label_sets[i], label_sets[j], total_frames, fps, tolerance,
+                         rasters=(rasters[i], rasters[j]))
+        pairs.append({"a": names[i], "b": names[j], **result})
+
+    merged = consensus(rasters, min_frames=int(round(min_duration * fps)))
+    merged_labels = to_labels(merged)
+    d_starts, d_ends = disputed_segments(rasters, merged)
+    order = np.argsort(d_starts - d_ends, kind="stable")[:DISPUTED_LIST_LIMIT]
+    result = {
+        "annotators": list(names),
+        "fps": fps,
+        "total_frames": total_frames,
+        "tolerance": tolerance,
+        "pairs": pairs,
+        "consensus": {
+            "labels": len(merged_labels),
+            "disputed_segments": int(d_starts.size),
+            "disputed_seconds": round(float((d_ends - d_starts).sum() / fps), 2),
+            "longest_disputed": [
+                {"start_frame": int(d_starts[k]), "end_frame": int(d_ends[k])} for k in order
+            ],
+        },
+    }
+    return result, merged_labels
+
+
+# ─── Rapor ──────────────────────────────────────────────────────────
+def format_agreement(result):
+    """Uyum sonucunun metin özeti."""
+    fps = result["fps"]
+    lines = [
+        "=" * 60,
+        "  SASA POY - ETİKETLEYİCİ UYUM RAPORU",
+        "=" * 60,
+        "",
+        f"Tarih         : {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"Etiketleyici  : {', '.join(result['annotators'])}",
+        f"Video Süresi  : {format_time(result['total_frames'] / fps)}",
+        f"Sınır Toleransı: ±{result['tolerance']:.1f} sn",
+        "",
+    ]
+    for pair in result["pairs"]:
+        kappa = pair["kappa"]
+        kappa_labeled = pair["kappa_labeled"]
+        lines += [
+            "-" * 60,
+            f"{pair['a']}  ↔  {pair['b']}",
+            "-" * 60,
+            f"  Kare Uyumu         : {pair['frame_agreement_pct']:.1f}%",
+            f"  Cohen Kappa        : {kappa:.3f}" if kappa is not None else "  Cohen Kappa        : -",
+            f"  Kappa (ikisi de etiketli): {kappa_labeled:.3f}" if kappa_labeled is not None
+            else "  Kappa (ikisi de etiketli): -",
+        ]
+        for label, pct in pair["category_agreement_pct"].items():
+            if pct is not None:  # iki etiketleyicinin de kullanmadığı kategoriler yazılmaz
+                lines.append(f"  {LABEL_DISPLAY[label]:<19}: {pct:.1f}% örtüşme")
+        lines.append("")
+        lines.append(f"  {'Sınır':<26} {'Eşleşen':>8} {'Ort.':>7} {'|p50|':>7} {'|p90|':>7}")
+        for name, b in pair["boundaries"].items():
+            label, kind = name.split(".")
+            title = f"{LABEL_DISPLAY[label]} {'başı' if kind == 'start' else 'sonu'}"
+            if b["matched"]:
+                lines.append(f"  {title:<26} {b['matched_pct']:>7.1f}% {b['mean_offset']:>+6.2f}s "
+                             f"{b['abs_p50']:>6.2f}s {b['abs_p90']:>6.2f}s")
+            else:
+                lines.append(f"  {title:<26} {'-':>8}")
+        c = pair["cycles"]
+        lines += [
+            "",
+            f"  Çevrim Sayısı      : {c['a_cycles']} / {c['b_cycles']} (fark {c['difference']:+d})",
+        ]
+        if c["a_avg_cycle_time"] and c["b_avg_cycle_time"]:
+            lines.append(f"  Ort. Çevrim        : {format_time(c['a_avg_cycle_time'])} / "
+                         f"{format_time(c['b_avg_cycle_time'])}")
+        hourly = c["hourly_difference"]
+        if len(hourly) > 1 and any(hourly):
+            lines.append("  Saatlik KDİ Farkı  : " + " ".join(f"{d:+d}" for d in hourly))
+        lines.append("")
+
+    cons = result["consensus"]
+    lines += [
+        "-" * 60,
+        "UZLAŞI",
+        "-" * 60,
+        f"  Uzlaşı Etiketi     : {cons['labels']}",
+        f"  Anlaşmazlık        : {cons['disputed_segments']} bölüm, {format_time(cons['disputed_seconds'])}",
+    ]
+    if cons["longest_disputed"]:
+        lines.append("  En uzun anlaşmazlıklar:")
+        for d in cons["longest_disputed"]:
+            lines.append(f"    {format_time(d['start_frame'] / fps):>8} - {format_time(d['end_frame'] / fps):>8}  "
+                         f"({(d['end_frame'] - d['start_frame']) / fps:.1f} sn)")
+    return "\n".join(lines) + "\n"
+
+
+def write_agreement_report(report_path, result):
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(format_agreement(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Etiketleyiciler arası uyum ve uzlaşı etiketleri")
+    parser.add_argument("files", nargs="+", help=".labels.json dosyaları (tek dosyada annotator alanına göre ayrılır)")
+    parser.add_argument("--names", nargs="+", help="etiketleyici adları (varsayılan: dosya adları)")
+    parser.add_argument("--tolerance", type=float, default=BOUNDARY_TOLERANCE, help="sınır eşleşme toleransı (sn)")
+    parser.add_argument("--min-duration", type=float, default=0.0, help="uzlaşıda atılacak kısa bölüm eşiği (sn)")
+    parser.add_argument("--merged", help="uzlaşı etiketlerinin yazılacağı .labels.json")
+    parser.add_argument("--report", help="metin raporu (varsayılan: ekrana)")
+    parser.add_argument("--json", help="ölçütlerin yazılacağı JSON dosyası")
+    parser.add_argument("--taxonomy", metavar="JSON", help="etiket kategorileri yapılandırması")
+    args = parser.parse_args()
+    if args.taxonomy:
+        load_taxonomy(args.taxonomy)
+
+    docs = [load_label_document(p) for p in args.files]
+    if len(docs) == 1:
+        groups = split_by_annotator(labels_from_document(docs[0]))
+        names, label_sets = list(groups), list(groups.values())
+    else:
+        names = args.names or [os.path.basename(p).replace(".labels.json", "") for p in args.files]
+        label_sets = [labels_from_document(d) for d in docs]
+    if len(label_sets) < 2:
+        parser.error("Karşılaştırma için en az iki etiketleyici gerekli")
+
+    fps = docs[0].get("fps") or 25.0
+    total_frames = max(
+        [int(d.get("total_frames") or 0) for d in docs] +
+        [e.end_frame for labels in label_sets for e in labels]
+    )
+    result, merged = analyze_agreement(label_sets, names, total_frames, fps, args.tolerance, args.min_duration)
+
+    text = format_agreement(result)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.merged:
+        video_path = docs[0].get("video_path") or args.files[0]
+        save_label_file(args.merged, merged, video_path, fps, total_frames, backup=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,539 @@
+"""
+Etiketleri videoya yakarak (burn-in) dışa aktarma
+
+Kareler arka plan boru hattından akar: ffmpeg kod çözme → etiket aralıklarından
+bant/zaman damgası çizimi → stdin üzerinden ffmpeg kodlayıcı. Kareler toplu
+(batch) taşınır ve sabit sayıda önceden ayrılmış tampon döngüde yeniden
+kullanılır; üç aşama ayrı iş parçacıklarında eşzamanlı çalışır.
+
+fast_copy=True iken uzun etiketsiz bölümler yeniden kodlanmaz: anahtar
+kareler arasında kalan kısmı kaynaktan akış kopyasıyla (-c copy) alınır,
+etiketli bölümler kaynakla aynı kodek ve çözünürlükte kodlanıp birleştirilir.
+
+Çıktı aynı klasördeki geçici dosyaya yazılır ve yalnızca başarıyla bitince
+hedefin yerine konur (os.replace); iptal ya da hatada geçici dosya silinir,
+varsa önceki çıktı bozulmaz.
+
+Hız sınırı (tek çekirdek, bench_labeling burnin, 250 kare, 960x540 veryfast):
+kod çözme ve kodlama aynı çekirdeği paylaşır, süre ikisinin toplamıdır.
+1080p HEVC ~1.6-1.8x, 720p HEVC ~2-2.5x gerçek zaman; çizim kare başına
+~0.3 ms ile ihmal edilir. Çıktı boyutundan küçük kaynak büyütülmez (640x360
+H.264 ~2.7x yerine ~6x). Daha hızlısı için çekirdek, --preset ya da --fast-copy.
+
+Kullanım:
+  python -m labeling_core.burnin video.mp4
+  python -m labeling_core.burnin video.mp4 --fast-copy --threads 4 --out inceleme.mp4
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from .labels import (
+    CATEGORIES,
+    LABEL_COLORS,
+    LABEL_DISPLAY,
+    find_label_file,
+    label_arrays,
+    load_label_file,
+    load_taxonomy,
+)
+from .lazy import lazy_import
+from .precompute import keyframe_frames
+from .reader import DEFAULT_OUT_SIZE, FFmpegVideoReader
+from .utils import format_time
+
+np = lazy_import("numpy")
+cv2 = lazy_import("cv2")
+
+BURNIN_SUFFIX = ".burnin.mp4"
+EXPORT_BATCH = 16          # kare / toplu
+EXPORT_POOL = 4            # dolaşımdaki toplu tampon sayısı
+QUEUE_POLL_SEC = 0.2       # aşamalar arası kuyruk beklerken iptal yoklama aralığı
+FAST_COPY_MIN_SEC = 10.0   # bundan kısa etiketsiz bölümler kopyalanmaz, kodlanır
+OVERLAY_REF_HEIGHT = 540   # çizim ölçüleri bu yükseklik için (arayüz tuvali)
+BAND_CACHE_SIZE = 32       # önbellekteki düz renk bant sayısı (boyut x renk)
+
+# Kaynak kodeğine uyan kodlayıcı (fast_copy'de bölümler birleşebilsin diye)
+ENCODER_FOR_CODEC = {"h264": "libx264", "hevc": "libx265"}
+
+# Arayüz ve aktarma iş parçacıkları ortak kullanır: sınırlı LRU, kilitli
+_band_cache = OrderedDict()
+_band_lock = threading.Lock()
+
+
+def _banner_rgb(label):
+    # Kategori kaydındaki "#rrggbb" rengi
+    color = LABEL_COLORS[label]
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+
+def _solid_band(band_h, w, color):
+    """Etiket bandı için salt okunur düz renk dizi (boyut ve renge göre önbellekli)."""
+    key = (band_h, w, color)
+    with _band_lock:
+        solid = _band_cache.get(key)
+        if solid is not None:
+            _band_cache.move_to_end(key)
+            return solid
+    solid = np.full((band_h, w, 3), color, dtype=np.uint8)
+    solid.flags.writeable = False
+    with _band_lock:
+        _band_cache[key] = solid
+        while len(_band_cache) > BAND_CACHE_SIZE:
+            _band_cache.popitem(last=False)
+    return solid
+
+
+def burnin_path_for(video_path):
+    return video_path + BURNIN_SUFFIX
+
+
+def _temp_output(out_path):
+    """Çıktıyla aynı klasörde (os.replace atomik olsun) aynı uzantılı geçici dosya."""
+    folder = os.path.dirname(os.path.abspath(out_path))
+    base, ext = os.path.splitext(os.path.basename(out_path))
+    fd, path = tempfile.mkstemp(prefix=f".{base}.", suffix=ext, dir=folder)
+    os.close(fd)
+    return path
+
+
+# ─── Çizim ──────────────────────────────────────────────────────────
+def draw_overlay(img, frame_no, fps, label=None, elapsed=None, caption=None, rgb=False):
+    """Etiket bandı, geçen süre, zaman damgası ve kare numarasını yerinde çiz.
+
+    Arayüzdeki görüntüyle aynıdır; ölçüler kare yüksekliğine göre büyür.
+    rgb=False iken renkler BGR (ffmpeg/cv2 kareleri) sırasındadır.
+    """
+    h, w = img.shape[:2]
+    k = h / OVERLAY_REF_HEIGHT
+    white = (255, 255, 255)
+    if label:
+        color = _banner_rgb(label)
+        if not rgb:
+            color = color[::-1]
+        band_h = int(40 * k)
+        solid = _solid_band(band_h, w, color)
+        band = img[:band_h]
+        # Yalnızca bant karışır; kareyi kopyalamaya gerek yok
+        cv2.addWeighted(solid, 0.7, band, 0.3, 0, dst=band)
+
+        text = f"{caption}: {LABEL_DISPLAY[label]}" if caption else LABEL_DISPLAY[label]
+        cv2.putText(img, text, (int(10 * k), int(28 * k)), cv2.FONT_HERSHEY_SIMPLEX, 0.8 * k, white,
+                    max(1, int(2 * k)))
+        if elapsed is not None:
+            cv2.putText(img, f"{elapsed:.1f}s", (w - int(100 * k), int(28 * k)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7 * k, white, max(1, int(2 * k)))
+
+    cv2.putText(img, format_time(frame_no / fps), (w - int(130 * k), h - int(15 * k)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6 * k, white, max(1, int(k)))
+    cv2.putText(img, f"F:{frame_no}", (int(10 * k), h - int(15 * k)),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5 * k, (200, 200, 200), max(1, int(k)))
+    return img
+
+
+class LabelTrack:
+    """Sıralı etiket aralıkları; bir toplu kare için etkin etiketi vektörel bulur."""
+
+    def __init__(self, labels):
+        starts, ends, codes = label_arrays(labels)
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order].astype(np.int64)
+        self.ends = ends[order].astype(np.int64)
+        self.labels = [CATEGORIES[c] for c in codes[order].tolist()]
+
+    def at(self, frames):
+        """Her kare için etkin etiketin indeksi, etiket yoksa -1."""
+        if self.starts.size == 0:
+            return np.full(frames.shape, -1, dtype=np.int64)
+        idx = np.searchsorted(self.starts, frames, side="right") - 1
+        active = (idx >= 0) & (frames < self.ends[np.maximum(idx, 0)])
+        return np.where(active, idx, -1)
+
+    def intervals(self):
+        """Birleştirilmiş (başlangıç, bitiş) etiketli kare aralıkları."""
+        merged = []
+        for s, e in zip(self.starts.tolist(), self.ends.tolist()):
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        return merged
+
+
+# ─── Kodlama boru hattı ─────────────────────────────────────────────
+def encoder_cmd(out_path, size, fps, codec="libx264", crf=23, preset="veryfast", threads=0, fmt=None):
+    """stdin'den ham BGR kare alan ffmpeg kodlayıcı komutu.
+
+    fmt verilirse (parça çıktısı) parametre setleri her anahtar karede
+    tekrarlanır; böylece parçalar kaynaktan kopyalanan bölümlerle birleşebilir.
+    """
+    w, h = size
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{w}x{h}", "-r", f"{fps}", "-i", "-",
+        "-an", "-c:v", codec, "-preset", preset, "-crf", str(crf), "-pix_fmt", "yuv420p",
+    ]
+    if codec == "libx265":
+        params = "log-level=error"
+        if threads:
+            params += f":pools={threads}"
+        if fmt:
+            params += ":repeat-headers=1"
+        cmd += ["-x265-params", params]
+    else:
+        if threads:
+            cmd += ["-threads", str(threads)]
+        if fmt and codec == "libx264":
+            cmd += ["-x264-params", "repeat-headers=1"]
+    if fmt:
+        cmd += ["-f", fmt]
+    return cmd + [out_path]
+
+
+class _Pipeline:
+    """Kod çözme → çizim → kodlayıcı; üç iş parçacığı, EXPORT_POOL toplu tampon.
+
+    Bir aşama hata verirse `_abort` kurulur; kuyruk bekleyişleri QUEUE_POLL_SEC
+    aralıkla bu bayrağa bakar, böylece dolu/boş kuyrukta bekleyen aşamalar
+    kilitlenmeden çıkar ve run() hatayı yükseltir.
+    """
+
+    def __init__(self, exporter, start, end, out_path, size, codec, fmt=None):
+        self.ex = exporter
+        self.start, self.end = start, end
+        self.out_path = out_path
+        self.size = size
+        self.codec = codec
+        self.fmt = fmt
+        self.error = None
+        self._abort = threading.Event()
+
+    def run(self):
+        ex = self.ex
+        w, h = self.size
+        scale = (w, h) != (ex.source.width, ex.source.height)
+        reader = FFmpegVideoReader(ex.video_path, perf=ex.perf, out_size=self.size, scale_output=scale)
+        free = queue.Queue()
+        for _ in range(EXPORT_POOL):
+            free.put(np.empty((ex.batch, h, w, 3), dtype=np.uint8))
+        decoded = queue.Queue(maxsize=EXPORT_POOL)
+        ready = queue.Queue(maxsize=EXPORT_POOL)
+
+        cmd = encoder_cmd(self.out_path, self.size, ex.fps, self.codec, ex.crf, ex.preset, ex.threads, self.fmt)
+        encoder = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+        reader.start_streaming(self.start / ex.fps)
+        workers = [
+            threading.Thread(target=self._decode, args=(reader, free, decoded), daemon=True),
+            threading.Thread(target=self._overlay, args=(decoded, ready), daemon=True),
+        ]
+        for t in workers:
+            t.start()
+        try:
+            written = self._encode(encoder, ready, free)
+        finally:
+            # Normal bitişte işçiler zaten çıkmıştır; hata/istisnada beklemeden çıksınlar
+            self._abort.set()
+            if self.error:
+                ex.cancel.set()
+            try:
+                encoder.stdin.close()
+            except OSError:
+                pass
+            encoder.wait()
+            for t in workers:
+                t.join()
+            reader.release()
+        if self.error:
+            raise self.error
+        if encoder.returncode != 0:
+            raise RuntimeError(f"ffmpeg kodlayıcı hata verdi ({encoder.returncode})")
+        return written
+
+    def _fail(self, error):
+        if self.error is None:
+            self.error = error
+        self._abort.set()
+
+    def _put(self, q, item):
+        """Kuyruğa koy; iptal edilirse False."""
+        while not self._abort.is_set():
+            try:
+                q.put(item, timeout=QUEUE_POLL_SEC)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q):
+        """Kuyruktan al; iptal edilirse None."""
+        while not self._abort.is_set():
+            try:
+                return q.get(timeout=QUEUE_POLL_SEC)
+            except queue.Empty:
+                pass
+        return None
+
+    def _decode(self, reader, free, decoded):
+        n = self.start
+        try:
+            while n < self.end and not self.ex.cancel.is_set():
+                buf = self._get(free)
+                if buf is None:
+                    return
+                k = 0
+                while k < len(buf) and n + k < self.end and reader.read_next_into(buf[k]):
+                    k += 1
+                if k and not self._put(decoded, (n, buf, k)):
+                    return
+                n += k
+                if k < len(buf) and n < self.end:
+                    break  # kaynak erken bitti
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(decoded, None)
+
+    def _overlay(self, decoded, ready):
+        ex = self.ex
+        try:
+            while True:
+                item = self._get(decoded)
+                if item is None:
+                    break
+                first, buf, k = item
+                frames = np.arange(first, first + k)
+                active = ex.track.at(frames)
+                for i, idx in enumerate(active.tolist()):
+                    frame_no = first + i
+                    if idx >= 0:
+                        elapsed = (frame_no - ex.track.starts[idx]) / ex.fps
+                        draw_overlay(buf[i], frame_no, ex.fps, ex.track.labels[idx], elapsed)
+                    else:
+                        draw_overlay(buf[i], frame_no, ex.fps)
+                if not self._put(ready, item):
+                    break
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._put(ready, None)
+
+    def _encode(self, encoder, ready, free):
+        written = 0
+        while True:
+            item = self._get(ready)
+            if item is None:
+                return written
+            first, buf, k = item
+            try:
+                encoder.stdin.write(buf[:k].data)
+            except OSError as e:
+                self._fail(e)
+                return written
+            written += k
+            free.put(buf)
+            self.ex._progress(k)
+
+
+# ─── Dışa aktarma ───────────────────────────────────────────────────
+def plan_segments(intervals, total_frames, fps, keyframes, min_copy_sec=FAST_COPY_MIN_SEC):
+    """[("encode"|"copy", başlangıç, bitiş)] ile tüm videoyu kapla.
+
+    Etiketsiz aralığın anahtar kareyle başlayıp anahtar kareden önce biten
+    iç kısmı, en az min_copy_sec sürüyorsa kopyalanır; kalan her şey kodlanır.
+    """
+    kf = np.array(keyframes, dtype=np.int64)
+    gaps, pos = [], 0
+    for s, e in intervals:
+        s, e = max(0, s), min(total_frames, e)
+        if s > pos:
+            gaps.append((pos, s))
+        pos = max(pos, e)
+    if pos < total_frames:
+        gaps.append((pos, total_frames))
+
+    copies = []
+    for a, b in gaps:
+        i = np.searchsorted(kf, a, side="left")
+        j = np.searchsorted(kf, b, side="right") - 1
+        if i < kf.size and j >= 0 and kf[j] - kf[i] >= min_copy_sec * fps:
+            copies.append((int(kf[i]), int(kf[j])))
+
+    plan, pos = [], 0
+    for a, b in copies:
+        if a > pos:
+            plan.append(("encode", pos, a))
+        plan.append(("copy", a, b))
+        pos = b
+    if pos < total_frames:
+        plan.append(("encode", pos, total_frames))
+    return plan
+
+
+class BurnInExporter:
+    """Etiketleri kareye yakarak videoyu dışa aktarır.
+
+    progress(yapılan_kare, toplam_kare) arka plan iş parçacığından çağrılır;
+    cancel() aktarmayı ilk fırsatta durdurur.
+    """
+
+    def __init__(self, video_path, labels, out_path=None, out_size=DEFAULT_OUT_SIZE, codec="libx264",
+                 crf=23, preset="veryfast", threads=0, batch=EXPORT_BATCH, fast_copy=False,
+                 perf=None, progress=None):
+        self.video_path = video_path
+        self.out_path = out_path or burnin_path_for(video_path)
+        self.source = FFmpegVideoReader(video_path, perf=perf)
+        self.fps = self.source.fps
+        self.total_frames = self.source.total_frames
+        self.track = LabelTrack(labels)
+        self.out_size = _fit_size(out_size, (self.source.width, self.source.height))
+        self.codec = codec
+        self.crf = crf
+        self.preset = preset
+        self.threads = threads
+        self.batch = batch
+        self.fast_copy = fast_copy
+        self.perf = perf
+        self.cancel = threading.Event()
+        self._on_progress = progress
+        self._done = 0
+
+    def _progress(self, frames):
+        self._done += frames
+        if self._on_progress:
+            self._on_progress(self._done, self.total_frames)
+
+    def run(self):
+        """Aktarmayı çalıştır; özet sözlüğü döndür."""
+        t0 = time.perf_counter()
+        if self.total_frames == 0:
+            raise ValueError(f"Video açılamadı: {self.video_path}")
+        copied = 0
+        encoder = ENCODER_FOR_CODEC.get(self.source.codec)
+        # Ön hesaplanmamışsa anahtar kare dizini burada (aktarma iş parçacığında) çıkarılır
+        keyframes = keyframe_frames(self.video_path, compute=True) if self.fast_copy and encoder else []
+        fast_copy = bool(keyframes)
+        tmp = _temp_output(self.out_path)
+        try:
+            if fast_copy:
+                copied = self._run_segmented(encoder, keyframes, tmp)
+            else:
+                _Pipeline(self, 0, self.total_frames, tmp, self.out_size, self.codec).run()
+            if not self.cancel.is_set():
+                os.replace(tmp, self.out_path)
+        finally:
+            # İptal ya da hata: yarım çıktı hedefe konmaz
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        elapsed = time.perf_counter() - t0
+        duration = self.total_frames / self.fps
+        return {
+            "out_path": self.out_path,
+            "frames": self.total_frames,
+            "copied_frames": copied,
+            "fast_copy": fast_copy,
+            "seconds": round(elapsed, 2),
+            "realtime_factor": round(duration / elapsed, 2) if elapsed else None,
+            "cancelled": self.cancel.is_set(),
+        }
+
+    def _run_segmented(self, encoder, keyframes, out_path):
+        """Kodlanan ve kopyalanan bölümleri Matroska parçalarına yazıp birleştir.
+
+        Parçaların birleşebilmesi için kodlanan bölümler kaynak çözünürlüğünde
+        ve kaynak kodeğiyle üretilir; tüm parçalar parametre setlerini akış
+        içinde (Annex B) taşır.
+        """
+        size = (self.source.width, self.source.height)
+        plan = plan_segments(self.track.intervals(), self.total_frames, self.fps, keyframes)
+        copied = 0
+        work = tempfile.mkdtemp(prefix="burnin_")
+        try:
+            parts = []
+            for i, (kind, start, end) in enumerate(plan):
+                if self.cancel.is_set():
+                    break
+                part = os.path.join(work, f"part_{i:05d}.mkv")
+                if kind == "copy":
+                    self._copy_segment(start, end, part)
+                    copied += end - start
+                    self._progress(end - start)
+                else:
+                    _Pipeline(self, start, end, part, size, encoder, fmt="matroska").run()
+                parts.append(part)
+            if not self.cancel.is_set():
+                list_path = os.path.join(work, "parts.txt")
+                with open(list_path, "w", encoding="utf-8") as f:
+                    f.writelines(f"file '{p}'\n" for p in parts)
+                subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", list_path,
+                                "-c", "copy", out_path], check=True)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        return copied
+
+    def _copy_segment(self, start, end, out_path):
+        # Başlangıç anahtar karedir; yarım kare ileri aranarak bir önceki anahtar kareye düşülmez
+        t = (start + 0.5) / self.fps
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-ss", f"{t:.3f}", "-i", self.video_path,
+                        "-map", "0:v:0", "-c", "copy", "-bsf:v", f"{self.source.codec}_mp4toannexb",
+                        "-frames:v", str(end - start), "-f", "matroska", out_path], check=True)
+
+
+def _fit_size(out_size, src_size):
+    """Çıktı boyutu; kaynaktan büyükse kaynak boyutu (büyütme yalnızca kodlama süresini artırır)."""
+    if not out_size or out_size[0] >= src_size[0] or out_size[1] >= src_size[1]:
+        return src_size
+    return out_size
+
+
+def export_burnin(video_path, labels, out_path=None, **kwargs):
+    """Kısa yol: BurnInExporter(...).run()."""
+    return BurnInExporter(video_path, labels, out_path, **kwargs).run()
+
+
+def _parse_size(text):
+    if text.lower() == "kaynak":
+        return None
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Etiketleri videoya yakarak dışa aktar")
+    parser.add_argument("video", help="kaynak video")
+    parser.add_argument("--labels", help=".labels.json (varsayılan: videonun yanındaki)")
+    parser.add_argument("--out", help=f"çıktı (varsayılan: VIDEO{BURNIN_SUFFIX})")
+    parser.add_argument("--size", default=f"{DEFAULT_OUT_SIZE[0]}x{DEFAULT_OUT_SIZE[1]}",
+                        help="çıktı boyutu GxY ya da 'kaynak' (fast-copy'de her zaman kaynak)")
+    parser.add_argument("--codec", default="libx264", help="kodlayıcı (fast-copy'de kaynak kodeği)")
+    parser.add_argument("--crf", type=int, default=23)
+    parser.add_argument("--preset", default="veryfast")
+    parser.add_argument("--threads", type=int, default=0, help="kodlayıcı iş parçacığı (0: otomatik)")
+    parser.add_argument("--batch", type=int, default=EXPORT_BATCH, help="toplu taşınan kare sayısı")
+    parser.add_argument("--fast-copy", action="store_true", help="uzun etiketsiz bölümleri yeniden kodlamadan kopyala")
+    parser.add_argument("--taxonomy", metavar="JSON", help="etiket kategorileri yapılandırması (renk, görünen ad)")
+    args = parser.parse_args()
+    if args.taxonomy:
+        load_taxonomy(args.taxonomy)
+
+    labels = load_label_file(args.labels or find_label_file(args.video))
+
+    def progress(done, total):
+        if done == total or done % 250 < args.batch:
+            print(f"\r{done}/{total} kare ({done / max(1, total) * 100:.0f}%)", end="", flush=True)
+
+    result = export_burnin(args.video, labels, args.out, out_size=_parse_size(args.size), codec=args.codec,
+                           crf=args.crf, preset=args.preset, threads=args.threads, batch=args.batch,
+                           fast_copy=args.fast_copy, progress=progress)
+    print(f"\n{result['out_path']}: {result['seconds']} sn, gerçek zamanın {result['realtime_factor']}x'i"
+          + (f", {result['copied_frames']} kare kopyalandı" if result["copied_frames"] else ""))
+
+
+if __name__ == "__main__":
+    main()
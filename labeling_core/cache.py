@@ -0,0 +1,169 @@
+"""İçerik adresli ön hesaplama önbelleği.
+
+Türetilmiş veriler (probe, anahtar kare dizini, etkinlik sinyali, küçük
+resimler, proxy ve etiketlerin yedeği) dosya yoluna değil videonun içerik
+parmak izine göre saklanır: arşiv klasörü taşınsa ya da yeniden adlansa da
+sonuçlar bulunur. Parmak izi dosya boyutu ile birkaç örnek parçanın
+özetidir; çok GB'lık kayıt baştan sona okunmaz.
+
+Önbellek klasörü SASA_CACHE_DIR ortam değişkeniyle ya da set_cache_dir ile
+ağ paylaşımına yönlendirilebilir; farklı iş istasyonları ve bağlama
+noktaları birbirinin sonuçlarını kullanır. Düzen:
+
+    <önbellek>/<ab>/<parmak izi>/prep.json      iş sonuçları
+    <önbellek>/<ab>/<parmak izi>/proxy.mp4
+    <önbellek>/<ab>/<parmak izi>/thumbs/
+    <önbellek>/<ab>/<parmak izi>/labels.json    etiket yedeği
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+CACHE_DIR_ENV = "SASA_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sasa_labeling")
+PREP_FILE = "prep.json"
+PROXY_FILE = "proxy.mp4"
+THUMBS_DIR = "thumbs"
+LABELS_FILE = "labels.json"
+PREP_VERSION = 2
+
+SAMPLE_COUNT = 8            # baş, son ve aradaki eşit aralıklı parçalar
+SAMPLE_BYTES = 64 * 1024
+
+_lock = threading.Lock()
+_fingerprints = {}          # (mutlak yol, boyut, mtime_ns) -> parmak izi
+_cache_dir = None
+
+
+def cache_dir():
+    return _cache_dir or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+
+
+def set_cache_dir(path):
+    """Önbellek klasörünü değiştir (None: ortam değişkeni ya da varsayılan)."""
+    global _cache_dir
+    _cache_dir = path
+
+
+def source_signature(video_path):
+    """[boyut, mtime_ns]; dosya yoksa None. Değişiklik tespiti için ucuz imza."""
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def fingerprint(video_path):
+    """Boyut + SAMPLE_COUNT örnek parçanın BLAKE2b özeti (32 onaltılık karakter).
+
+    Dosya okunamıyorsa None. Aynı boyut ve mtime için süreç içinde
+    hatırlanır; yeniden okunmaz.
+    """
+    try:
+        st = os.stat(video_path)
+    except OSError:
+        return None
+    memo_key = (os.path.abspath(video_path), st.st_size, st.st_mtime_ns)
+    fp = _fingerprints.get(memo_key)
+    if fp:
+        return fp
+    size = st.st_size
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode("ascii"))
+    try:
+        with open(video_path, "rb") as f:
+            if size <= SAMPLE_COUNT * SAMPLE_BYTES:
+                h.update(f.read())
+            else:
+                for i in range(SAMPLE_COUNT):
+                    f.seek((size - SAMPLE_BYTES) * i // (SAMPLE_COUNT - 1))
+                    h.update(f.read(SAMPLE_BYTES))
+    except OSError:
+        return None
+    fp = _fingerprints[memo_key] = h.hexdigest()
+    return fp
+
+
+def entry_dir(video_path, key=None):
+    """Videonun önbellek klasörü (oluşturulmaz); parmak izi alınamazsa None."""
+    key = key or fingerprint(video_path)
+    if not key:
+        return None
+    return os.path.join(cache_dir(), key[:2], key)
+
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_json(path, data):
+    """Yarım dosya bırakmadan yaz (diğer iş istasyonları aynı anda okuyabilir)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def load_results(video_path, key=None):
+    """Videonun kayıtlı iş sonuçları sözlüğü; yoksa boş sözlük."""
+    folder = entry_dir(video_path, key)
+    doc = _read(os.path.join(folder, PREP_FILE)) if folder else None
+    if not doc or doc.get("version") != PREP_VERSION:
+        return {}
+    return doc.get("results", {})
+
+
+def cached(video_path, job):
+    """Tek işin kayıtlı sonucu (yoksa None)."""
+    return load_results(video_path).get(job)
+
+
+def store(video_path, job, value, key=None):
+    """İş sonucunu kaydet.
+
+    key, iş başlamadan alınan parmak izidir; kaynak bu arada değiştiyse
+    (NVR hâlâ yazıyorsa) ya da önbellek yazılamıyorsa sonuç yazılmaz ve
+    False döner.
+    """
+    current = fingerprint(video_path)
+    if current is None or (key is not None and key != current):
+        return False
+    path = os.path.join(entry_dir(video_path, current), PREP_FILE)
+    with _lock:
+        doc = _read(path)
+        if not doc or doc.get("version") != PREP_VERSION:
+            doc = {"version": PREP_VERSION, "fingerprint": current, "results": {}}
+        doc["results"][job] = value
+        try:
+            write_json(path, doc)
+        except OSError:
+            return False  # salt okunur önbellek: sonuç yalnızca bu seferlik kullanılır
+    return True
+
+
+def artifact_path(video_path, name, key=None):
+    """Önbellek klasöründeki yan ürün yolu (proxy.mp4, thumbs, labels.json)."""
+    folder = entry_dir(video_path, key)
+    return os.path.join(folder, name) if folder else None
+
+
+def proxy_size(video_path):
+    """Kayıtlı proxy'nin (genişlik, yükseklik) değeri (yoksa None)."""
+    entry = cached(video_path, "proxy")
+    return tuple(entry["size"]) if entry and entry.get("size") else None
+
+
+def proxy_for(video_path):
+    """Kayıtlı ve diskte duran proxy dosyasının yolu (yoksa None)."""
+    if not cached(video_path, "proxy"):
+        return None
+    proxy = artifact_path(video_path, PROXY_FILE)
+    return proxy if os.path.exists(proxy) else None
@@ -0,0 +1,255 @@
+"""Etiketleme sunucusu istemcisi ve sunucudan kare okuyan okuyucu.
+
+RemoteVideoReader, FFmpegVideoReader arayüzünü korur: arayüz yerel dosya
+yerine sunucunun ekran boyutlu JPEG karelerini gösterir. Oynatmada sonraki
+kareler arka plan iş parçacığında önceden istenir; hızlı oynatmada yalnızca
+gösterilecek kareler istenir.
+"""
+
+import getpass
+import http.client
+import json
+import queue
+import threading
+from urllib.parse import urlencode, urlsplit
+
+from .lazy import lazy_import
+from .multiview import is_manifest
+from .reader import DEFAULT_OUT_SIZE, FFmpegVideoReader
+
+np = lazy_import("numpy")
+cv2 = lazy_import("cv2")
+
+PREFETCH_FRAMES = 8
+STREAM_POLL_SEC = 0.2    # ön getirme kuyruğu beklerken durma bayrağı yoklama aralığı
+DEFAULT_TIMEOUT = 60.0   # etiket uzun yoklaması (long-poll) bundan kısa olmalı
+
+
+class RemoteError(Exception):
+    """Sunucu hata kodu döndürdü."""
+
+
+class RemoteClient:
+    """Sunucu API'sinin ince sarmalayıcısı; iş parçacığı başına kalıcı bağlantı."""
+
+    def __init__(self, base_url, annotator=None, timeout=DEFAULT_TIMEOUT):
+        url = urlsplit(base_url if "//" in base_url else "http://" + base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 8765
+        self.base_url = f"http://{self.host}:{self.port}"
+        self.annotator = annotator or getpass.getuser()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def _request(self, method, path, params=None, body=None):
+        if params:
+            path += "?" + urlencode(params)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        for attempt in range(2):
+            conn = self._conn()
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+                payload = resp.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # Sunucu boştaki bağlantıyı kapatmış olabilir: bir kez yeniden bağlan
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        if resp.status >= 400:
+            try:
+                message = json.loads(payload).get("error", "")
+            except ValueError:
+                message = payload.decode("utf-8", "replace")
+            raise RemoteError(f"{resp.status}: {message}")
+        return payload
+
+    def _json(self, method, path, params=None, body=None):
+        return json.loads(self._request(method, path, params, body))
+
+    # ─── Videolar ───────────────────────────────────────────────────
+    def list_videos(self):
+        return self._json("GET", "/api/videos")["videos"]
+
+    def video_info(self, video_id):
+        return self._json("GET", "/api/video", {"id": video_id})
+
+    def frame(self, video_id, n, roi=None):
+        params = {"id": video_id, "n": n}
+        if roi:
+            params["roi"] = ",".join(str(v) for v in roi)
+        return self._request("GET", "/api/frame", params)
+
+    def thumb(self, video_id, n):
+        return self._request("GET", "/api/thumb", {"id": video_id, "n": n})
+
+    # ─── Etiketler ──────────────────────────────────────────────────
+    def taxonomy(self):
+        """Sunucunun etiket kategorileri (labels.set_taxonomy biçiminde)."""
+        return self._json("GET", "/api/taxonomy")["categories"]
+
+    def labels(self, video_id, since=None, wait=0):
+        """{"version", "labels"}; since verilirse sürüm değişene kadar en çok wait sn bekler."""
+        params = {"id": video_id}
+        if since is not None:
+            params.update(since=since, wait=wait)
+        return self._json("GET", "/api/labels", params)
+
+    def add_label(self, video_id, entry):
+        return self._json("POST", "/api/labels/add", {"id": video_id},
+                          {"entry": entry.to_dict() if hasattr(entry, "to_dict") else entry,
+                           "annotator": self.annotator})
+
+    def delete_label(self, video_id, label_id):
+        return self._json("POST", "/api/labels/delete", {"id": video_id}, {"label_id": label_id})
+
+
+class RemoteVideoReader(FFmpegVideoReader):
+    """Sunucudaki videoyu yerel okuyucu gibi oynatan okuyucu.
+
+    Sunucu kareleri out_size'a ölçekleyip (ROI varsa kırpıp) gönderir;
+    çıkış boyutu sunucudakiyle aynı frame_size kuralına uyar.
+    """
+
+    def __init__(self, client, video_id, perf=None, out_size=DEFAULT_OUT_SIZE):
+        self.client = client
+        self.video_id = video_id
+        self._queue = None
+        self._stop = None
+        self._thread = None
+        self._step = 1   # ön getirme adımı: gösterilen kareler arası fark (skip_frames)
+        super().__init__(video_id, perf=perf, out_size=out_size, scale_output=True)
+
+    def _probe(self):
+        info = self.client.video_info(self.video_id)
+        self.width, self.height = info["width"], info["height"]
+        self.fps = info["fps"]
+        self.total_frames = info["total_frames"]
+        self.duration = info["duration"]
+        self.out_size = tuple(info.get("frame_size") or self.out_size)
+
+    def _fetch(self, n):
+        data = self.client.frame(self.video_id, n, self.roi)
+        return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def read_frame_at(self, time_sec):
+        time_sec = max(0, min(time_sec, self.duration - 0.1))
+        t0 = self.perf.clock()
+        try:
+            frame = self._fetch(int(time_sec * self.fps + 1e-6))
+        except (RemoteError, OSError, http.client.HTTPException):
+            frame = None
+        self.perf.add("seek", t0)
+        if frame is None:
+            return False, None
+        self._current_time = time_sec
+        return True, frame
+
+    def start_streaming(self, start_time=0.0):
+        self.stop_streaming()
+        start_time = max(0, min(start_time, self.duration - 0.1))
+        self._current_time = start_time
+        first = int(start_time * self.fps + 1e-6)
+        self._queue = queue.Queue(maxsize=PREFETCH_FRAMES)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._prefetch, args=(first, self._queue, self._stop), daemon=True)
+        self._thread.start()
+
+    def _prefetch(self, first, q, stop):
+        """Kareleri (kare no, kare) olarak sıraya koy; adım oynatma hızını izler."""
+        n = first
+        while n < self.total_frames:
+            if stop.is_set():
+                return
+            try:
+                frame = self._fetch(n)
+            except (RemoteError, OSError, http.client.HTTPException):
+                frame = None
+            if not self._put(q, stop, (n, frame)):
+                return
+            if frame is None:
+                return
+            n += self._step
+        self._put(q, stop, None)
+
+    @staticmethod
+    def _put(q, stop, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=STREAM_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(q, stop):
+        # Akış durdurulursa (sunucu yanıt vermese bile) bekleme sona erer
+        while not stop.is_set():
+            try:
+                return q.get(timeout=STREAM_POLL_SEC)
+            except queue.Empty:
+                continue
+        return None
+
+    def read_next_frame(self):
+        t0 = self.perf.clock()
+        want = self.current_frame_number
+        while True:
+            q, stop = self._queue, self._stop
+            if q is None or stop is None:
+                return False, None
+            item = self._get(q, stop)
+            if item is None or item[1] is None:
+                self.perf.add("decode_read", t0)
+                if self._queue is q:
+                    self._queue = None
+                return False, None
+            n, frame = item
+            if n < want:
+                continue   # adım büyümeden önce istenmiş, artık gösterilmeyecek kare
+            if n > want:
+                # Adım küçüldü: atlanmış kareden yeniden iste
+                self.start_streaming(want / self.fps)
+                continue
+            break
+        # Kuyruk beklemesi sunucudaki kod çözme + ağ süresidir
+        self.perf.add("decode_read", t0)
+        self._current_time += 1.0 / self.fps
+        return True, frame
+
+    def skip_frames(self, count):
+        """Atlanan kareler sunucudan istenmez: ön getirme sonraki istekten itibaren count+1 adımlıdır."""
+        self._step = count + 1
+        self._current_time += count / self.fps
+        return True
+
+    def stop_streaming(self):
+        """Akışı durdur; arayüz iş parçacığını bekletmez.
+
+        Ön getirme iş parçacığı durma bayrağını bir sonraki karede görüp
+        kendiliğinden çıkar; bekleyen okuyucu akış sonu işaretiyle uyanır.
+        """
+        if self._stop:
+            self._stop.set()
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass  # kuyruk doluysa okuyucu beklemiyor
+        self._queue = None
+        self._stop = None
+        self._thread = None
+
+    def set_roi(self, roi, index=0):
+        # Çoklu kamera ROI'leri sunucudaki manifestte tutulur
+        if not is_manifest(self.video_id):
+            super().set_roi(roi)
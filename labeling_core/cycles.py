@@ -0,0 +1,180 @@
+"""Çevrim süresi analitiği: dağılım, aykırı çevrimler, kayan pencere verimi, saat/vardiya kırılımı.
+
+Çevrim i, i. KDİ başlangıcından bir sonrakine kadar sürer; verimi o çevrimdeki
+KDİ süresinin çevrim süresine oranıdır. KDİ, kategori kaydında çevrim
+kategorisi olarak işaretlenendir (bkz. labels.cycle_category). Tüm hesaplar sıralı KDİ başlangıç
+zamanları üzerinde NumPy ile vektörel yapılır (kümülatif toplam + searchsorted);
+on binlerce çevrimde de istatistik paneli etkileşimli kalır.
+"""
+
+import os
+import re
+
+from .labels import CATEGORY_CODE, cycle_category, label_arrays
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+PERCENTILES = (5, 25, 50, 75, 90, 95)
+HISTOGRAM_BINS = 20
+OUTLIER_IQR = 1.5
+ROLLING_WINDOW_SEC = 900     # 15 dk
+ROLLING_STEP_SEC = 60
+# (ad, başlangıç saati, bitiş saati) — günün saati, kayıt başlangıcı biliniyorsa
+SHIFTS = (
+    ("Vardiya 1", 8, 16),
+    ("Vardiya 2", 16, 24),
+    ("Vardiya 3", 0, 8),
+)
+
+# NVR dosya/klasör adlarındaki kayıt başlangıcı: ..._20260212091342...
+_STAMP_RE = re.compile(r"(20\d{2})(\d{2})(\d{2})[_-]?(\d{2})(\d{2})(\d{2})")
+
+
+def recording_start_clock(video_path):
+    """Dosya ya da klasör adındaki zaman damgasından kayıt başlangıcı (gece yarısından sn).
+
+    Bulunamazsa None: saatler video başından sayılır, vardiya kırılımı yapılmaz.
+    """
+    if not video_path:
+        return None
+    for name in (os.path.basename(video_path), os.path.basename(os.path.dirname(video_path))):
+        m = _STAMP_RE.search(name)
+        if m:
+            hh, mm, ss = int(m.group(4)), int(m.group(5)), int(m.group(6))
+            if hh < 24 and mm < 60 and ss < 60:
+                return hh * 3600 + mm * 60 + ss
+    return None
+
+
+def kdi_arrays(labels, fps):
+    """Başlangıca göre sıralı KDİ (çevrim kategorisi) başlangıç zamanları ve süreleri (sn)."""
+    if not labels:
+        return np.empty(0), np.empty(0)
+    start_frames, end_frames, codes = label_arrays(labels)
+    katma = codes == CATEGORY_CODE[cycle_category()]
+    starts = start_frames[katma] / fps
+    durations = (end_frames[katma] - start_frames[katma]) / fps
+    order = np.argsort(starts, kind="stable")
+    return starts[order], durations[order]
+
+
+def _r(value, digits=2):
+    return round(float(value), digits)
+
+
+def _windowed(cycle_starts, cs_ct, cs_kdi, lo_t, hi_t):
+    """[lo_t, hi_t) aralığında başlayan çevrimlerin (sayı, çevrim toplamı, KDİ toplamı)."""
+    lo = np.searchsorted(cycle_starts, lo_t, side="left")
+    hi = np.searchsorted(cycle_starts, hi_t, side="left")
+    return hi - lo, cs_ct[hi] - cs_ct[lo], cs_kdi[hi] - cs_kdi[lo]
+
+
+def _group_rows(keys, count, cycle_times, kdi):
+    counts = np.bincount(keys, minlength=count)
+    ct_sum = np.bincount(keys, weights=cycle_times, minlength=count)
+    kdi_sum = np.bincount(keys, weights=kdi, minlength=count)
+    rows = []
+    for n, ct, k in zip(counts.tolist(), ct_sum.tolist(), kdi_sum.tolist()):
+        rows.append({
+            "cycles": n,
+            "avg_cycle_time": _r(ct / n) if n else None,
+            "efficiency_pct": _r(k / ct * 100) if ct else None,
+        })
+    return rows
+
+
+def analyze_cycles(labels, fps, start_clock=None, window=ROLLING_WINDOW_SEC, step=ROLLING_STEP_SEC, detail=True):
+    """Çevrim süresi analizi; en az iki KDİ yoksa boş sözlük.
+
+    İlk yedi alan eski `cycle_time_analysis` bloğuyla aynıdır; geri kalanı
+    dağılım, aykırılar, kayan pencere verimi ve saat/vardiya kırılımıdır.
+    start_clock verilirse saatler günün saatiyle etiketlenir. detail=False
+    çevrim listesini ve pencere serisini atlar (panel her etikette çağırır).
+    """
+    starts, durations = kdi_arrays(labels, fps)
+    if starts.size < 2:
+        return {}
+    cycle_times = np.diff(starts)
+    cycle_starts = starts[:-1]
+    kdi = durations[:-1]
+    avg_cycle = cycle_times.mean()
+    avg_kdi = durations.mean()
+
+    # Dağılım
+    pct = np.percentile(cycle_times, PERCENTILES)
+    q1, q3 = pct[PERCENTILES.index(25)], pct[PERCENTILES.index(75)]
+    low_fence = q1 - OUTLIER_IQR * (q3 - q1)
+    high_fence = q3 + OUTLIER_IQR * (q3 - q1)
+    outlier_idx = np.flatnonzero((cycle_times < low_fence) | (cycle_times > high_fence))
+    counts, edges = np.histogram(cycle_times, bins=HISTOGRAM_BINS)
+
+    # Kayan pencere verimi: pencere sonu ızgarası üzerinde kümülatif toplam farkı
+    cs_ct = np.concatenate(([0.0], np.cumsum(cycle_times)))
+    cs_kdi = np.concatenate(([0.0], np.cumsum(kdi)))
+    first, last = cycle_starts[0], cycle_starts[-1] + cycle_times[-1]
+    grid = np.arange(first + window, last + step, step) if last - first > window else np.array([last])
+    _, ct_win, kdi_win = _windowed(cycle_starts, cs_ct, cs_kdi, grid - window, grid)
+    valid = ct_win > 0
+    rolling = np.full(grid.size, np.nan)
+    rolling[valid] = kdi_win[valid] / ct_win[valid] * 100
+    rolling_info = {"window_sec": window, "step_sec": step}
+    if valid.any():
+        worst, best = np.nanargmin(rolling), np.nanargmax(rolling)
+        rolling_info.update({
+            "min_pct": _r(rolling[worst]),
+            "min_window_start": _r(max(0.0, grid[worst] - window)),
+            "max_pct": _r(rolling[best]),
+            "max_window_start": _r(max(0.0, grid[best] - window)),
+        })
+        if detail:
+            rolling_info["series_start"] = _r(grid[0])
+            rolling_info["series"] = [v if v == v else None for v in np.round(rolling, 1).tolist()]
+
+    # Saatlik ve vardiya kırılımı (çevrim, başladığı saate yazılır)
+    clock0 = float(start_clock or 0.0)
+    abs_t = clock0 + cycle_starts
+    first_hour = int(clock0 // 3600)
+    hour_keys = (abs_t // 3600).astype(np.int64) - first_hour
+    hourly = _group_rows(hour_keys, int(hour_keys[-1]) + 1, cycle_times, kdi)
+    for i, row in enumerate(hourly):
+        row["hour"] = f"{(first_hour + i) % 24:02d}:00" if start_clock is not None else f"{i + 1}. saat"
+        row["offset_sec"] = (first_hour + i) * 3600 - clock0 if start_clock is not None else i * 3600
+
+    # Vardiyalar günün saatine bağlıdır; kayıt başlangıcı bilinmiyorsa hesaplanmaz
+    shifts = []
+    if start_clock is not None:
+        shift_of_hour = np.zeros(24, dtype=np.int64)
+        for k, (_, begin, end) in enumerate(SHIFTS):
+            shift_of_hour[begin:end] = k
+        hour_of_day = ((abs_t % 86400) // 3600).astype(np.int64)
+        shifts = _group_rows(shift_of_hour[hour_of_day], len(SHIFTS), cycle_times, kdi)
+        for (name, begin, end), row in zip(SHIFTS, shifts):
+            row["name"] = name
+            row["hours"] = f"{begin:02d}-{end:02d}"
+
+    return {
+        "cycle_count": int(cycle_times.size),
+        "cycle_times": np.round(cycle_times, 2).tolist() if detail else None,
+        "avg_cycle_time": _r(avg_cycle),
+        "min_cycle_time": _r(cycle_times.min()),
+        "max_cycle_time": _r(cycle_times.max()),
+        "avg_kdi_duration": _r(avg_kdi),
+        "efficiency_pct": _r(avg_kdi / avg_cycle * 100) if avg_cycle else 0,
+        "std_cycle_time": _r(cycle_times.std()),
+        "percentiles": {f"p{p}": _r(v) for p, v in zip(PERCENTILES, pct.tolist())},
+        "histogram": {"edges": [_r(x) for x in edges.tolist()], "counts": counts.tolist()},
+        "outliers": {
+            "low_fence": _r(max(0.0, low_fence)),
+            "high_fence": _r(high_fence),
+            "count": int(outlier_idx.size),
+            "cycles": [
+                {"index": i + 1, "start_time": _r(cycle_starts[i]), "cycle_time": _r(cycle_times[i])}
+                for i in outlier_idx.tolist()
+            ],
+        },
+        "rolling_efficiency": rolling_info,
+        "clock_start": start_clock,
+        "hourly": hourly,
+        "shifts": shifts,
+    }
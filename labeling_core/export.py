@@ -0,0 +1,164 @@
+"""CSV ve metin rapor dışa aktarımı."""
+
+import os
+from datetime import datetime
+
+from .labels import CATEGORIES, CATEGORY_CODE, LABEL_DISPLAY, cycle_category
+from .cycles import analyze_cycles
+from .stats import category_totals
+from .utils import format_time
+
+HISTOGRAM_BAR_WIDTH = 40
+
+
+def csv_path_for(video_path):
+    return video_path + ".labels.csv"
+
+
+def report_path_for(video_path):
+    return video_path + ".report.txt"
+
+
+def write_csv(csv_path, labels, video_path, fps):
+    video_file = os.path.basename(video_path)
+    with open(csv_path, "w", encoding="utf-8") as f:
+        f.write("video_file,start_time,end_time,start_str,end_str,label,label_tr,duration_sec\n")
+        for entry in labels:
+            start, end, duration = entry.times(fps)
+            start_str, end_str = entry.time_strs(fps)
+            f.write(
+                f"{video_file},"
+                f"{start:.2f},"
+                f"{end:.2f},"
+                f"{start_str},"
+                f"{end_str},"
+                f"{entry.label},"
+                f"{LABEL_DISPLAY[entry.label]},"
+                f"{duration:.2f}\n"
+            )
+
+
+def _upper_tr(text):
+    # "İş".upper() "İŞ", ama "Değerli".upper() "DEĞERLI" olur
+    return text.replace("i", "İ").replace("ı", "I").upper()
+
+
+def _write_cycle_analytics(f, analysis):
+    """Çevrim dağılımı, aykırılar, kayan pencere verimi ve saat/vardiya tabloları."""
+    pct = analysis["percentiles"]
+    f.write("  Dağılım\n")
+    f.write("  " + "  ".join(f"{k}: {format_time(v)}" for k, v in pct.items()) + "\n")
+    f.write(f"  Std. Sapma         : {analysis['std_cycle_time']:.1f} sn\n\n")
+
+    hist = analysis["histogram"]
+    peak = max(hist["counts"]) or 1
+    f.write("  Histogram (çevrim süresi)\n")
+    for lo, hi, n in zip(hist["edges"], hist["edges"][1:], hist["counts"]):
+        bar = "#" * int(round(n / peak * HISTOGRAM_BAR_WIDTH))
+        f.write(f"  {lo:>8.1f}-{hi:<8.1f} sn {n:>6}  {bar}\n")
+    f.write("\n")
+
+    outliers = analysis["outliers"]
+    f.write(f"  Aykırı Çevrimler   : {outliers['count']} "
+            f"(< {format_time(outliers['low_fence'])} ya da > {format_time(outliers['high_fence'])})\n")
+    for o in outliers["cycles"]:
+        f.write(f"    #{o['index']:<6} {format_time(o['start_time']):>10}  {format_time(o['cycle_time']):>10}\n")
+    f.write("\n")
+
+    rolling = analysis["rolling_efficiency"]
+    if "min_pct" in rolling:
+        f.write(f"  {rolling['window_sec'] // 60} dk Kayan Pencere Verimi\n")
+        f.write(f"    En düşük         : {rolling['min_pct']:.1f}% "
+                f"({format_time(rolling['min_window_start'])} başlayan pencere)\n")
+        f.write(f"    En yüksek        : {rolling['max_pct']:.1f}% "
+                f"({format_time(rolling['max_window_start'])} başlayan pencere)\n\n")
+
+    f.write(f"  {'Saat':>8}  {'Çevrim':>7}  {'Ort. Çevrim':>11}  {'Verim':>7}\n")
+    f.write("  " + "-" * 40 + "\n")
+    for h in analysis["hourly"]:
+        if h["cycles"]:
+            f.write(f"  {h['hour']:>8}  {h['cycles']:>7}  {format_time(h['avg_cycle_time']):>11}  "
+                    f"{h['efficiency_pct']:>6.1f}%\n")
+        else:
+            f.write(f"  {h['hour']:>8}  {0:>7}  {'-':>11}  {'-':>7}\n")
+    f.write("\n")
+
+    if analysis["shifts"]:
+        f.write(f"  {'Vardiya':<18}  {'Çevrim':>7}  {'Ort. Çevrim':>11}  {'Verim':>7}\n")
+        f.write("  " + "-" * 50 + "\n")
+        for sh in analysis["shifts"]:
+            name = f"{sh['name']} ({sh['hours']})"
+            if sh["cycles"]:
+                f.write(f"  {name:<18}  {sh['cycles']:>7}  {format_time(sh['avg_cycle_time']):>11}  "
+                        f"{sh['efficiency_pct']:>6.1f}%\n")
+            else:
+                f.write(f"  {name:<18}  {0:>7}  {'-':>11}  {'-':>7}\n")
+        f.write("\n")
+
+
+def write_report(report_path, labels, video_path, total_frames, fps, start_clock=None):
+    """Zaman etüdü metin raporu."""
+    counts, durations = category_totals(labels, fps)
+    total = float(durations.sum())
+    video_duration = total_frames / fps
+
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write("=" * 60 + "\n")
+        f.write("  SASA POY - MASURA BÖLÜMÜ ZAMAN ETÜDÜ RAPORU\n")
+        f.write("=" * 60 + "\n\n")
+        f.write(f"Video     : {os.path.basename(video_path)}\n")
+        f.write(f"Tarih     : {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+        f.write(f"Video Süresi: {format_time(video_duration)}\n\n")
+
+        f.write("-" * 60 + "\n")
+        f.write("ÖZET\n")
+        f.write("-" * 60 + "\n")
+        f.write(f"Toplam Etiket Sayısı    : {len(labels)}\n")
+        f.write(f"Etiketlenen Süre        : {format_time(total)}\n")
+        f.write(f"Kapsam Oranı            : {total / video_duration * 100:.1f}%\n\n")
+
+        for name, n, seconds in zip(CATEGORIES, counts.tolist(), durations.tolist()):
+            f.write(f"{_upper_tr(LABEL_DISPLAY[name])}\n")
+            f.write(f"  Adet               : {n}\n")
+            f.write(f"  Toplam Süre        : {format_time(seconds)}\n")
+            f.write(f"  Ortalama Süre      : {format_time(seconds / n if n else 0)}\n")
+            if total:
+                f.write(f"  Oran (etiketli)    : {seconds / total * 100:.1f}%\n\n")
+
+        # Çevrim Süresi Analizi
+        analysis = analyze_cycles(labels, fps, start_clock=start_clock)
+        if analysis:
+            cycle_times = analysis["cycle_times"]
+            katma = CATEGORY_CODE[cycle_category()]
+            katma_sorted = sorted((e for e in labels if e.code == katma), key=lambda x: x.start_frame)
+
+            f.write("-" * 60 + "\n")
+            f.write("ÇEVRİM SÜRESİ ANALİZİ\n")
+            f.write("-" * 60 + "\n")
+            f.write(f"  Çevrim Sayısı      : {analysis['cycle_count']}\n")
+            f.write(f"  Ortalama Çevrim    : {format_time(analysis['avg_cycle_time'])}\n")
+            f.write(f"  Minimum Çevrim     : {format_time(analysis['min_cycle_time'])}\n")
+            f.write(f"  Maksimum Çevrim    : {format_time(analysis['max_cycle_time'])}\n")
+            f.write(f"  Ort. KDİ Süresi    : {format_time(analysis['avg_kdi_duration'])}\n")
+            f.write(f"  Verimlilik         : {analysis['efficiency_pct']:.1f}%\n\n")
+
+            _write_cycle_analytics(f, analysis)
+
+            f.write(f"  {'#':>4}  {'Çevrim Başı':>12}  {'Çevrim Süresi':>14}\n")
+            f.write("  " + "-" * 35 + "\n")
+            for i, ct in enumerate(cycle_times, 1):
+                start_str = format_time(katma_sorted[i - 1].start_frame / fps)
+                f.write(f"  {i:>4}  {start_str:>12}  {format_time(ct):>14}\n")
+            f.write("\n")
+
+        f.write("-" * 60 + "\n")
+        f.write("DETAYLI ETİKET LİSTESİ\n")
+        f.write("-" * 60 + "\n")
+        f.write(f"{'#':>4}  {'Başlangıç':>10}  {'Bitiş':>10}  {'Süre':>8}  {'Etiket'}\n")
+        f.write("-" * 60 + "\n")
+        for i, entry in enumerate(labels, 1):
+            start_str, end_str = entry.time_strs(fps)
+            f.write(
+                f"{i:>4}  {start_str:>10}  {end_str:>10}  "
+                f"{format_time(entry.frames / fps):>8}  {LABEL_DISPLAY[entry.label]}\n"
+            )
@@ -0,0 +1,390 @@
+"""Etiket modeli: kategori sabitleri, etiket kaydı ve .labels.json okuma/yazma.
+
+Kategoriler yapılandırılabilir bir kayıttır (ad, görünen ad, kısayol,
+renk; bkz. set_taxonomy). Etiketler bellekte __slots__'lu Label
+kayıtlarıdır (iki kare + kategori kodu); fps etiketin değil belgenin
+(videonun) özelliğidir, süre gereken her yere ayrıca verilir. Dosyada
+sürüm 2 biçiminde sütun sütun tutulur. Sürüm 1 dosyaları (kayıt başına tüm alanları içeren sözlük
+listesi) okunmaya devam eder.
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+
+from . import cache
+from .lazy import lazy_import
+from .utils import format_time
+
+np = lazy_import("numpy")
+
+# ─── Sabitler ───────────────────────────────────────────────────────
+LABEL_KATMA_DEGERLI = "katma_degerli_is"
+LABEL_DIGER = "diger"
+
+LABEL_FORMAT = 2   # 1: kayıt başına sözlük listesi, 2: sütunlar
+
+# ─── Kategori kaydı ─────────────────────────────────────────────────
+# Kategoriler yapılandırma dosyasından (SASA_TAXONOMY ya da set_taxonomy)
+# gelir. Aşağıdaki tablolar yerinde güncellenir; `from .labels import
+# CATEGORIES` gibi içe aktarmalar her zaman geçerli kaydı görür. Kod,
+# kategorinin sırasıdır (dosyada ve dizilerde int8).
+TAXONOMY_ENV = "SASA_TAXONOMY"
+DEFAULT_TAXONOMY = (
+    {"name": LABEL_KATMA_DEGERLI, "display": "Katma Değerli İş", "key": "k", "color": "#2ecc71", "cycle": True},
+    {"name": LABEL_DIGER, "display": "Diğer", "key": "d", "color": "#e74c3c"},
+)
+MAX_CATEGORIES = 127
+RESERVED_KEYS = frozenset("szrq")    # arayüz kısayolları (kaydet, geri al, ROI, çıkış)
+
+CATEGORIES = []          # kod -> ad
+CATEGORY_CODE = {}       # ad -> kod
+LABEL_DISPLAY = {}       # ad -> görünen ad
+LABEL_COLORS = {}        # ad -> "#rrggbb"
+CATEGORY_KEYS = {}       # kısayol harfi -> ad
+_cycle = [LABEL_KATMA_DEGERLI]
+
+_COLOR_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def set_taxonomy(categories):
+    """Kategori kaydını değiştir; etiketler yüklenmeden önce çağrılmalı.
+
+    categories, {"name", "display", "key", "color", "cycle"} sözlükleridir
+    (display, key ve cycle isteğe bağlı). Çevrim analizi "cycle" işaretli
+    kategorinin başlangıçlarını sayar; işaret yoksa ilk kategori. Geçersiz
+    yapılandırmada ValueError.
+    """
+    categories = list(categories)
+    if not categories or len(categories) > MAX_CATEGORIES:
+        raise ValueError(f"Kategori sayısı 1-{MAX_CATEGORIES} olmalı")
+    names, keys, cycle = [], {}, []
+    for c in categories:
+        name, key = c.get("name"), (c.get("key") or "").lower()
+        if not name or name in names:
+            raise ValueError(f"Kategori adı boş ya da tekrarlı: {name!r}")
+        if not _COLOR_RE.match(c.get("color", "")):
+            raise ValueError(f"{name}: renk #rrggbb olmalı")
+        if key:
+            if len(key) != 1 or not key.isalnum() or key in RESERVED_KEYS or key in keys:
+                raise ValueError(f"{name}: kısayol tek harf/rakam, benzersiz ve {sorted(RESERVED_KEYS)} dışında olmalı")
+            keys[key] = name
+        if c.get("cycle"):
+            cycle.append(name)
+        names.append(name)
+    if len(cycle) > 1:
+        raise ValueError(f"Yalnızca bir çevrim kategorisi olabilir: {cycle}")
+
+    CATEGORIES[:] = names
+    CATEGORY_CODE.clear()
+    CATEGORY_CODE.update((name, code) for code, name in enumerate(names))
+    LABEL_DISPLAY.clear()
+    LABEL_DISPLAY.update((c["name"], c.get("display") or c["name"]) for c in categories)
+    LABEL_COLORS.clear()
+    LABEL_COLORS.update((c["name"], c["color"]) for c in categories)
+    CATEGORY_KEYS.clear()
+    CATEGORY_KEYS.update(keys)
+    _cycle[0] = cycle[0] if cycle else names[0]
+
+
+def load_taxonomy(path):
+    """JSON yapılandırmasını ({"categories": [...]}) yükle ve kaydı değiştir."""
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    set_taxonomy(doc["categories"] if isinstance(doc, dict) else doc)
+
+
+def taxonomy():
+    """Geçerli kayıt, set_taxonomy/load_taxonomy biçiminde (sunucu istemcilere verir)."""
+    keys = {name: key for key, name in CATEGORY_KEYS.items()}
+    return [
+        {"name": name, "display": LABEL_DISPLAY[name], "key": keys.get(name, ""),
+         "color": LABEL_COLORS[name], "cycle": name == _cycle[0]}
+        for name in CATEGORIES
+    ]
+
+
+def cycle_category():
+    """Çevrim başlangıcı sayılan (katma değerli) kategori."""
+    return _cycle[0]
+
+
+def category_code(name):
+    """Kategori kodu; kayıtta olmayan adda ValueError (kayıt yalnızca set_taxonomy ile değişir)."""
+    code = CATEGORY_CODE.get(name)
+    if code is None:
+        raise ValueError(f"Bilinmeyen etiket kategorisi: {name!r}")
+    return code
+
+
+def _check_categories(names):
+    """Dosyada kullanılan kategoriler kayıtta yoksa hepsini adlandıran ValueError."""
+    unknown = sorted({str(n) for n in names if n not in CATEGORY_CODE})
+    if unknown:
+        raise ValueError(
+            f"Etiket dosyası yapılandırmada olmayan kategoriler içeriyor: {', '.join(unknown)}. "
+            f"Dosyayı yazan kategori yapılandırmasını yükleyin (--taxonomy ya da {TAXONOMY_ENV})."
+        )
+
+
+set_taxonomy(DEFAULT_TAXONOMY)
+if os.environ.get(TAXONOMY_ENV):
+    load_taxonomy(os.environ[TAXONOMY_ENV])
+
+
+def label_file_path(video_path):
+    return video_path + ".labels.json"
+
+
+def _has_content_key(video_path):
+    """Önbellek anahtarı içerikten alınabilir mi: manifest ve oturum JSON'ları yalnızca yan dosya kullanır."""
+    from .sources import VIDEO_EXTENSIONS
+
+    return video_path.lower().endswith(VIDEO_EXTENSIONS) and os.path.isfile(video_path)
+
+
+def video_fingerprint(video_path):
+    """Etiket yedeğinin anahtarı: video dosyasıysa içerik parmak izi, değilse None.
+
+    Video açılırken bir kez alınıp save_label_file'a verilir; her kayıtta
+    yeniden hesaplanmaz.
+    """
+    return cache.fingerprint(video_path) if _has_content_key(video_path) else None
+
+
+def find_label_file(video_path):
+    """Okunacak etiket dosyası: videonun yanındaki, yoksa içerik önbelleğindeki yedek.
+
+    Arşiv klasörü taşındığında ya da video yeniden adlandığında etiketler
+    parmak iziyle önbellekten bulunur. İkisi de yoksa yandaki (yeni) yol.
+    """
+    path = label_file_path(video_path)
+    if os.path.exists(path) or not _has_content_key(video_path):
+        return path
+    backup = cache.artifact_path(video_path, cache.LABELS_FILE)
+    return backup if backup and os.path.exists(backup) else path
+
+
+# ─── Etiket kaydı ───────────────────────────────────────────────────
+class Label:
+    """Tek etiket: iki tamsayı kare ve kategori kodu.
+
+    Saniye ve "SS:DD:ss" değerleri saklanmaz; belgenin fps'iyle times() ve
+    time_strs() üzerinden hesaplanır. Eski sözlük kayıtlarıyla uyum için
+    entry["start_frame"], entry.get("id") gibi anahtar erişimini de destekler.
+    """
+
+    __slots__ = ("start_frame", "end_frame", "code", "id", "annotator")
+
+    def __init__(self, start_frame, end_frame, code, id=None, annotator=None):
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.code = code
+        self.id = id
+        self.annotator = annotator
+
+    @classmethod
+    def from_dict(cls, entry, fps=None):
+        """Sözlük kaydından (eski dosya, sunucu yanıtı) oluştur.
+
+        Yalnızca saniye içeren eski kayıtlar için fps gerekir.
+        """
+        if "start_frame" in entry:
+            start, end = int(entry["start_frame"]), int(entry["end_frame"])
+        elif fps:
+            start, end = int(round(entry["start_time"] * fps)), int(round(entry["end_time"] * fps))
+        else:
+            raise ValueError("Kare numarası olmayan etiket kaydı için fps gerekli")
+        return cls(start, end, category_code(entry["label"]), entry.get("id"), entry.get("annotator"))
+
+    @property
+    def label(self):
+        return CATEGORIES[self.code]
+
+    @property
+    def frames(self):
+        """Etiketin kare sayısı."""
+        return self.end_frame - self.start_frame
+
+    def times(self, fps):
+        """(başlangıç, bitiş, süre) saniye cinsinden."""
+        return self.start_frame / fps, self.end_frame / fps, self.frames / fps
+
+    def time_strs(self, fps):
+        """(başlangıç, bitiş) "SS:DD:ss" metinleri."""
+        return format_time(self.start_frame / fps), format_time(self.end_frame / fps)
+
+    # Sözlük arayüzü
+    def __getitem__(self, key):
+        if key not in _ENTRY_KEYS:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key == "label":
+            self.code = CATEGORY_CODE[value]
+        elif key in _WRITABLE_KEYS:
+            setattr(self, key, value)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in _ENTRY_KEYS and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def to_dict(self, fps=None):
+        """Eski (sürüm 1) sözlük biçimi: sunucu yanıtları ve dışa aktarım için.
+
+        fps verilirse saniye ve metin alanları da eklenir (eski okuyucular).
+        """
+        entry = {key: getattr(self, key) for key in _DICT_KEYS}
+        if fps:
+            start, end, duration = self.times(fps)
+            entry.update(start_time=start, end_time=end, duration=duration)
+            entry["start_str"], entry["end_str"] = self.time_strs(fps)
+        if self.id is not None:
+            entry["id"] = self.id
+        if self.annotator is not None:
+            entry["annotator"] = self.annotator
+        return entry
+
+    def __repr__(self):
+        return f"Label({self.start_frame}, {self.end_frame}, {self.label!r})"
+
+
+_DICT_KEYS = ("start_frame", "end_frame", "label")
+_ENTRY_KEYS = frozenset(_DICT_KEYS + ("id", "annotator"))
+_WRITABLE_KEYS = frozenset(("start_frame", "end_frame", "id", "annotator"))
+
+
+def make_entry(start_frame, end_frame, label):
+    """Kare aralığından etiket kaydı oluştur."""
+    return Label(start_frame, end_frame, CATEGORY_CODE[label])
+
+
+def label_arrays(labels):
+    """(başlangıç int32, bitiş int32, kategori kodu int8) paralel dizileri."""
+    n = len(labels)
+    starts = np.fromiter((e.start_frame for e in labels), dtype=np.int32, count=n)
+    ends = np.fromiter((e.end_frame for e in labels), dtype=np.int32, count=n)
+    codes = np.fromiter((e.code for e in labels), dtype=np.int8, count=n)
+    return starts, ends, codes
+
+
+def build_label_document(labels, video_path, fps, total_frames, fingerprint=None, analytics=True):
+    """.labels.json içeriği; etiketler sütun sütun.
+
+    fingerprint verilmezse videodan alınır (bkz. video_fingerprint).
+    analytics=False çevrim süresi analizini atlar: her etikette yapılan
+    otomatik kayıt için; analiz açık kayıtta ve dışa aktarımda yazılır.
+    """
+    doc = {
+        "format": LABEL_FORMAT,
+        "video_file": os.path.basename(video_path),
+        "video_path": video_path,
+        "fingerprint": fingerprint or video_fingerprint(video_path),
+        "fps": fps,
+        "total_frames": total_frames,
+        "total_duration": total_frames / fps,
+        "created": datetime.now().isoformat(),
+    }
+    if analytics:
+        from .cycles import recording_start_clock
+        from .stats import cycle_time_analysis
+
+        doc["cycle_time_analysis"] = cycle_time_analysis(labels, fps, start_clock=recording_start_clock(video_path))
+    doc["categories"] = list(CATEGORIES)
+    doc["labels"] = label_columns(labels)
+    return doc
+
+
+def label_columns(labels):
+    """Sürüm 2 `labels` bloğu: kare ve kod sütunları; id/annotator yalnızca varsa."""
+    starts, ends, codes = label_arrays(labels)
+    columns = {"start_frame": starts.tolist(), "end_frame": ends.tolist(), "category": codes.tolist()}
+    for key in ("id", "annotator"):
+        values = [getattr(e, key) for e in labels]
+        if any(v is not None for v in values):
+            columns[key] = values
+    return columns
+
+
+def labels_from_document(doc):
+    """Belge içeriğinden Label listesi; sürüm 1 (sözlük listesi) ve 2 (sütunlar)."""
+    fps = doc.get("fps") or 25.0
+    data = doc.get("labels") or []
+    if isinstance(data, list):
+        _check_categories(entry["label"] for entry in data)
+        return [Label.from_dict(entry, fps) for entry in data]
+
+    # Dosyadaki kodlar, dosyanın kategori sırasına göredir; kullanılmayan
+    # yabancı kategoriler sorun değildir
+    names = doc.get("categories") or [c["name"] for c in DEFAULT_TAXONOMY]
+    _check_categories(names[c] for c in set(data["category"]))
+    remap = [CATEGORY_CODE.get(name, -1) for name in names]
+    n = len(data["start_frame"])
+    ids = data.get("id") or [None] * n
+    annotators = data.get("annotator") or [None] * n
+    return [
+        Label(s, e, remap[c], i, a)
+        for s, e, c, i, a in zip(data["start_frame"], data["end_frame"], data["category"], ids, annotators)
+    ]
+
+
+def _write_document(f, data):
+    # Üst bilgi okunaklı, etiket sütunları tek satırda (büyük setlerde hızlı ve küçük)
+    fields = []
+    for key, value in data.items():
+        if key == "labels":
+            text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        fields.append(f"  {json.dumps(key)}: {text}")
+    f.write("{\n" + ",\n".join(fields) + "\n}\n")
+
+
+def save_label_file(path, labels, video_path, fps, total_frames, backup=True, fingerprint=None, analytics=True):
+    """Etiketleri yaz; video dosyasıysa içerik önbelleğine de yedekle.
+
+    Videonun kendi etiketi olmayan türetilmiş çıktılar (ör. uzlaşı birleşimi)
+    backup=False ile yazılır; yoksa videonun yedeğinin üzerine yazarlar.
+    fingerprint ve analytics için bkz. build_label_document.
+    """
+    data = build_label_document(labels, video_path, fps, total_frames, fingerprint, analytics)
+    with open(path, "w", encoding="utf-8") as f:
+        _write_document(f, data)
+    if not backup or not data["fingerprint"]:
+        return
+    backup_path = cache.artifact_path(video_path, cache.LABELS_FILE, data["fingerprint"])
+    if os.path.abspath(backup_path) != os.path.abspath(path):
+        try:
+            cache.write_json(backup_path, data)
+        except OSError:
+            pass  # yedek yazılamazsa asıl dosya yeterli
+
+
+def load_label_document(path):
+    """.labels.json içeriğinin tamamı (fps, total_frames, labels...); etiketler için labels_from_document."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_label_file(path):
+    """Etiket listesini oku; dosya yoksa boş liste."""
+    if not os.path.exists(path):
+        return []
+    return labels_from_document(load_label_document(path))
@@ -0,0 +1,58 @@
+"""Ağır modüller için gecikmeli içe aktarma.
+
+cv2 ve PIL.ImageTk açılışta yüzlerce ms tutar; arayüz ilk kareyi çizene
+kadar bunlara ihtiyaç yoktur. `lazy_import` ilk öznitelik erişiminde modülü
+yükleyen hafif bir vekil döndürür.
+"""
+
+import importlib
+import sys
+import threading
+
+
+class LazyModule:
+    """İlk kullanımda gerçek modülü yükleyen vekil."""
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__dict__["_name"])
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self):
+        return self.__dict__["_name"] in sys.modules
+
+    def __repr__(self):
+        state = "yüklü" if self.loaded else "bekliyor"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(name):
+    """`name` modülü için gecikmeli vekil (zaten yüklüyse modülün kendisi)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def preload(*names):
+    """Modülleri arka planda yükle; ilk kullanımda takılma olmasın."""
+
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
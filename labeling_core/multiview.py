@@ -0,0 +1,209 @@
+"""Çoklu kamera görünümü: birden çok videoyu tek ffmpeg sürecinde oynatma.
+
+Her kamera aynı filtre grafiğinde ölçeklenip (scale + pad) tek bir mozaik
+kareye dizilir (xstack). N ayrı boru ve N tam çözünürlüklü kare yerine
+tek bir ekran boyutlu kare okunur; tüm görünümler aynı saatle ilerler.
+
+Kod çözme kademelidir: oynatma tam kaliteyle başlar; kod çözme geri
+kalırsa arayüz degrade() çağırır ve döşemeler ön hesaplanmış proxy'den
+(ekran boyutu H.264; ROI'li döşemede bölge proxy'de döşemeden küçük
+kalmıyorsa), kalan HEVC kaynaklar döngü filtresi
+atlanarak (deblock/SAO; hafif bloklanma) okunur.
+
+Ölçülen sınır (tek çekirdek, 3×1080p HEVC, bench_labeling multiview):
+tam kalitede gerçek zamanın ~0,6 katı, döngü filtresiz ~0,7 katı; proxy'lerle
+1x'te ~4,4, 2x'te ~1,1 katı. Proxy'si henüz üretilmemiş 1080p HEVC kameralarla
+1x için kamera başına yaklaşık bir çekirdek gerekir.
+"""
+
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import proxy_for, proxy_size
+from .reader import DEFAULT_OUT_SIZE, FFmpegVideoReader
+from .roi import crop_filter, load_roi, map_point, proxy_region
+
+MANIFEST_SUFFIX = ".multiview.json"
+
+# Kod çözme kademeleri (degrade() ile artar, oynatma başında sıfırlanır)
+DECODE_FULL = 0
+DECODE_PROXY = 1         # proxy'si olan döşemeler proxy'den
+DECODE_SKIP_LOOP = 2     # kalan kaynaklarda döngü filtresi atlanır
+
+
+def manifest_path_for(first_video_path):
+    return first_video_path + MANIFEST_SUFFIX
+
+
+def is_manifest(path):
+    return path.lower().endswith(MANIFEST_SUFFIX)
+
+
+def save_manifest(path, paths, offsets, rois=None):
+    rois = rois or [None] * len(paths)
+    videos = []
+    for p, o, roi in zip(paths, offsets, rois):
+        video = {"path": p, "offset": o}
+        if roi:
+            video["roi"] = list(roi)
+        videos.append(video)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"videos": videos}, f, ensure_ascii=False, indent=2)
+
+
+def load_manifest(path):
+    """(yollar, ofsetler, roi'ler) döndür; göreli yollar manifest klasörüne göre çözülür.
+
+    Manifestte ROI'si olmayan kamera, videonun kendi .roi.json kaydını kullanır.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    base = os.path.dirname(path)
+    paths = [os.path.join(base, v["path"]) for v in data["videos"]]
+    offsets = [float(v.get("offset", 0.0)) for v in data["videos"]]
+    rois = [tuple(v["roi"]) if v.get("roi") else load_roi(p) for v, p in zip(data["videos"], paths)]
+    return paths, offsets, rois
+
+
+def grid_for(count):
+    """Görünüm sayısı için (sütun, satır) ızgarası."""
+    cols = math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
+    return cols, rows
+
+
+class MultiViewReader(FFmpegVideoReader):
+    """Birden çok kamerayı tek ffmpeg filtre grafiğinde okuyan okuyucu.
+
+    Ortak zaman çizelgesindeki t anı, i. videoda t + offsets[i] saniyesine
+    denk gelir. Ofsetler en küçüğü 0 olacak şekilde kaydırılır; süre, tüm
+    kameraların kapsadığı ortak aralıktır. Etiketler bu ortak kare
+    numaralarıyla tutulur.
+    """
+
+    def __init__(self, paths, offsets=None, out_size=DEFAULT_OUT_SIZE, path=None, perf=None, rois=None):
+        if len(paths) < 2:
+            raise ValueError("Çoklu görünüm için en az iki video gerekli")
+        offsets = list(offsets) if offsets else [0.0] * len(paths)
+        if len(offsets) != len(paths):
+            raise ValueError("Her video için bir ofset verilmeli")
+        base = min(offsets)
+        self.paths = list(paths)
+        self.offsets = [o - base for o in offsets]
+        self.cols, self.rows = grid_for(len(paths))
+        self.tile_w = out_size[0] // self.cols
+        self.tile_h = out_size[1] // self.rows
+        self.rois = list(rois) if rois else [None] * len(paths)
+        self.proxies = [None] * len(paths)
+        self.decode_level = DECODE_FULL
+        self.sources = []
+        super().__init__(path or manifest_path_for(paths[0]), perf=perf, out_size=out_size)
+
+    @classmethod
+    def from_manifest(cls, manifest_path, out_size=DEFAULT_OUT_SIZE, perf=None):
+        paths, offsets, rois = load_manifest(manifest_path)
+        reader = cls(paths, offsets, out_size=out_size, path=manifest_path, perf=perf, rois=rois)
+        reader.refresh_proxies()
+        return reader
+
+    def refresh_proxies(self):
+        """Ön hesaplanmış proxy'leri yeniden bul (sonraki akıştan itibaren geçerli)."""
+        self.proxies = [proxy_for(p) for p in self.paths]
+
+    # ─── Kod çözme kademesi ─────────────────────────────────────────
+    def degrade(self):
+        """Bir kademe ucuz kod çözmeye geç; değiştiyse True (çağıran akışı yeniden başlatır)."""
+        if self.decode_level >= DECODE_SKIP_LOOP:
+            return False
+        self.decode_level += 1
+        if self.decode_level == DECODE_PROXY and not any(self._tile_proxy(i) for i in range(len(self.paths))):
+            self.decode_level = DECODE_SKIP_LOOP   # proxy yok: doğrudan sonraki kademe
+        return True
+
+    def reset_decode(self):
+        self.decode_level = DECODE_FULL
+
+    def _tile_proxy(self, index):
+        """(proxy yolu, proxy'deki kırpma bölgesi ya da None); kullanılamıyorsa None."""
+        proxy, roi = self.proxies[index], self.rois[index]
+        if not proxy:
+            return None
+        if not roi:
+            return proxy, None
+        size = proxy_size(self.paths[index])
+        region = size and proxy_region(roi, self.source_size(index), size, (self.tile_w, self.tile_h))
+        return (proxy, region) if region else None
+
+    def _tile_inputs(self):
+        """Döşeme başına (girdi yolu, kırpma bölgesi, proxy mi)."""
+        inputs = []
+        for i, path in enumerate(self.paths):
+            proxy = self._tile_proxy(i) if self.decode_level >= DECODE_PROXY else None
+            inputs.append((proxy[0], proxy[1], True) if proxy else (path, self.rois[i], False))
+        return inputs
+
+    @property
+    def frame_size(self):
+        return self.width, self.height
+
+    def _probe(self):
+        """Kaynakları paralel probe et; ortak süre ve mozaik boyutunu hesapla."""
+        with ThreadPoolExecutor(max_workers=len(self.paths)) as pool:
+            self.sources = list(pool.map(FFmpegVideoReader, self.paths))
+        if any(src.total_frames == 0 for src in self.sources):
+            return
+        self.fps = self.sources[0].fps
+        self.duration = max(0.0, min(src.duration - off for src, off in zip(self.sources, self.offsets)))
+        self.total_frames = int(self.duration * self.fps)
+        self.width = self.cols * self.tile_w
+        self.height = self.rows * self.tile_h
+
+    def _input_args(self, start_time):
+        args = []
+        for (path, _, is_proxy), offset in zip(self._tile_inputs(), self.offsets):
+            if self.decode_level >= DECODE_SKIP_LOOP and not is_proxy:
+                args += ["-skip_loop_filter", "all"]
+            args += ["-ss", f"{start_time + offset:.3f}", "-i", path]
+        return args
+
+    def _filter_args(self):
+        tw, th = self.tile_w, self.tile_h
+        parts = []
+        for i, (_, region, _) in enumerate(self._tile_inputs()):
+            crop = f"{crop_filter(region)}," if region else ""
+            parts.append(
+                f"[{i}:v:0]{crop}fps={self.fps},"
+                f"scale={tw}:{th}:force_original_aspect_ratio=decrease:flags=fast_bilinear,"
+                f"pad={tw}:{th}:(ow-iw)/2:(oh-ih)/2,setsar=1[v{i}]"
+            )
+        layout = "|".join(f"{(i % self.cols) * tw}_{(i // self.cols) * th}" for i in range(len(self.paths)))
+        inputs = "".join(f"[v{i}]" for i in range(len(self.paths)))
+        parts.append(f"{inputs}xstack=inputs={len(self.paths)}:layout={layout}:fill=black[out]")
+        return ["-filter_complex", ";".join(parts), "-map", "[out]"]
+
+    # ─── ROI (kamera başına) ────────────────────────────────────────
+    def source_size(self, index=0):
+        src = self.sources[index]
+        return src.width, src.height
+
+    def roi_aspect(self, index=0):
+        return self.tile_w / self.tile_h
+
+    def get_roi(self, index=0):
+        return self.rois[index]
+
+    def set_roi(self, roi, index=0):
+        self.rois[index] = tuple(roi) if roi else None
+
+    def source_point(self, fx, fy):
+        col, row = int(fx // self.tile_w), int(fy // self.tile_h)
+        index = row * self.cols + col
+        if col >= self.cols or index >= len(self.paths):
+            return None
+        src_w, src_h = self.source_size(index)
+        region = self.rois[index] or (0, 0, src_w, src_h)
+        sx, sy = map_point(fx - col * self.tile_w, fy - row * self.tile_h,
+                           self.tile_w, self.tile_h, region, letterbox=True)
+        return index, sx, sy
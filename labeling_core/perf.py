@@ -0,0 +1,191 @@
+"""Sıcak yol süre ölçümleri (HUD ve JSONL kare izi için)."""
+
+import bisect
+import json
+import os
+import time
+from collections import deque
+
+
+class RollingHistogram:
+    """Son `window` örneğin sabit kovalı (ms) kayan histogramı.
+
+    Ekleme ve eskiyen örneği düşme O(1); yüzdelikler kova sınırından okunur.
+    """
+
+    EDGES_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 133, 266, 533)
+
+    def __init__(self, window=250):
+        self._window = window
+        self._samples = deque()
+        self.counts = [0] * (len(self.EDGES_MS) + 1)
+        self._sum = 0.0
+
+    def add(self, ms):
+        bucket = bisect.bisect_left(self.EDGES_MS, ms)
+        if len(self._samples) == self._window:
+            old_ms, old_bucket = self._samples.popleft()
+            self.counts[old_bucket] -= 1
+            self._sum -= old_ms
+        self._samples.append((ms, bucket))
+        self.counts[bucket] += 1
+        self._sum += ms
+
+    def __len__(self):
+        return len(self._samples)
+
+    @property
+    def mean(self):
+        return self._sum / len(self._samples) if self._samples else 0.0
+
+    @property
+    def max(self):
+        return max((ms for ms, _ in list(self._samples)), default=0.0)
+
+    def percentile(self, p):
+        """Örneklerin p%'inin altında kaldığı kova üst sınırı (ms)."""
+        n = len(self._samples)
+        if not n:
+            return 0.0
+        target = p / 100.0 * n
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.EDGES_MS[i] if i < len(self.EDGES_MS) else self.max
+        return self.max
+
+
+class PerfMonitor:
+    """Sıcak yol zamanlayıcısı: aşama başına kayan histogram, HUD özeti ve JSONL iz.
+
+    Kullanım:
+        t0 = perf.clock()
+        ...iş...
+        t0 = perf.add("resize", t0)
+
+    Kapalıyken clock()/add() hiç saat okumadan döner; ölçüm maliyeti ihmal edilebilir.
+    """
+
+    def __init__(self, window=250):
+        self.window = window
+        self.hud = False
+        self.enabled = False
+        self.stages = {}
+        self.frame_interval = RollingHistogram(window)
+        self.frames = 0
+        self.dropped = 0
+        self._frame_stages = {}
+        self._last_frame_end = 0.0
+        self._trace_file = None
+        self._trace_path = None
+        self._trace_t0 = 0.0
+
+    # Durum
+    def _refresh_enabled(self):
+        self.enabled = self.hud or self._trace_file is not None
+
+    def set_hud(self, on):
+        self.hud = on
+        self._refresh_enabled()
+
+    @property
+    def tracing(self):
+        return self._trace_file is not None
+
+    @property
+    def trace_path(self):
+        return self._trace_path
+
+    def start_trace(self, path):
+        self.stop_trace()
+        self._trace_file = open(path, "a", encoding="utf-8")
+        self._trace_path = path
+        self._trace_t0 = time.perf_counter()
+        self._refresh_enabled()
+
+    def stop_trace(self):
+        if self._trace_file:
+            self._trace_file.close()
+        self._trace_file = None
+        self._refresh_enabled()
+
+    def reset(self):
+        self.stages = {}
+        self.frame_interval = RollingHistogram(self.window)
+        self.frames = 0
+        self.dropped = 0
+        self._frame_stages = {}
+        self._last_frame_end = 0.0
+
+    # Ölçüm
+    def clock(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def add(self, stage, t0):
+        """`t0`'dan bu yana geçen süreyi `stage` aşamasına yaz, yeni zamanı döndür."""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        ms = (now - t0) * 1000.0
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = RollingHistogram(self.window)
+        hist.add(ms)
+        self._frame_stages[stage] = self._frame_stages.get(stage, 0.0) + ms
+        return now
+
+    def resume(self):
+        """Oynatma yeniden başlarken duraklama süresini fps'e katma."""
+        self._last_frame_end = 0.0
+
+    def end_frame(self, frame_no, late=False, seek=False, **extra):
+        """Gösterilen kareyi kapat: fps/kayıp sayacı ve iz satırı.
+
+        seek=True ile gelen tekil kareler (duraklatılmışken atlama) fps'e sayılmaz.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if not seek:
+            if self._last_frame_end:
+                self.frame_interval.add((now - self._last_frame_end) * 1000.0)
+            self._last_frame_end = now
+            self.frames += 1
+            if late:
+                self.dropped += 1
+        if self._trace_file:
+            record = {
+                "t": round(now - self._trace_t0, 6),
+                "frame": frame_no,
+                "seek": seek,
+                "late": late,
+                "stages_ms": {k: round(v, 3) for k, v in self._frame_stages.items()},
+            }
+            record.update(extra)
+            self._trace_file.write(json.dumps(record) + "\n")
+        self._frame_stages = {}
+
+    def event(self, kind, **fields):
+        """Kare dışı olay (ör. etiket tuşu) iz satırı; iz kapalıysa hiçbir şey yapmaz."""
+        if self._trace_file:
+            record = {"t": round(time.perf_counter() - self._trace_t0, 6), "event": kind}
+            record.update(fields)
+            self._trace_file.write(json.dumps(record) + "\n")
+
+    # Özet
+    @property
+    def fps(self):
+        mean = self.frame_interval.mean
+        return 1000.0 / mean if mean else 0.0
+
+    def summary_lines(self):
+        lines = [
+            f"FPS {self.fps:5.1f}  kare {self.frames}  geç {self.dropped}",
+            f"{'aşama':<12}{'ort':>7}{'p95':>7}{'max':>7} ms",
+        ]
+        for name, hist in list(self.stages.items()):
+            lines.append(f"{name:<12}{hist.mean:>7.2f}{hist.percentile(95):>7.1f}{hist.max:>7.1f}")
+        if self.tracing:
+            lines.append(f"iz: {os.path.basename(self._trace_path)}")
+        return lines
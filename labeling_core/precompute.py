@@ -0,0 +1,456 @@
+"""
+Video klasörü için arka plan ön hesaplama zamanlayıcısı
+
+Klasör periyodik olarak taranır; yeni ya da değişen kayıtlar için video
+başına işler (probe, anahtar kare dizini, etkinlik sinyali, küçük resimler,
+proxy) sınırlı sayıda işçiye sahip öncelik kuyruğuna konur. Açık videonun
+işleri kuyruğun önüne geçer. ffmpeg her zaman düşük öncelikle (POSIX'te
+nice, Windows'ta BELOW_NORMAL) ve sınırlı iş parçacığıyla başlatılır;
+oynatma sürerken tek işçi, tek iş parçacığıyla çalışır. Sonuçlar içerik parmak
+iziyle önbelleğe yazılır (bkz. labeling_core.cache); kaydı olan işler,
+başka klasörde ya da başka iş istasyonunda yapılmış olsa da tekrarlanmaz.
+Başarısız iş sonraki taramalarda artan aralıklarla (RETRY_BASE_SEC, 2x, 4x)
+en çok RETRY_LIMIT kez yeniden denenir; sonra kaynak değişene kadar bırakılır.
+
+Kullanım:
+  python -m labeling_core.precompute KLASÖR
+  python -m labeling_core.precompute KLASÖR --once --workers 4 --jobs probe keyframes
+  python -m labeling_core.precompute KLASÖR --cache-dir //nas/sasa_onbellek
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+from . import cache
+from .lazy import lazy_import
+from .reader import DEFAULT_OUT_SIZE, probe_video
+from .sources import VIDEO_EXTENSIONS, list_video_sources
+
+np = lazy_import("numpy")
+
+SCAN_INTERVAL_SEC = 10.0
+SETTLE_SEC = 30.0            # son değişiklikten bu kadar önce biten dosya işlenmez (NVR hâlâ yazıyor)
+DEFAULT_WORKERS = 2
+THROTTLED_WORKERS = 1        # oynatma sürerken
+THROTTLE_POLL_SEC = 1.0      # kısıtlıyken oynatma durumunun yoklanma aralığı
+BACKGROUND_NICE = 10
+# Kısıtsızken bile iş başına üst sınır: oynatma başladığında süren iş çekirdekleri tüketmesin
+BACKGROUND_THREADS = max(1, (os.cpu_count() or 2) // 4)
+THROTTLED_THREADS = 1
+ACTIVITY_FPS = 2             # etkinlik sinyali örnekleme hızı
+ACTIVITY_SIZE = (64, 36)
+THUMB_INTERVAL_SEC = 60
+THUMB_SIZE = (160, 90)
+PROXY_SIZE = DEFAULT_OUT_SIZE
+PROXY_CRF = 26
+RETRY_LIMIT = 3              # başarısız iş bu kadar kez daha denenir
+RETRY_BASE_SEC = 60.0        # ilk yeniden deneme gecikmesi; her denemede iki katı
+
+# Ucuzdan pahalıya; aynı öncelikteki işler bu sırayla çalışır
+JOBS = ("probe", "keyframes", "activity", "thumbnails", "proxy")
+
+
+# ─── İşler ──────────────────────────────────────────────────────────
+def _background(cmd):
+    """Düşük öncelikli başlatma: (komut, Popen argümanları).
+
+    Çok iş parçacıklı süreçte preexec_fn güvenli değil (exec'ten önce
+    kilitlenebilir); POSIX'te komut `nice` ile sarılır.
+    """
+    if os.name == "nt":
+        return cmd, {"creationflags": subprocess.BELOW_NORMAL_PRIORITY_CLASS}
+    nice = shutil.which("nice")
+    if nice:
+        return [nice, "-n", str(BACKGROUND_NICE)] + cmd, {}
+    return cmd, {}
+
+
+def _run(cmd, **kwargs):
+    cmd, extra = _background(cmd)
+    return subprocess.run(cmd, capture_output=True, **extra, **kwargs)
+
+
+def _popen(cmd, **kwargs):
+    cmd, extra = _background(cmd)
+    return subprocess.Popen(cmd, **extra, **kwargs)
+
+
+def _source_info(path):
+    info = cache.cached(path, "probe")
+    return info if info is not None else probe_video(path)
+
+
+def job_probe(path, threads):
+    return probe_video(path)
+
+
+def job_keyframes(path, threads):
+    """Anahtar karelerin kare numaraları (paket bayraklarından, kod çözmeden)."""
+    info = _source_info(path)
+    if not info:
+        return None
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path]
+    out = _run(cmd, text=True).stdout
+    frames = set()
+    for line in out.splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            frames.add(int(round(float(pts) * info["fps"])))
+    return sorted(frames) or None
+
+
+def job_activity(path, threads):
+    """Saniyede ACTIVITY_FPS örnekte küçük gri kareler arası ortalama mutlak fark."""
+    w, h = ACTIVITY_SIZE
+    cmd = ["ffmpeg", "-v", "quiet", "-threads", str(threads), "-i", path, "-an",
+           "-vf", f"fps={ACTIVITY_FPS},scale={w}:{h}:flags=area,format=gray",
+           "-f", "rawvideo", "-"]
+    proc = _popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    values, prev = [], None
+    chunk = w * h * ACTIVITY_FPS * 60   # bir dakikalık örnek
+    try:
+        while True:
+            raw = proc.stdout.read(chunk)
+            usable = len(raw) // (w * h) * (w * h)
+            if not usable:
+                break
+            frames = np.frombuffer(raw[:usable], dtype=np.uint8).reshape(-1, w * h).astype(np.int16)
+            if prev is not None:
+                frames = np.vstack((prev, frames))
+            values.extend(np.round(np.abs(np.diff(frames, axis=0)).mean(axis=1), 2).tolist())
+            prev = frames[-1:]
+    finally:
+        proc.stdout.close()
+        proc.wait()
+    return {"rate": ACTIVITY_FPS, "values": values}
+
+
+def job_thumbnails(path, threads):
+    """Yaklaşık her THUMB_INTERVAL_SEC'te bir küçük resim; yalnızca anahtar kareler çözülür."""
+    out_dir = cache.artifact_path(path, cache.THUMBS_DIR)
+    if not out_dir:
+        return None
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    w, h = THUMB_SIZE
+    cmd = ["ffmpeg", "-v", "error", "-threads", str(threads), "-skip_frame", "nokey", "-i", path, "-an",
+           "-vf", f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{THUMB_INTERVAL_SEC})',scale={w}:{h}",
+           "-fps_mode", "vfr", "-q:v", "5",
+           os.path.join(tmp_dir, "%05d.jpg")]
+    if _run(cmd).returncode != 0:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return None
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return {"dir": cache.THUMBS_DIR, "interval": THUMB_INTERVAL_SEC, "count": len(os.listdir(out_dir))}
+
+
+def job_proxy(path, threads):
+    """Ekran boyutunda, saniyede bir anahtar kareli H.264 kopya (hızlı seek ve oynatma)."""
+    info = _source_info(path)
+    if not info:
+        return None
+    out = cache.artifact_path(path, cache.PROXY_FILE)
+    if not out:
+        return None
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp = f"{out}.{os.getpid()}.tmp.mp4"
+    w, h = PROXY_SIZE
+    gop = max(1, int(round(info["fps"])))
+    cmd = ["ffmpeg", "-y", "-v", "error", "-threads", str(threads), "-i", path, "-an", "-vf", f"scale={w}:{h}:flags=bilinear",
+           "-c:v", "libx264", "-preset", "veryfast", "-crf", str(PROXY_CRF), "-g", str(gop),
+           "-pix_fmt", "yuv420p", "-threads", str(threads), tmp]
+    if _run(cmd).returncode != 0:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, out)
+    return {"path": cache.PROXY_FILE, "size": [w, h]}
+
+
+JOB_FUNCS = {
+    "probe": job_probe,
+    "keyframes": job_keyframes,
+    "activity": job_activity,
+    "thumbnails": job_thumbnails,
+    "proxy": job_proxy,
+}
+
+
+def keyframe_frames(path, compute=False):
+    """Kayıtlı anahtar kare numaraları; ön hesaplanmamışsa None.
+
+    compute=True ise eksik dizin çağıranın iş parçacığında hemen çıkarılıp
+    kaydedilir: tüm dosyanın paketleri ffprobe ile okunur (uzun kayıtta
+    saniyeler). Arayüz iş parçacığından yalnızca compute=False çağrılmalı.
+    """
+    frames = cache.cached(path, "keyframes")
+    if frames is None and compute:
+        key = cache.fingerprint(path)
+        frames = job_keyframes(path, BACKGROUND_THREADS) or []
+        if frames:
+            cache.store(path, "keyframes", frames, key)
+    return frames
+
+
+def activity_for(path):
+    """Kayıtlı etkinlik sinyali {"rate", "values"} (yoksa None)."""
+    return cache.cached(path, "activity")
+
+
+# ─── Zamanlayıcı ────────────────────────────────────────────────────
+class PrecomputeScheduler:
+    """Klasörü izleyip ön hesaplama işlerini öncelik sırasıyla çalıştırır.
+
+    on_done(yol, iş, sonuç) işçi iş parçacığından çağrılır. focus(yollar) açık
+    videonun bekleyen işlerini öne alır. busy() True döndürdükçe (arayüzde
+    oynatma sürerken) en çok THROTTLED_WORKERS iş, THROTTLED_THREADS ffmpeg iş
+    parçacığıyla; aksi halde iş başına BACKGROUND_THREADS ile çalışır.
+    """
+
+    def __init__(self, video_dir, workers=DEFAULT_WORKERS, jobs=JOBS, on_done=None, busy=None,
+                 scan_interval=SCAN_INTERVAL_SEC, settle=SETTLE_SEC):
+        self.video_dir = video_dir
+        self.workers = max(1, workers)
+        self.jobs = tuple(j for j in JOBS if j in jobs)
+        self.on_done = on_done
+        self.busy = busy or (lambda: False)
+        self.scan_interval = scan_interval
+        self.settle = settle
+        self._cond = threading.Condition()
+        self._heap = []
+        self._pending = {}      # (yol, iş) -> iş başındaki parmak izi
+        self._running = set()   # çalışan (yol, iş)
+        self._seen = {}         # yol -> kuyruğa alındığı [boyut, mtime] imzası
+        self._retry = {}        # (yol, iş) -> (deneme sayısı, en erken zaman, parmak izi)
+        self._seq = itertools.count()
+        self._focus = set()
+        self._active = 0
+        self._stop = threading.Event()
+        self._scan_now = threading.Event()
+        self._threads = []
+        self.completed = 0
+        self.failed = 0
+
+    # ─── Denetim ────────────────────────────────────────────────────
+    def start(self):
+        self._threads = [threading.Thread(target=self._watch, daemon=True)]
+        self._threads += [threading.Thread(target=self._work, daemon=True) for _ in range(self.workers)]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self, wait=False):
+        self._stop.set()
+        self._scan_now.set()
+        with self._cond:
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def set_dir(self, video_dir):
+        """İzlenen klasörü değiştir; eski klasörün bekleyen işleri bırakılır."""
+        with self._cond:
+            self.video_dir = video_dir
+            self._heap.clear()
+            self._pending.clear()
+            self._seen.clear()
+            self._retry.clear()
+        self._scan_now.set()
+
+    def focus(self, paths):
+        """Açık videonun (oturum/çoklu kamerada dosyalarının) işlerini öne al.
+
+        Henüz kuyrukta olmayan dosyalar beklemeden eklenir.
+        """
+        paths = [p for p in paths if p.lower().endswith(VIDEO_EXTENSIONS)]
+        found = [self._inspect(p, cache.source_signature(p)) for p in paths]
+        with self._cond:
+            self._focus = set(paths)
+            for item in found:
+                self._enqueue(*item)
+            for path in paths:
+                for job in self.jobs:
+                    if (path, job) in self._pending:
+                        self._push(path, job)
+            self._cond.notify_all()
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending) + len(self._running)
+
+    def wait_idle(self, timeout=None):
+        """Kuyruk boşalana kadar bekle (betikler ve ölçümler için)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    # ─── Kuyruk ─────────────────────────────────────────────────────
+    def _push(self, path, job):
+        rank = 0 if path in self._focus else 1
+        heapq.heappush(self._heap, (rank, self.jobs.index(job), next(self._seq), path, job))
+
+    def _inspect(self, path, signature):
+        """(yol, imza, parmak izi, kayıtlı sonuçlar); imza değişmediyse dosya okunmaz.
+
+        Kilit dışında çağrılır: parmak izi ağ paylaşımında birkaç okuma sürer.
+        """
+        if signature is None or self._seen.get(path) == signature:
+            return path, signature, None, None
+        key = cache.fingerprint(path)
+        return path, signature, key, cache.load_results(path, key) if key else None
+
+    def _enqueue(self, path, signature, key, done):
+        """Kaydı eksik işleri kuyruğa ekle (çağıran kilidi tutar)."""
+        if key is None or self._seen.get(path) == signature:
+            return
+        self._seen[path] = signature
+        for job in self.jobs:
+            item = (path, job)
+            # Yeni içerik: önceki başarısızlıkların deneme hakkı sıfırlanır
+            self._retry.pop(item, None)
+            if job in done or item in self._running:
+                continue
+            if item not in self._pending:
+                self._push(path, job)
+            self._pending[item] = key
+
+    def _requeue_failed(self, now):
+        """Bekleme süresi dolan başarısız işleri yeniden kuyruğa al (çağıran kilidi tutar)."""
+        for item, (attempts, not_before, key) in list(self._retry.items()):
+            if now < not_before or item in self._pending or item in self._running:
+                continue
+            self._push(*item)
+            self._pending[item] = key
+
+    def scan(self):
+        """Klasörü bir kez tara; yeni ya da değişmiş ve yazımı bitmiş kayıtları kuyruğa al."""
+        video_dir = self.video_dir
+        now = time.time()
+        found = []
+        for name in list_video_sources(video_dir):
+            path = os.path.join(video_dir, name)
+            if not os.path.isfile(path) or not name.lower().endswith(VIDEO_EXTENSIONS):
+                continue
+            signature = cache.source_signature(path)
+            if signature and now - signature[1] / 1e9 >= self.settle:
+                found.append(self._inspect(path, signature))
+        with self._cond:
+            if video_dir != self.video_dir:
+                return
+            for item in found:
+                self._enqueue(*item)
+            self._requeue_failed(time.monotonic())
+            self._cond.notify_all()
+
+    def _watch(self):
+        while not self._stop.is_set():
+            try:
+                self.scan()
+            except OSError:
+                pass
+            self._scan_now.wait(self.scan_interval)
+            self._scan_now.clear()
+
+    def _next(self):
+        """Sıradaki geçerli iş; kısıtlıysa ya da kuyruk boşsa bekler."""
+        with self._cond:
+            while not self._stop.is_set():
+                throttled = self.busy()
+                limit = THROTTLED_WORKERS if throttled else self.workers
+                if self._heap and self._active < limit:
+                    _, _, _, path, job = heapq.heappop(self._heap)
+                    key = self._pending.pop((path, job), None)
+                    if key is None:
+                        continue  # öne alınırken bırakılan eski kopya
+                    self._active += 1
+                    self._running.add((path, job))
+                    return path, job, key, THROTTLED_THREADS if throttled else BACKGROUND_THREADS
+                self._cond.wait(THROTTLE_POLL_SEC if throttled else None)
+        return None
+
+    def _work(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            path, job, key, threads = item
+            ok = False
+            try:
+                result = JOB_FUNCS[job](path, threads)
+                ok = result is not None and cache.store(path, job, result, key)
+                if ok and self.on_done:
+                    self.on_done(path, job, result)
+            except Exception:
+                # Beklenmeyen hata işçiyi öldürmez; iş başarısız sayılır
+                ok = False
+            finally:
+                # Yuva her durumda bırakılır; yoksa wait_idle hiç dönmez
+                with self._cond:
+                    self._active -= 1
+                    self._running.discard((path, job))
+                    if ok:
+                        self.completed += 1
+                        self._retry.pop((path, job), None)
+                    else:
+                        self.failed += 1
+                        self._schedule_retry(path, job, key)
+                    self._cond.notify_all()
+
+    def _schedule_retry(self, path, job, key):
+        """Başarısız işin yeniden denemesini planla; hakkı bittiyse kaynak değişene kadar bırak."""
+        attempts = self._retry.get((path, job), (0, 0.0, key))[0]
+        if attempts >= RETRY_LIMIT:
+            del self._retry[(path, job)]
+            return
+        delay = RETRY_BASE_SEC * 2 ** attempts
+        self._retry[(path, job)] = (attempts + 1, time.monotonic() + delay, key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Video klasörü için arka plan ön hesaplama")
+    parser.add_argument("video_dir", help="izlenecek klasör")
+    parser.add_argument("--cache-dir", help=f"ortak önbellek klasörü (varsayılan: ${cache.CACHE_DIR_ENV} ya da "
+                                            f"{cache.DEFAULT_CACHE_DIR})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--jobs", nargs="+", choices=JOBS, default=list(JOBS))
+    parser.add_argument("--once", action="store_true", help="bir kez tara, kuyruk bitince çık")
+    args = parser.parse_args()
+    if args.cache_dir:
+        cache.set_cache_dir(args.cache_dir)
+
+    def done(path, job, result):
+        print(f"{os.path.basename(path)}: {job}", flush=True)
+
+    scheduler = PrecomputeScheduler(args.video_dir, workers=args.workers, jobs=args.jobs, on_done=done,
+                                    settle=0 if args.once else SETTLE_SEC).start()
+    try:
+        if args.once:
+            scheduler.scan()
+            scheduler.wait_idle()
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+    print(f"{scheduler.completed} iş tamamlandı, {scheduler.failed} başarısız")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Ekranda gösterilen kare saati: tuşa basıldığı anda görülen kareyi bulur.
+
+Kareyi tuvale koyan çağrı, yeniden çizimi zorladıktan hemen sonra aynı
+yerde (kare no, zaman) çiftini kaydeder; etiket sınırı, kod çözücünün o
+anki konumu yerine tuşa basıldığı anda ekranda duran karedir. İsteğe bağlı tepki süresi telafisiyle (etiketleyici
+başına) tuş anından o kadar önce ekranda olan kare alınır.
+
+Sınır hatası tasarım gereği sınırlıdır: kaydedilen kare, etiketleyicinin
+gördüğü karenin ta kendisidir; hızlı oynatmada yalnızca her `hız`. kare
+gösterildiğinden çözünürlük en çok ceil(hız) kare, telafi penceresi en çok
+MAX_REACTION_MS'dir. Bu sınır istenen an gösterim geçmişinin içindeyse
+geçerlidir: geçmiş atlama/oynatma başında sıfırlanır, o andan önceye düşen
+tuş (çoğunlukla tepki telafisiyle) geçmişin ilk karesine bağlanır ve sınır
+en çok aradaki süre kadar geç kalır. Bu durum `last["clamped_ms"]` ve
+`clamped` sayacıyla bildirilir.
+
+Tuş gecikmesi (olay damgasından işleyiciye) Tk olay saatinin (ms)
+perf_counter'a en küçük farkı taban alınarak kestirilir; iki saat farklı
+sıfır noktalı olduğundan mutlak değil, tabana göre gecikme ölçülür.
+"""
+
+import bisect
+import os
+import time
+from collections import deque
+
+from .perf import RollingHistogram
+
+REACTION_ENV = "SASA_REACTION_MS"
+MAX_REACTION_MS = 1000
+HISTORY_SEC = 3.0             # telafi için tutulan gösterim geçmişi
+CLOCK_JUMP_MS = 2000          # olay saati taşması/atlaması; taban yeniden alınır
+
+
+def default_reaction_ms():
+    """Kullanıcı ortamındaki tepki süresi telafisi (ms); tanımsız ya da geçersizse 0."""
+    try:
+        return float(os.environ.get(REACTION_ENV, 0))
+    except ValueError:
+        return 0.0
+
+
+class PresentationClock:
+    """Gösterilen karelerin (zaman, kare) geçmişi ve tuş-kare gecikme ölçümleri."""
+
+    def __init__(self, reaction_ms=0.0, window=250):
+        self.reaction_ms = max(0.0, min(float(reaction_ms), MAX_REACTION_MS))
+        self._times = deque()
+        self._frames = deque()
+        self._event_base = None      # en küçük (perf ms - olay ms)
+        self.dispatch = RollingHistogram(window)     # olay → işleyici (ms)
+        self.frame_age = RollingHistogram(window)    # kare gösterimi → tuş (ms)
+        self.drift = RollingHistogram(window)        # çözücü konumu - kaydedilen kare (kare)
+        self.clamped = 0                             # geçmişten önceye düşen basış sayısı
+        self.last = None
+
+    # Gösterim
+    def presented(self, frame_no, t=None):
+        """Kare ekrana boyandı."""
+        t = time.perf_counter() if t is None else t
+        self._times.append(t)
+        self._frames.append(frame_no)
+        while self._times and t - self._times[0] > HISTORY_SEC:
+            self._times.popleft()
+            self._frames.popleft()
+
+    def reset(self):
+        """Atlama/video değişimi: eski gösterimler yeni konuma ait değil."""
+        self._times.clear()
+        self._frames.clear()
+
+    def frame_at(self, t):
+        """t anında ekranda olan kare (geçmiş boşsa None).
+
+        t geçmişin ilk gösteriminden önceyse o anki kare bilinmez (atlamadan
+        önceki konum ya da boş ekran); geçmişin ilk karesi döner.
+        """
+        if not self._times:
+            return None
+        i = bisect.bisect_right(self._times, t) - 1
+        return self._frames[max(i, 0)]
+
+    # Tuş
+    def key_time(self, event_ms=None, now=None):
+        """Tuşa basılma anı (perf_counter sn) ve olay → işleyici gecikmesi (ms).
+
+        event_ms Tk olayının `time` alanıdır; yoksa (fare tıklaması, test)
+        gecikme 0 sayılır.
+        """
+        now = time.perf_counter() if now is None else now
+        if event_ms is None:
+            return now, 0.0
+        offset = now * 1000.0 - event_ms
+        if self._event_base is None or offset < self._event_base or offset - self._event_base > CLOCK_JUMP_MS:
+            self._event_base = offset
+        latency = offset - self._event_base
+        return now - latency / 1000.0, latency
+
+    def boundary(self, decoded_frame, event_ms=None, now=None):
+        """Etiket sınırı karesi: tuş anından reaction_ms önce ekranda olan kare.
+
+        Gösterim geçmişi yoksa (duraklatılmış, tek kare) decoded_frame döner.
+        Ölçümler `last` sözlüğüne ve kayan histogramlara yazılır.
+        """
+        key_t, latency = self.key_time(event_ms, now)
+        want_t = key_t - self.reaction_ms / 1000.0
+        frame = self.frame_at(want_t)
+        if frame is None:
+            self.last = None
+            return decoded_frame
+        # Geçmişten önceki an: sınır en çok bu kadar geç (modül açıklaması)
+        clamped_ms = max(0.0, self._times[0] - want_t) * 1000.0
+        if clamped_ms:
+            self.clamped += 1
+        # Tuş anında ekrandaki kare ne kadar süredir gösteriliyordu
+        shown_at = self._times[max(bisect.bisect_right(self._times, key_t) - 1, 0)]
+        age_ms = max(0.0, key_t - shown_at) * 1000.0
+        self.dispatch.add(latency)
+        self.frame_age.add(age_ms)
+        self.drift.add(abs(decoded_frame - frame))
+        self.last = {
+            "frame": frame,
+            "decoded_frame": decoded_frame,
+            "dispatch_ms": round(latency, 1),
+            "frame_age_ms": round(age_ms, 1),
+            "reaction_ms": self.reaction_ms,
+            "clamped_ms": round(clamped_ms, 1),
+        }
+        return frame
+
+    # Özet
+    def summary_lines(self):
+        if not len(self.dispatch):
+            return []
+        return [
+            f"tuş→kare  {len(self.dispatch)} basış  tepki telafisi {self.reaction_ms:.0f} ms"
+            + (f"  geçmiş dışı {self.clamped}" if self.clamped else ""),
+            f"{'tuş gecik.':<12}{self.dispatch.mean:>7.1f}{self.dispatch.percentile(95):>7.1f}{self.dispatch.max:>7.1f}",
+            f"{'kare yaşı':<12}{self.frame_age.mean:>7.1f}{self.frame_age.percentile(95):>7.1f}{self.frame_age.max:>7.1f}",
+            f"{'kayma (kr)':<12}{self.drift.mean:>7.1f}{'':>7}{self.drift.max:>7.0f}",
+        ]
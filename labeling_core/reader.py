@@ -0,0 +1,260 @@
+"""ffmpeg tabanlı video okuyucu (Tk gerektirmez)."""
+
+import json
+import subprocess
+
+from . import cache
+from .lazy import lazy_import
+from .perf import PerfMonitor
+from .roi import crop_filter, map_point, proxy_region
+
+np = lazy_import("numpy")
+
+DEFAULT_OUT_SIZE = (960, 540)
+
+
+def probe_video(path):
+    """ffprobe ile ilk video akışının bilgileri; video akışı yoksa None."""
+    cmd = [
+        "ffprobe", "-v", "quiet", "-print_format", "json",
+        "-show_streams", "-show_format", path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        info = json.loads(result.stdout)
+    except ValueError:
+        return None
+
+    for s in info.get("streams", []):
+        if s.get("codec_type") == "video":
+            # FPS
+            r_fps = s.get("r_frame_rate", "25/1")
+            num, den = r_fps.split("/")
+            fps = float(num) / float(den) if float(den) != 0 else 25.0
+            # Süre
+            duration = float(info.get("format", {}).get("duration", 0))
+            return {
+                "width": int(s["width"]),
+                "height": int(s["height"]),
+                "codec": s.get("codec_name", ""),
+                "fps": fps,
+                "duration": duration,
+                "total_frames": int(duration * fps),
+            }
+    return None
+
+
+class FFmpegVideoReader:
+    """HEVC/H.265 uyumlu ffmpeg tabanlı video okuyucu."""
+
+    def __init__(self, path, perf=None, out_size=DEFAULT_OUT_SIZE, scale_output=False):
+        self.path = path
+        self.perf = perf or PerfMonitor()
+        self.out_size = out_size  # ROI etkin ya da scale_output=True iken ffmpeg çıkış boyutu
+        self.scale_output = scale_output
+        self.roi = None
+        self.proxy = None  # ön hesaplanmış düşük çözünürlüklü kopya (tam karede ya da ROI izin verirse)
+        self.width = 0
+        self.height = 0
+        self.fps = 25.0
+        self.codec = ""
+        self.total_frames = 0
+        self.duration = 0.0
+        self._pipe_proc = None
+        self._current_time = 0.0  # saniye cinsinden mevcut pozisyon
+
+        self._probe()
+
+    def _probe(self):
+        """ffprobe ile video bilgilerini al (ön hesaplanmışsa kayıttan)."""
+        info = cache.cached(self.path, "probe")
+        if info is None:
+            key = cache.fingerprint(self.path)
+            info = probe_video(self.path)
+            if info:
+                cache.store(self.path, "probe", info, key)
+        if info:
+            self.width, self.height = info["width"], info["height"]
+            self.codec = info["codec"]
+            self.fps = info["fps"]
+            self.duration = info["duration"]
+            self.total_frames = info["total_frames"]
+
+    # ─── ffmpeg komutu ──────────────────────────────────────────────
+    @property
+    def frame_size(self):
+        """Boru çıkışındaki karenin (genişlik, yükseklik) değeri."""
+        if self.roi:
+            return self._roi_size()
+        if self.scale_output or self._use_proxy:
+            return self.out_size
+        return self.width, self.height
+
+    def _roi_size(self):
+        # Görüntüleme boyutundan küçük bölge büyütülmez: ffmpeg'de büyütme ve
+        # büyük kareyi boruya yazma yerine arayüz küçük kareyi tuvale gerer
+        w, h = self.roi[2], self.roi[3]
+        if w <= self.out_size[0] and h <= self.out_size[1]:
+            return w, h
+        return self.out_size
+
+    @property
+    def _use_proxy(self):
+        return bool(self.proxy) and (not self.roi or self._proxy_roi() is not None)
+
+    def _proxy_roi(self):
+        """ROI'nin proxy'deki karşılığı; proxy görüntüleme boyutunu büyütmeden karşılamıyorsa None."""
+        size = cache.proxy_size(self.path) if self.proxy and self.roi else None
+        if not size:
+            return None
+        return proxy_region(self.roi, (self.width, self.height), size, self.out_size)
+
+    def _input_args(self, start_time):
+        return ["-ss", f"{start_time:.3f}", "-i", self.proxy if self._use_proxy else self.path]
+
+    def _filter_args(self):
+        """Çıkıştan önce uygulanacak filtre argümanları.
+
+        ROI varsa bölge ffmpeg içinde kırpılır; görüntüleme boyutundan büyükse
+        oraya küçültülür, değilse kendi boyutunda bırakılır. Boruya tam kare
+        yerine en çok görüntüleme boyutunda kare yazılır.
+        """
+        w, h = self.out_size
+        if self.roi:
+            region = (self._proxy_roi() if self.proxy else None) or self.roi
+            if self._roi_size() == (region[2], region[3]):
+                return ["-vf", crop_filter(region)]
+            return ["-vf", f"{crop_filter(region)},scale={w}:{h}:flags=bilinear"]
+        if self.scale_output or self._use_proxy:
+            return ["-vf", f"scale={w}:{h}:flags=bilinear"]
+        return []
+
+    def _ffmpeg_cmd(self, start_time, frames=None):
+        cmd = ["ffmpeg", *self._input_args(start_time), *self._filter_args()]
+        if frames:
+            cmd += ["-frames:v", str(frames)]
+        return cmd + ["-f", "rawvideo", "-pix_fmt", "bgr24", "-v", "quiet", "-"]
+
+    # ─── Okuma ──────────────────────────────────────────────────────
+    def read_frame_at(self, time_sec):
+        """Belirtilen zamandaki tek frame'i oku (seek için)."""
+        time_sec = max(0, min(time_sec, self.duration - 0.1))
+        cmd = self._ffmpeg_cmd(time_sec, frames=1)
+        t0 = self.perf.clock()
+        proc = subprocess.run(cmd, capture_output=True)
+        self.perf.add("seek", t0)
+        w, h = self.frame_size
+        expected = w * h * 3
+        if len(proc.stdout) >= expected:
+            frame = np.frombuffer(proc.stdout[:expected], dtype=np.uint8).reshape(h, w, 3)
+            self._current_time = time_sec
+            return True, frame
+        return False, None
+
+    def start_streaming(self, start_time=0.0):
+        """Belirtilen zamandan itibaren sıralı frame akışı başlat."""
+        self.stop_streaming()
+        start_time = max(0, min(start_time, self.duration - 0.1))
+        self._current_time = start_time
+        cmd = self._ffmpeg_cmd(start_time)
+        self._pipe_proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    def read_next_frame(self):
+        """Akıştan sonraki frame'i oku."""
+        # Süreç bitmiş olsa da borudaki kareler okunur; EOF akış sonudur
+        if not self._pipe_proc:
+            return False, None
+        w, h = self.frame_size
+        expected = w * h * 3
+        t0 = self.perf.clock()
+        raw = self._pipe_proc.stdout.read(expected)
+        # Boru okuması ffmpeg'in kod çözmesini de bekler
+        self.perf.add("decode_read", t0)
+        if len(raw) < expected:
+            return False, None
+        frame = np.frombuffer(raw, dtype=np.uint8).reshape(h, w, 3)
+        self._current_time += 1.0 / self.fps
+        return True, frame
+
+    def skip_frames(self, count):
+        """Sonraki `count` kareyi göstermeden geç (hızlı oynatma).
+
+        Yerel akışta kareler yine de çözülüp atılır; uzak okuyucu atlanan
+        kareleri hiç istemez.
+        """
+        for _ in range(count):
+            ok, _ = self.read_next_frame()
+            if not ok:
+                return False
+        return True
+
+    def read_next_into(self, out):
+        """Sonraki kareyi önceden ayrılmış (h, w, 3) uint8 diziye oku.
+
+        Kare başına yeni bayt nesnesi oluşturulmaz; dışa aktarma gibi uzun
+        akışlarda tamponlar yeniden kullanılır.
+        """
+        # Süreç bitmiş olsa da borudaki kareler okunur; EOF akış sonudur
+        if not self._pipe_proc:
+            return False
+        view = memoryview(out).cast("B")
+        t0 = self.perf.clock()
+        got = 0
+        while got < len(view):
+            n = self._pipe_proc.stdout.readinto(view[got:])
+            if not n:
+                break
+            got += n
+        self.perf.add("decode_read", t0)
+        if got < len(view):
+            return False
+        self._current_time += 1.0 / self.fps
+        return True
+
+    def stop_streaming(self):
+        """Akışı durdur."""
+        if self._pipe_proc:
+            try:
+                self._pipe_proc.stdout.close()
+                self._pipe_proc.terminate()
+                self._pipe_proc.wait(timeout=2)
+            except Exception:
+                try:
+                    self._pipe_proc.kill()
+                except Exception:
+                    pass
+            self._pipe_proc = None
+
+    # ─── ROI ────────────────────────────────────────────────────────
+    def source_size(self, index=0):
+        return self.width, self.height
+
+    def roi_aspect(self, index=0):
+        """ROI'nin bozulmadan ölçeklenmesi için gereken en-boy oranı."""
+        return self.out_size[0] / self.out_size[1]
+
+    def get_roi(self, index=0):
+        return self.roi
+
+    def set_roi(self, roi, index=0):
+        """ROI'yi değiştir; akış varsa çağıran yeniden başlatmalıdır."""
+        self.roi = tuple(roi) if roi else None
+
+    def source_point(self, fx, fy):
+        """Çıkış karesindeki noktayı (kamera, kaynak_x, kaynak_y) olarak döndür."""
+        fw, fh = self.frame_size
+        region = self.roi or (0, 0, self.width, self.height)  # çıkışa gerilerek ölçeklenir
+        sx, sy = map_point(fx, fy, fw, fh, region, letterbox=False)
+        return 0, sx, sy
+
+    @property
+    def current_time(self):
+        return self._current_time
+
+    @property
+    def current_frame_number(self):
+        # 1/fps adımlarının kayan nokta birikimi tam kare sınırını aşağı yuvarlamasın
+        return int(self._current_time * self.fps + 1e-6)
+
+    def release(self):
+        self.stop_streaming()
@@ -0,0 +1,123 @@
+"""İlgi bölgesi (ROI): kaynak piksellerinde dikdörtgen ve kalıcı saklama.
+
+ROI, (x, y, w, h) biçiminde kaynak video pikselleriyle tutulur ve ffmpeg
+içinde `crop` ile kesilip görüntüleme boyutuna ölçeklenir; böylece yalnızca
+seçilen bölge boruya yazılır ve arayüzde yeniden boyutlandırma gerekmez.
+
+HEVC/H.264 tam kare çözülür; kırpma kod çözmeyi ucuzlatmaz. Bölge,
+görüntüleme boyutunu büyütmeden ön hesaplanmış proxy'den karşılanabiliyorsa
+(proxy_region) kaynak yerine küçük proxy çözülür.
+"""
+
+import json
+import os
+
+ROI_SUFFIX = ".roi.json"
+MIN_ROI_WIDTH = 64
+
+
+def roi_path_for(video_path):
+    return video_path + ROI_SUFFIX
+
+
+def load_roi(video_path):
+    """Videonun kayıtlı ROI'si (yoksa None)."""
+    path = roi_path_for(video_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            roi = json.load(f).get("roi")
+    except (OSError, ValueError):
+        return None
+    return tuple(int(v) for v in roi) if roi else None
+
+
+def save_roi(video_path, roi):
+    """ROI'yi videonun yanına yaz; None ise kaydı sil."""
+    path = roi_path_for(video_path)
+    if roi is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"roi": list(roi)}, f)
+
+
+def _even(v):
+    return int(v) // 2 * 2
+
+
+def normalize_roi(roi, src_w, src_h, aspect=None):
+    """ROI'yi kaynak sınırlarına kırp, en-boy oranına genişlet, çift piksele yuvarla.
+
+    `aspect` (genişlik/yükseklik) verilirse kısa kenar merkez korunarak
+    büyütülür; çıktı ölçeklemesi bozulmasın diye. Çok küçük ya da tüm kareyi
+    kaplayan seçimler için None döner.
+    """
+    x, y, w, h = (float(v) for v in roi)
+    if w < 0:
+        x, w = x + w, -w
+    if h < 0:
+        y, h = y + h, -h
+    if w < 1 or h < 1:
+        return None
+    if aspect:
+        cx, cy = x + w / 2, y + h / 2
+        if w / h < aspect:
+            w = h * aspect
+        else:
+            h = w / aspect
+        if w > src_w:
+            w, h = src_w, src_w / aspect
+        if h > src_h:
+            w, h = src_h * aspect, src_h
+        x, y = cx - w / 2, cy - h / 2
+    x = min(max(0.0, x), src_w - w)
+    y = min(max(0.0, y), src_h - h)
+    x, y, w, h = _even(x), _even(y), max(2, _even(w)), max(2, _even(h))
+    if w < MIN_ROI_WIDTH:
+        return None
+    if w >= src_w - 1 and h >= src_h - 1:
+        return None
+    return (x, y, w, h)
+
+
+def proxy_region(roi, src_size, proxy_size, display_size):
+    """ROI'nin proxy pikselleriyle karşılığı; proxy'de görüntüleme boyutundan küçük kalıyorsa None.
+
+    Proxy tüm karenin ölçeklenmiş kopyasıdır; bölge orada da en az
+    görüntüleme boyutundaysa büyütme (bulanıklık) olmadan proxy'den okunur.
+    """
+    sx, sy = proxy_size[0] / src_size[0], proxy_size[1] / src_size[1]
+    x, y, w, h = roi
+    w, h = max(2, _even(w * sx)), max(2, _even(h * sy))
+    if w < display_size[0] or h < display_size[1]:
+        return None
+    x = min(_even(x * sx), proxy_size[0] - w)
+    y = min(_even(y * sy), proxy_size[1] - h)
+    return (x, y, w, h)
+
+
+def crop_filter(roi):
+    x, y, w, h = roi
+    return f"crop={w}:{h}:{x}:{y}"
+
+
+def map_point(px, py, box_w, box_h, region, letterbox):
+    """Görüntü kutusundaki noktayı kaynak pikseline çevir.
+
+    region: kutuda gösterilen kaynak bölgesi (x, y, w, h). letterbox=True ise
+    bölge kutuya en-boy korunarak ortalanmıştır (pad), değilse kutuya gerilir.
+    """
+    rx, ry, rw, rh = region
+    if letterbox:
+        scale = min(box_w / rw, box_h / rh)
+        off_x = (box_w - rw * scale) / 2
+        off_y = (box_h - rh * scale) / 2
+        sx, sy = (px - off_x) / scale, (py - off_y) / scale
+    else:
+        sx, sy = px * rw / box_w, py * rh / box_h
+    sx = min(max(0.0, sx), rw)
+    sy = min(max(0.0, sy), rh)
+    return rx + sx, ry + sy
@@ -0,0 +1,560 @@
+"""
+Çok kullanıcılı yerel etiketleme sunucusu
+
+Bir video arşivini yerel makinede ya da yerel ağda birden çok etiketleyiciye
+sunar: ekran çözünürlüğünde JPEG kareler, küçük resimler ve etiket işlemleri
+HTTP üzerinden. ffmpeg kod çözücüleri ve kare önbelleği tüm istemciler
+arasında paylaşılır; aynı videoyu sırayla izleyen istemci, açık akıştan
+beslenir, aynı kareyi isteyen iki istemci tek kod çözme bekler.
+
+Kullanım:
+  python -m labeling_core.server --dir D:/Videolar --port 8765
+  python labeling_app.py --server http://127.0.0.1:8765
+
+API (yanıtlar JSON, kareler image/jpeg):
+  GET  /api/videos
+  GET  /api/video?id=
+  GET  /api/frame?id=&n=[&roi=x,y,w,h]
+  GET  /api/thumb?id=&n=
+  GET  /api/labels?id=[&since=SÜRÜM&wait=SANİYE]
+  POST /api/labels/add?id=     {"entry": {...}, "annotator": "..."}
+  POST /api/labels/delete?id=  {"label_id": "..."}
+  GET  /api/taxonomy           etiket kategorileri (istemciler bunu kullanır)
+  GET  /api/stats
+"""
+
+import argparse
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import cache
+from .labels import (
+    CATEGORY_CODE,
+    find_label_file,
+    label_file_path,
+    load_label_file,
+    load_taxonomy,
+    make_entry,
+    save_label_file,
+    taxonomy,
+    video_fingerprint,
+)
+from .lazy import lazy_import
+from .multiview import MultiViewReader
+from .reader import DEFAULT_OUT_SIZE
+from .roi import normalize_roi
+from .sources import VIDEO_EXTENSIONS, is_video_source, open_video
+
+cv2 = lazy_import("cv2")
+
+THUMB_SIZE = (160, 90)
+JPEG_QUALITY = 80
+FORWARD_WINDOW_FRAMES = 50   # bu kadar ilerideki kare için akış yeniden başlatılmaz, atlanır
+MAX_LABEL_WAIT = 30.0
+
+
+# ─── Kare önbelleği ─────────────────────────────────────────────────
+class FrameCache:
+    """Bayt bütçeli LRU JPEG önbelleği (tüm istemciler ortak)."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and self._items:
+                _, old = self._items.popitem(last=False)
+                self._bytes -= len(old)
+
+    def stats(self):
+        with self._lock:
+            return {"items": len(self._items), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+# ─── Kod çözücü havuzu ──────────────────────────────────────────────
+class _Decoder:
+    """Bir videoya bağlı, sıradaki kare konumunu bilen ffmpeg akışı."""
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.next_frame = None
+
+    def can_serve(self, n):
+        return self.next_frame is not None and self.next_frame <= n <= self.next_frame + FORWARD_WINDOW_FRAMES
+
+    def read(self, n):
+        r = self.reader
+        if not self.can_serve(n):
+            r.start_streaming(n / r.fps)
+            self.next_frame = n
+        while self.next_frame < n:
+            ok, _ = r.read_next_frame()
+            if not ok:
+                self.next_frame = None
+                return None
+            self.next_frame += 1
+        ok, frame = r.read_next_frame()
+        self.next_frame = n + 1 if ok else None
+        return frame if ok else None
+
+    def release(self):
+        self.reader.release()
+
+
+class DecoderPool:
+    """İstemciler arası paylaşılan, en fazla `size` ffmpeg sürecinden oluşan havuz.
+
+    Anahtar (video_id, roi). Tercih sırası: isteğe akışı ile yetişebilen boşta
+    çözücü > boş kapasite ile yeni çözücü > aynı videonun boşta çözücüsü (seek)
+    > en eski boşta çözücüyü kapatıp yenisi.
+    """
+
+    def __init__(self, open_reader, size=4):
+        self._open_reader = open_reader
+        self.size = size
+        self._idle = []   # [(anahtar, _Decoder)], en eski başta
+        self._busy = 0
+        self._cond = threading.Condition()
+
+    def read(self, key, n):
+        decoder = self._acquire(key, n)
+        try:
+            return decoder.read(n)
+        except Exception:
+            decoder.release()
+            decoder = None
+            raise
+        finally:
+            self._release(key, decoder)
+
+    def _acquire(self, key, n):
+        victim = None
+        with self._cond:
+            while True:
+                same_key = None
+                for i, (k, d) in enumerate(self._idle):
+                    if k != key:
+                        continue
+                    if d.can_serve(n):
+                        self._busy += 1
+                        return self._idle.pop(i)[1]
+                    if same_key is None:
+                        same_key = i
+                if self._busy + len(self._idle) < self.size:
+                    self._busy += 1
+                    break
+                if same_key is not None:
+                    self._busy += 1
+                    return self._idle.pop(same_key)[1]
+                if self._idle:
+                    # ffmpeg'i kapatmak sürebilir; kilit dışında, diğer istekleri bekletmeden
+                    _, victim = self._idle.pop(0)
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        if victim is not None:
+            victim.release()
+        try:
+            return _Decoder(self._open_reader(key))
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, key, decoder):
+        with self._cond:
+            self._busy -= 1
+            if decoder is not None:
+                self._idle.append((key, decoder))
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for _, d in idle:
+            d.release()
+
+    def stats(self):
+        with self._cond:
+            return {"size": self.size, "busy": self._busy, "idle": len(self._idle)}
+
+
+# ─── Etiketler ──────────────────────────────────────────────────────
+class LabelStore:
+    """Bir videonun paylaşılan etiketleri: sürüm numaralı, her değişiklikte diske yazılır.
+
+    Dosya yazımı koşul kilidi dışında yapılır; okuyucular ve uzun yoklamalar
+    diski beklemez. Yazımlar ayrı bir kilitle sıralanır ve daha yeni bir
+    sürüm yazılmışsa eski anlık görüntü atlanır.
+    """
+
+    def __init__(self, video_path, fps, total_frames):
+        self.video_path = video_path
+        self.fps = fps
+        self.total_frames = total_frames
+        self.fingerprint = video_fingerprint(video_path)
+        self.labels = load_label_file(find_label_file(video_path))
+        for entry in self.labels:
+            if entry.id is None:
+                entry.id = uuid.uuid4().hex[:12]
+        self.version = 1
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._saved_version = self.version
+
+    def snapshot(self):
+        with self._cond:
+            return self._payload()
+
+    def wait(self, since, timeout):
+        """Sürüm `since`'ten farklı olana kadar (en çok timeout sn) bekle."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != since, timeout=timeout)
+            return self._payload()
+
+    def add(self, entry, annotator=None):
+        start, end, label = int(entry["start_frame"]), int(entry["end_frame"]), entry["label"]
+        if label not in CATEGORY_CODE:
+            raise ValueError(f"Bilinmeyen etiket: {label}")
+        if end <= start:
+            raise ValueError("Bitiş karesi başlangıçtan sonra olmalı")
+        new = make_entry(start, end, label)
+        new.id = uuid.uuid4().hex[:12]
+        new.annotator = annotator or None
+        with self._cond:
+            self.labels = self.labels + [new]
+            labels, version = self._changed()
+            payload = dict(self._payload(), entry=new.to_dict(self.fps))
+        self._save(labels, version)
+        return payload
+
+    def delete(self, label_id):
+        with self._cond:
+            before = len(self.labels)
+            remaining = [e for e in self.labels if e.id != label_id]
+            if len(remaining) == before:
+                raise KeyError(label_id)
+            self.labels = remaining
+            labels, version = self._changed()
+            payload = self._payload()
+        self._save(labels, version)
+        return payload
+
+    def _payload(self):
+        # Ağ üzerinden eski (sürüm 1) sözlük biçimi gider
+        return {"version": self.version, "labels": [e.to_dict(self.fps) for e in self.labels]}
+
+    def _changed(self):
+        """Sürümü artır, bekleyenleri uyandır; yazılacak (liste, sürüm) döner (kilit tutulurken)."""
+        self.version += 1
+        self._cond.notify_all()
+        # Liste yerinde değiştirilmez (yeni liste atanır); kilit dışında okunabilir
+        return self.labels, self.version
+
+    def _save(self, labels, version):
+        with self._write_lock:
+            if version <= self._saved_version:
+                return
+            # Her değişiklikte yazılır: çevrim analizi açık kayıt/dışa aktarıma kalır
+            save_label_file(label_file_path(self.video_path), labels, self.video_path,
+                            self.fps, self.total_frames, fingerprint=self.fingerprint, analytics=False)
+            self._saved_version = version
+
+
+# ─── Sunucu ─────────────────────────────────────────────────────────
+class LabelingServer:
+    """Arşiv kataloğu, paylaşılan kod çözücüler, kare önbelleği ve etiket depoları."""
+
+    def __init__(self, video_dir, decoders=4, cache_mb=256, out_size=DEFAULT_OUT_SIZE,
+                 jpeg_quality=JPEG_QUALITY):
+        self.video_dir = os.path.realpath(video_dir)
+        self.out_size = out_size
+        self.jpeg_quality = jpeg_quality
+        self.cache = FrameCache(cache_mb * 1024 * 1024)
+        self.pool = DecoderPool(self._open_decoder_reader, size=decoders)
+        self._info = {}
+        self._content = {}   # kimlik -> kare önbelleği anahtarı (parmak izi)
+        self._stores = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    # Katalog
+    def list_videos(self):
+        ids = []
+        for root, dirs, files in os.walk(self.video_dir):
+            dirs.sort()
+            rel = os.path.relpath(root, self.video_dir)
+            for f in sorted(files):
+                if is_video_source(f):
+                    ids.append(f if rel == "." else f"{rel}/{f}".replace(os.sep, "/"))
+        return ids
+
+    def resolve(self, video_id):
+        """Kimliği arşiv içindeki mutlak yola çevir; arşiv dışına çıkışı reddet."""
+        path = os.path.realpath(os.path.join(self.video_dir, video_id))
+        if not path.startswith(self.video_dir + os.sep) or not is_video_source(path) or not os.path.exists(path):
+            raise KeyError(video_id)
+        return path
+
+    def info(self, video_id):
+        with self._lock:
+            reader = self._info.get(video_id)
+        if reader is None:
+            path = self.resolve(video_id)
+            reader = open_video(path, out_size=self.out_size, scale_output=True)
+            if reader.total_frames == 0:
+                raise KeyError(video_id)
+            # Aynı içerik (kopya, farklı klasör) kare önbelleğini paylaşır
+            content = cache.fingerprint(path) if path.lower().endswith(VIDEO_EXTENSIONS) else None
+            with self._lock:
+                self._info[video_id] = reader
+                self._content[video_id] = content or video_id
+        return reader
+
+    def video_info(self, video_id):
+        r = self.info(video_id)
+        return {
+            "id": video_id, "fps": r.fps, "total_frames": r.total_frames, "duration": r.duration,
+            "width": r.width, "height": r.height, "frame_size": list(r.frame_size),
+        }
+
+    def _open_decoder_reader(self, key):
+        video_id, roi = key
+        reader = open_video(self.resolve(video_id), out_size=self.out_size, scale_output=True)
+        if not isinstance(reader, MultiViewReader):
+            reader.set_roi(roi)
+        return reader
+
+    @staticmethod
+    def _normalize_roi(reader, roi):
+        """İstemci ROI'sini yereldeki gibi düzelt; geçersizse ValueError (400)."""
+        if isinstance(reader, MultiViewReader):
+            raise ValueError("Çoklu kamerada ROI manifestte tutulur")
+        if len(roi) != 4:
+            raise ValueError(f"ROI x,y,w,h olmalı: {roi}")
+        norm = normalize_roi(roi, reader.width, reader.height, aspect=reader.roi_aspect())
+        if norm is None:
+            raise ValueError(f"Geçersiz ROI: {roi}")
+        return norm
+
+    # Kareler
+    def frame_jpeg(self, video_id, n, roi=None, thumb=False):
+        info = self.info(video_id)
+        total = info.total_frames
+        if roi is not None:
+            # Önbellek ve kod çözücü anahtarı da düzeltilmiş bölgeyle kurulur
+            roi = self._normalize_roi(info, roi)
+        n = max(0, min(int(n), total - 1))
+        key = (self._content[video_id], n, roi, thumb)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        # Aynı kare için eşzamanlı istekleri tek kod çözmede birleştir
+        with self._lock:
+            event = self._inflight.get(key)
+            owner = event is None
+            if owner:
+                event = self._inflight[key] = threading.Event()
+        if not owner:
+            event.wait()
+            data = self.cache.get(key)
+            if data is not None:
+                return data
+
+        try:
+            frame = self.pool.read((video_id, roi), n)
+            if frame is None:
+                return None
+            if thumb:
+                frame = cv2.resize(frame, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+            data = buf.tobytes() if ok else None
+            if data:
+                self.cache.put(key, data)
+            return data
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                event.set()
+
+    # Etiketler
+    def labels(self, video_id):
+        with self._lock:
+            store = self._stores.get(video_id)
+        if store is None:
+            r = self.info(video_id)
+            with self._lock:
+                store = self._stores.setdefault(video_id, LabelStore(self.resolve(video_id), r.fps, r.total_frames))
+        return store
+
+    def stats(self):
+        return {"cache": self.cache.stats(), "decoders": self.pool.stats(), "videos_open": len(self._info)}
+
+    def make_httpd(self, host="127.0.0.1", port=8765):
+        httpd = ThreadingHTTPServer((host, port), _Handler)
+        httpd.daemon_threads = True
+        httpd.app = self
+        return httpd
+
+    def close(self):
+        self.pool.close()
+
+
+def _parse_roi(text):
+    if not text:
+        return None
+    return tuple(int(v) for v in text.split(","))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SasaLabeling/1.0"
+    # Başlık ve gövde ayrı yazılır; Nagle + gecikmeli ACK her yanıta ~40 ms ekler
+    disable_nagle_algorithm = True
+
+    def log_message(self, fmt, *args):
+        if getattr(self.server, "verbose", False):
+            super().log_message(fmt, *args)
+
+    # Yanıt yardımcıları
+    def _send(self, code, body, content_type):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, obj, code=200):
+        self._send(code, json.dumps(obj, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8")
+
+    def _error(self, code, message):
+        self._json({"error": message}, code)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _dispatch(self, routes):
+        url = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        handler = routes.get(url.path)
+        if handler is None:
+            self._error(404, "Bulunamadı")
+            return
+        try:
+            handler(query)
+        except KeyError as e:
+            self._error(404, f"Bulunamadı: {e}")
+        except (ValueError, TypeError) as e:
+            self._error(400, str(e))
+        except Exception as e:  # sunucu ayakta kalsın
+            self._error(500, f"{type(e).__name__}: {e}")
+
+    def do_GET(self):
+        self._dispatch({
+            "/api/videos": self._get_videos,
+            "/api/video": self._get_video,
+            "/api/frame": self._get_frame,
+            "/api/thumb": self._get_thumb,
+            "/api/labels": self._get_labels,
+            "/api/taxonomy": lambda q: self._json({"categories": taxonomy()}),
+            "/api/stats": lambda q: self._json(self.server.app.stats()),
+        })
+
+    def do_POST(self):
+        self._dispatch({
+            "/api/labels/add": self._add_label,
+            "/api/labels/delete": self._delete_label,
+        })
+
+    # Uç noktalar
+    def _get_videos(self, q):
+        self._json({"videos": self.server.app.list_videos()})
+
+    def _get_video(self, q):
+        self._json(self.server.app.video_info(q["id"]))
+
+    def _get_frame(self, q, thumb=False):
+        data = self.server.app.frame_jpeg(q["id"], int(q["n"]), roi=_parse_roi(q.get("roi")), thumb=thumb)
+        if data is None:
+            self._error(404, "Kare okunamadı")
+            return
+        self._send(200, data, "image/jpeg")
+
+    def _get_thumb(self, q):
+        self._get_frame(q, thumb=True)
+
+    def _get_labels(self, q):
+        store = self.server.app.labels(q["id"])
+        if "since" in q:
+            wait = min(float(q.get("wait", 0)), MAX_LABEL_WAIT)
+            self._json(store.wait(int(q["since"]), wait))
+        else:
+            self._json(store.snapshot())
+
+    def _add_label(self, q):
+        body = self._body()
+        self._json(self.server.app.labels(q["id"]).add(body["entry"], body.get("annotator")))
+
+    def _delete_label(self, q):
+        self._json(self.server.app.labels(q["id"]).delete(self._body()["label_id"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SASA POY çok kullanıcılı etiketleme sunucusu")
+    parser.add_argument("--dir", required=True, help="video arşivi klasörü")
+    parser.add_argument("--host", default="127.0.0.1", help="dinlenecek adres (ağ için 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--decoders", type=int, default=4, help="paylaşılan ffmpeg kod çözücü sayısı")
+    parser.add_argument("--cache-mb", type=int, default=256, help="JPEG kare önbelleği (MB)")
+    parser.add_argument("--cache-dir", help="ortak ön hesaplama önbelleği klasörü")
+    parser.add_argument("--taxonomy", metavar="JSON", help="etiket kategorileri yapılandırması")
+    parser.add_argument("--verbose", action="store_true", help="istekleri logla")
+    args = parser.parse_args()
+    if args.cache_dir:
+        cache.set_cache_dir(args.cache_dir)
+    if args.taxonomy:
+        load_taxonomy(args.taxonomy)
+
+    app = LabelingServer(args.dir, decoders=args.decoders, cache_mb=args.cache_mb)
+    httpd = app.make_httpd(args.host, args.port)
+    httpd.verbose = args.verbose
+    print(f"Sunucu: http://{args.host}:{args.port}  arşiv: {app.video_dir}")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        app.close()
+
+
+if __name__ == "__main__":
+    main()
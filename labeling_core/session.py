@@ -0,0 +1,245 @@
+"""Oturum: NVR'ın böldüğü ardışık kayıt dosyalarını tek zaman çizelgesinde okuma.
+
+Dosyalar verilen sırayla uç uca eklenir; her dosyanın kare sayısı global
+kare indeksinde bir aralık kaplar. Global kare indeksi tek bir kare hızı
+varsayar: kare hızı farklı dosyalardan oturum kurulmaz. Seek doğru dosyaya yönlenir, oynatma
+dosya sonuna yaklaşınca sonraki dosyanın ffmpeg süreci önceden başlatılıp
+ilk karesi arka planda okunur; sınırda bekleme olmaz.
+"""
+
+import bisect
+import copy
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .reader import DEFAULT_OUT_SIZE, FFmpegVideoReader
+
+SESSION_SUFFIX = ".session.json"
+PREWARM_SECONDS = 3.0
+FPS_TOLERANCE = 1e-3
+
+
+def session_path_for(first_video_path):
+    return first_video_path + SESSION_SUFFIX
+
+
+def is_session(path):
+    return path.lower().endswith(SESSION_SUFFIX)
+
+
+def save_session(path, paths):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"videos": [{"path": p} for p in paths]}, f, ensure_ascii=False, indent=2)
+
+
+def load_session(path):
+    """Oturumdaki video yolları; göreli yollar oturum dosyasının klasörüne göre çözülür."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    base = os.path.dirname(path)
+    return [os.path.join(base, v["path"]) for v in data["videos"]]
+
+
+class _Prewarm:
+    """Sonraki dosyanın arka planda açılışı: okuyucu, iş parçacığı ve ilk kare sonucu."""
+
+    __slots__ = ("index", "reader", "thread", "first", "done")
+
+    def __init__(self, index, reader):
+        self.index = index
+        self.reader = reader
+        self.thread = None
+        self.first = (False, None)
+        self.done = False
+
+
+class SessionReader(FFmpegVideoReader):
+    """Ardışık dosyaları tek sanal video gibi okuyan okuyucu.
+
+    Global kare = dosyanın başlangıç karesi + dosya içi kare. Dosya uzunluğu
+    probe edilen kare sayısıdır; fazla kareler atılır, eksikse bir sonraki
+    dosyanın başına atlanır, böylece seek ve oynatma aynı eşlemeyi kullanır.
+    """
+
+    def __init__(self, paths, path=None, perf=None, out_size=DEFAULT_OUT_SIZE, scale_output=False):
+        if not paths:
+            raise ValueError("Oturum için en az bir video gerekli")
+        self.paths = list(paths)
+        self.segments = []
+        self.frame_starts = []
+        self._start_times = []
+        self._active = -1
+        self._lock = threading.Lock()   # _active ve _next: oynatma ve arayüz iş parçacıkları
+        self._next = None               # ön ısıtılmış sonraki dosya (_Prewarm)
+        self._prewarming = None         # son başlatılan ön ısıtma (bırakılmış olsa bile)
+        super().__init__(path or session_path_for(paths[0]), perf=perf, out_size=out_size,
+                         scale_output=scale_output)
+
+    @classmethod
+    def from_manifest(cls, session_path, perf=None, out_size=DEFAULT_OUT_SIZE, scale_output=False):
+        return cls(load_session(session_path), path=session_path, perf=perf, out_size=out_size,
+                   scale_output=scale_output)
+
+    def _probe(self):
+        """Dosyaları paralel probe et ve global kare aralıklarını kur."""
+        def open_segment(p):
+            return FFmpegVideoReader(p, perf=self.perf, out_size=self.out_size, scale_output=self.scale_output)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(self.paths))) as pool:
+            self.segments = list(pool.map(open_segment, self.paths))
+        if any(seg.total_frames == 0 for seg in self.segments):
+            return
+        first = self.segments[0]
+        for seg in self.segments[1:]:
+            if abs(seg.fps - first.fps) > FPS_TOLERANCE:
+                raise ValueError(f"Oturumdaki dosyaların kare hızı farklı: "
+                                 f"{os.path.basename(first.path)} {first.fps:g} fps, "
+                                 f"{os.path.basename(seg.path)} {seg.fps:g} fps")
+        self.width, self.height, self.fps = first.width, first.height, first.fps
+        start = 0
+        for seg in self.segments:
+            self.frame_starts.append(start)
+            self._start_times.append(start / self.fps)
+            start += seg.total_frames
+        self.total_frames = start
+        self.duration = start / self.fps
+
+    # ─── Eşleme ─────────────────────────────────────────────────────
+    def segment_at(self, time_sec):
+        """Global zamana denk gelen dosyanın indeksi."""
+        return max(0, bisect.bisect_right(self._start_times, time_sec) - 1)
+
+    def _local_time(self, index, time_sec):
+        return time_sec - self._start_times[index]
+
+    # ─── Okuma ──────────────────────────────────────────────────────
+    def read_frame_at(self, time_sec):
+        time_sec = max(0, min(time_sec, self.duration - 0.1))
+        index = self.segment_at(time_sec)
+        ret, frame = self.segments[index].read_frame_at(self._local_time(index, time_sec))
+        if ret:
+            self._current_time = time_sec
+        return ret, frame
+
+    def start_streaming(self, start_time=0.0):
+        self.stop_streaming()
+        start_time = max(0, min(start_time, self.duration - 0.1))
+        index = self.segment_at(start_time)
+        with self._lock:
+            self._claim(index)
+            seg = self.segments[index]
+        seg.start_streaming(self._local_time(index, start_time))
+        with self._lock:
+            self._active = index
+        self._current_time = start_time
+
+    def read_next_frame(self):
+        active = self._active
+        if active < 0:
+            return False, None
+        seg = self.segments[active]
+        ret, frame = (False, None)
+        if seg.current_frame_number < seg.total_frames:
+            ret, frame = seg.read_next_frame()
+        if not ret:
+            ret, frame = self._advance(active)
+            if not ret:
+                return False, None
+            active += 1
+            seg = self.segments[active]
+
+        self._current_time = self._start_times[active] + seg.current_time
+        remaining = seg.total_frames / self.fps - seg.current_time
+        if remaining < PREWARM_SECONDS:
+            with self._lock:
+                if self._next is None and self._active == active:
+                    self._prewarm(active + 1)
+        return True, frame
+
+    def _claim(self, index):
+        """Dosyanın okuyucusunu yeni akış için ayır (kilit tutulurken).
+
+        Bırakılmış ön ısıtma hâlâ bu dosyayı açıyorsa beklenmez: okuyucu
+        nesnesi ona bırakılır (run() kendisi kapatır), dosya için akışsız
+        bir kopya kullanılır. İki iş parçacığı aynı okuyucuya dokunmaz.
+        """
+        orphan = self._prewarming
+        if orphan and orphan.index == index and not orphan.done and orphan is not self._next:
+            seg = copy.copy(self.segments[index])
+            seg._pipe_proc = None
+            self.segments[index] = seg
+            self._prewarming = None
+
+    def _prewarm(self, index):
+        """Sonraki dosyanın akışını başlat ve ilk karesini arka planda oku (kilit tutulurken)."""
+        if index >= len(self.segments):
+            return
+        self._claim(index)
+        seg = self.segments[index]
+        pending = _Prewarm(index, seg)
+
+        def run():
+            seg.start_streaming(0.0)
+            first = seg.read_next_frame()
+            with self._lock:
+                pending.first = first
+                pending.done = True
+                # Beklerken akış durdurulduysa dosyayı kapatmak bu iş parçacığına kalır;
+                # aynı dosya yeniden açıldıysa _claim() başka bir okuyucu nesnesi vermiştir
+                orphaned = self._next is not pending
+            if orphaned:
+                seg.stop_streaming()
+
+        pending.thread = threading.Thread(target=run, daemon=True)
+        self._next = self._prewarming = pending
+        pending.thread.start()
+
+    def _advance(self, active):
+        """Etkin dosyayı kapatıp sonrakine geç; ilk kareyi döndür (oynatma iş parçacığı)."""
+        self.segments[active].stop_streaming()
+        index = active + 1
+        with self._lock:
+            if self._active != active:
+                return False, None   # bu arada durduruldu
+            if index >= len(self.segments):
+                self._active = -1
+                return False, None
+            if self._next is None or self._next.index != index:
+                self._prewarm(index)
+            pending = self._next
+        t0 = self.perf.clock()
+        pending.thread.join()
+        self.perf.add("boundary", t0)
+        with self._lock:
+            if self._next is not pending:
+                return False, None   # bekleme sırasında durduruldu; dosyayı run() kapattı
+            self._next = None
+            self._active = index
+        return pending.first
+
+    def stop_streaming(self):
+        """Akışı durdur; süren ön ısıtmayı beklemez (arayüz iş parçacığı)."""
+        with self._lock:
+            pending, self._next = self._next, None
+            active, self._active = self._active, -1
+            # Bitmemiş ön ısıtmanın dosyasını run() kendisi kapatır
+            stop_pending = pending is not None and pending.done
+        if stop_pending:
+            pending.reader.stop_streaming()
+        if active >= 0:
+            self.segments[active].stop_streaming()
+
+    @property
+    def current_frame_number(self):
+        active = self._active
+        if active >= 0:
+            return self.frame_starts[active] + self.segments[active].current_frame_number
+        return super().current_frame_number
+
+    # ─── ROI: tüm dosyalar aynı kameradır ───────────────────────────
+    def set_roi(self, roi, index=0):
+        super().set_roi(roi)
+        for seg in self.segments:
+            seg.set_roi(roi)
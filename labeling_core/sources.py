@@ -0,0 +1,48 @@
+"""Video kaynakları: klasör listeleme ve yola göre doğru okuyucuyu açma."""
+
+import os
+
+from .cache import proxy_for
+from .multiview import MultiViewReader, is_manifest
+from .reader import DEFAULT_OUT_SIZE, FFmpegVideoReader
+from .roi import load_roi
+from .session import SessionReader, is_session
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+# Videodan üretilen dosyalar kaynak olarak listelenmez (etiketli video)
+DERIVED_SUFFIXES = (".burnin.mp4",)
+
+
+def is_video_source(name):
+    """Video dosyası, çoklu kamera manifesti ya da oturum dosyası mı?"""
+    lower = name.lower()
+    if lower.endswith(DERIVED_SUFFIXES):
+        return False
+    return lower.endswith(VIDEO_EXTENSIONS) or is_manifest(name) or is_session(name)
+
+
+def list_video_sources(video_dir):
+    """Klasördeki açılabilir kaynakların sıralı dosya adları."""
+    if not os.path.isdir(video_dir):
+        return []
+    return [f for f in sorted(os.listdir(video_dir)) if is_video_source(f)]
+
+
+def open_video(path, perf=None, out_size=DEFAULT_OUT_SIZE, scale_output=False):
+    """Yola göre tek video, çoklu kamera ya da oturum okuyucusu aç.
+
+    Kayıtlı ROI'ler uygulanır (çoklu kamerada kamera başına, manifestten).
+    scale_output=True iken tek video ve oturum kareleri out_size'a ffmpeg
+    içinde ölçeklenir; çoklu kamera zaten out_size mozaik üretir.
+    """
+    if is_manifest(path):
+        return MultiViewReader.from_manifest(path, out_size=out_size, perf=perf)
+    if is_session(path):
+        reader = SessionReader.from_manifest(path, perf=perf, out_size=out_size, scale_output=scale_output)
+        for seg in reader.segments:
+            seg.proxy = proxy_for(seg.path)
+    else:
+        reader = FFmpegVideoReader(path, perf=perf, out_size=out_size, scale_output=scale_output)
+        reader.proxy = proxy_for(path)
+    reader.set_roi(load_roi(path))
+    return reader
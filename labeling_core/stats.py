@@ -0,0 +1,109 @@
+"""Etiket istatistikleri ve çevrim süresi analizi."""
+
+from .cycles import analyze_cycles
+from .labels import CATEGORIES, LABEL_DISPLAY, cycle_category, label_arrays
+from .lazy import lazy_import
+from .utils import format_time
+
+np = lazy_import("numpy")
+
+STATS_HOUR_ROWS = 6   # panelde gösterilen en düşük verimli saat sayısı
+
+
+def calculate_cycle_times(labels, fps):
+    """Katma değerli işler arası çevrim sürelerini hesapla.
+    Çevrim süresi = Bir KDİ başlangıcından sonraki KDİ başlangıcına kadar geçen süre.
+    """
+    katma_entries = sorted(
+        [e for e in labels if e["label"] == cycle_category()],
+        key=lambda x: x["start_frame"]
+    )
+    cycle_times = []
+    for i in range(1, len(katma_entries)):
+        ct = (katma_entries[i]["start_frame"] - katma_entries[i - 1]["start_frame"]) / fps
+        cycle_times.append(ct)
+    return cycle_times, katma_entries
+
+
+def category_totals(labels, fps):
+    """Kategori koduna göre (adet, toplam süre sn) dizileri; kategori sayısı kadar uzun."""
+    if not labels:
+        return np.zeros(len(CATEGORIES), dtype=np.int64), np.zeros(len(CATEGORIES))
+    starts, ends, codes = label_arrays(labels)
+    counts = np.bincount(codes, minlength=len(CATEGORIES))
+    durations = np.bincount(codes, weights=(ends - starts) / fps, minlength=len(CATEGORIES))
+    return counts, durations
+
+
+def cycle_time_analysis(labels, fps, start_clock=None):
+    """JSON `cycle_time_analysis` bloğu (çevrim yoksa boş sözlük). Bkz. cycles.analyze_cycles."""
+    return analyze_cycles(labels, fps, start_clock=start_clock)
+
+
+def format_stats(labels, total_frames, fps, start_clock=None):
+    """İstatistik paneli metni."""
+    if not labels:
+        return "Henüz etiket yok.\n"
+
+    counts, durations = category_totals(labels, fps)
+    total = float(durations.sum())
+
+    video_duration = total_frames / fps if fps else 0
+    labeled_pct = (total / video_duration * 100) if video_duration else 0
+
+    stats = f"Toplam Etiket    : {len(labels)}\n"
+    for name, n, seconds in zip(CATEGORIES, counts.tolist(), durations.tolist()):
+        stats += (
+            f"─────────────────────────\n"
+            f"{LABEL_DISPLAY[name]:<17}: {n} adet\n"
+            f"  Toplam Süre    : {format_time(seconds)}\n"
+            f"  Oran           : {seconds / total * 100 if total else 0:.1f}%\n"
+        )
+    stats += (
+        f"─────────────────────────\n"
+        f"Etiketlenen      : {format_time(total)}\n"
+        f"Video Süresi     : {format_time(video_duration)}\n"
+        f"Kapsam           : {labeled_pct:.1f}%\n"
+    )
+
+    # Çevrim Süresi Analizi
+    analysis = analyze_cycles(labels, fps, start_clock=start_clock, detail=False)
+    if analysis:
+        pct = analysis["percentiles"]
+        outliers = analysis["outliers"]
+        stats += (
+            f"═════════════════════════\n"
+            f"ÇEVRİM SÜRESİ ANALİZİ\n"
+            f"─────────────────────────\n"
+            f"  Çevrim Sayısı  : {analysis['cycle_count']}\n"
+            f"  Ort. Çevrim    : {format_time(analysis['avg_cycle_time'])}\n"
+            f"  Min Çevrim     : {format_time(analysis['min_cycle_time'])}\n"
+            f"  Max Çevrim     : {format_time(analysis['max_cycle_time'])}\n"
+            f"  Ort. KDİ Süresi: {format_time(analysis['avg_kdi_duration'])}\n"
+            f"  Verimlilik     : {analysis['efficiency_pct']:.1f}%\n"
+            f"─────────────────────────\n"
+            f"  Medyan         : {format_time(pct['p50'])}\n"
+            f"  p25 - p75      : {format_time(pct['p25'])} - {format_time(pct['p75'])}\n"
+            f"  p90 / p95      : {format_time(pct['p90'])} / {format_time(pct['p95'])}\n"
+            f"  Std. Sapma     : {analysis['std_cycle_time']:.1f} sn\n"
+            f"  Aykırı Çevrim  : {outliers['count']} (> {format_time(outliers['high_fence'])})\n"
+        )
+        rolling = analysis["rolling_efficiency"]
+        if "min_pct" in rolling:
+            stats += (
+                f"  {rolling['window_sec'] // 60} dk Verim   : "
+                f"{rolling['min_pct']:.0f}% - {rolling['max_pct']:.0f}% "
+                f"(en düşük {format_time(rolling['min_window_start'])})\n"
+            )
+        for shift in analysis["shifts"]:
+            if shift["cycles"]:
+                stats += (f"  {shift['name']} ({shift['hours']}): {shift['cycles']} çevrim, "
+                          f"{shift['efficiency_pct']:.1f}%\n")
+        hours = [h for h in analysis["hourly"] if h["cycles"]]
+        if len(hours) > 1:
+            stats += "  En düşük verimli saatler:\n"
+            for h in sorted(hours, key=lambda h: h["efficiency_pct"])[:STATS_HOUR_ROWS]:
+                stats += (f"    {h['hour']:>8}: {h['cycles']:>4} çevrim, ort. "
+                          f"{format_time(h['avg_cycle_time'])}, {h['efficiency_pct']:.1f}%\n")
+
+    return stats
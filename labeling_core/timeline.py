@@ -0,0 +1,54 @@
+"""Zaman çizelgesi çizimi için kategori kapsamı.
+
+Çizelge piksel sütunlarına bölünür; her sütunda her kategorinin kapladığı
+kare sayısı, kategorinin sıralı başlangıç/bitiş dizileri üzerinde kümülatif
+toplam + searchsorted ile bulunur. Sütun, en çok kare kaplayan kategorinin
+rengini alır; bir karelik etiket bile en az bir sütun boyar. Çizilen
+dikdörtgen sayısı etiket sayısından bağımsız olarak en çok sütun sayısıdır.
+"""
+
+from .labels import CATEGORIES, label_arrays
+from .lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def _covered_before(starts, ends, t):
+    """Her t için t'den önce etiketli kare toplamı (sıralı başlangıç/bitiş dizileri)."""
+    cs = np.concatenate(([0.0], np.cumsum(starts)))
+    ce = np.concatenate(([0.0], np.cumsum(ends)))
+    i = np.searchsorted(starts, t)
+    j = np.searchsorted(ends, t)
+    return (i * t - cs[i]) - (j * t - ce[j])
+
+
+def category_coverage(labels, total_frames, bins):
+    """(kategori sayısı, bins) dizisi: her bölmede her kategorinin kapladığı kare sayısı."""
+    coverage = np.zeros((len(CATEGORIES), bins))
+    if not labels or total_frames <= 0 or bins <= 0:
+        return coverage
+    starts, ends, codes = label_arrays(labels)
+    edges = np.linspace(0.0, total_frames, bins + 1)
+    # Yalnızca kullanılan kategoriler: kayıttaki kategori sayısı maliyeti artırmaz
+    for code in np.flatnonzero(np.bincount(codes, minlength=len(CATEGORIES))).tolist():
+        selected = codes == code
+        s = np.sort(starts[selected]).astype(np.float64)
+        e = np.sort(ends[selected]).astype(np.float64)
+        coverage[code] = np.diff(_covered_before(s, e, edges))
+    return coverage
+
+
+def timeline_runs(labels, total_frames, width):
+    """Çizilecek (x1, x2, kategori adı) aralıkları; komşu aynı renkli sütunlar birleşir."""
+    coverage = category_coverage(labels, total_frames, width)
+    if not coverage.size:
+        return []
+    owner = np.where(coverage.max(axis=0) > 0, coverage.argmax(axis=0), -1)
+    change = np.flatnonzero(np.diff(owner)) + 1
+    starts = np.concatenate(([0], change))
+    ends = np.concatenate((change, [owner.size]))
+    return [
+        (x1, x2, CATEGORIES[code])
+        for x1, x2, code in zip(starts.tolist(), ends.tolist(), owner[starts].tolist())
+        if code >= 0
+    ]
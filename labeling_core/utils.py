@@ -0,0 +1,10 @@
+"""Ortak yardımcılar."""
+
+
+def format_time(seconds):
+    """Saniyeyi SS:DD:ss (bir saatten kısaysa DD:ss) metnine çevir."""
+    m, s = divmod(int(seconds) if seconds > 0 else 0, 60)
+    h, m = divmod(m, 60)
+    if h > 0:
+        return f"{h:02d}:{m:02d}:{s:02d}"
+    return f"{m:02d}:{s:02d}"
@@ -0,0 +1,40 @@
+import shutil
+import subprocess
+
+import pytest
+
+from labeling_core import cache
+from labeling_core.labels import DEFAULT_TAXONOMY, set_taxonomy
+
+
+@pytest.fixture(autouse=True)
+def default_taxonomy():
+    """Kategori kaydı modül düzeyinde; her test varsayılan kayıtla başlar."""
+    set_taxonomy(DEFAULT_TAXONOMY)
+    yield
+    set_taxonomy(DEFAULT_TAXONOMY)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    folder = tmp_path / "cache"
+    cache.set_cache_dir(str(folder))
+    yield folder
+    cache.set_cache_dir(None)
+
+
+@pytest.fixture
+def make_video(tmp_path):
+    """lavfi kaynağından küçük H.264 test videosu üreten fabrika; ffmpeg yoksa test atlanır."""
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg yok")
+
+    def make(name="src.mp4", source="testsrc", size="64x48", fps=25, duration=4):
+        path = str(tmp_path / name)
+        sep = ":" if "=" in source else "="   # "color=c=red" gibi seçenekli kaynaklar
+        subprocess.run(["ffmpeg", "-y", "-v", "error", "-f", "lavfi",
+                        "-i", f"{source}{sep}size={size}:rate={fps}:duration={duration}",
+                        "-pix_fmt", "yuv420p", "-c:v", "libx264", "-g", str(fps), path], check=True)
+        return path
+
+    return make
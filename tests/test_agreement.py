@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from labeling_core.agreement import (
+    UNLABELED,
+    analyze_agreement,
+    cohen_kappa,
+    compare,
+    confusion_matrix,
+    consensus,
+    rasterize,
+    runs,
+    to_labels,
+)
+from labeling_core.labels import CATEGORY_CODE, LABEL_DIGER, LABEL_KATMA_DEGERLI, make_entry
+
+FPS = 25.0
+K = CATEGORY_CODE[LABEL_KATMA_DEGERLI] + 1
+D = CATEGORY_CODE[LABEL_DIGER] + 1
+
+
+def _labels(*spans):
+    return [make_entry(s, e, name) for s, e, name in spans]
+
+
+def test_rasterize_marks_each_frame_and_clips_to_video():
+    frames = rasterize(_labels((2, 4, LABEL_KATMA_DEGERLI), (6, 12, LABEL_DIGER)), 8)
+    assert frames.tolist() == [0, 0, K, K, 0, 0, D, D]
+
+
+def test_rasterize_overlap_later_entry_wins():
+    frames = rasterize(_labels((0, 6, LABEL_KATMA_DEGERLI), (3, 5, LABEL_DIGER)), 6)
+    assert frames.tolist() == [K, K, K, D, D, K]
+
+
+def test_rasterize_empty():
+    assert rasterize([], 5).tolist() == [UNLABELED] * 5
+    assert rasterize([], 0).size == 0
+
+
+def test_runs_and_to_labels_invert_rasterize():
+    labels = _labels((0, 3, LABEL_DIGER), (5, 9, LABEL_KATMA_DEGERLI))
+    frames = rasterize(labels, 10)
+    starts, ends, values = runs(frames)
+    assert list(zip(starts.tolist(), ends.tolist(), values.tolist())) == [(0, 3, D), (3, 5, 0), (5, 9, K), (9, 10, 0)]
+    back = to_labels(frames)
+    assert [(e.start_frame, e.end_frame, e.label) for e in back] == [(0, 3, LABEL_DIGER), (5, 9, LABEL_KATMA_DEGERLI)]
+
+
+def test_cohen_kappa_known_value():
+    a = np.array([K, K, 0, 0], dtype=np.uint8)
+    b = np.array([K, 0, 0, 0], dtype=np.uint8)
+    cm = confusion_matrix(a, b)
+    assert cm[K, K] == 1 and cm[K, 0] == 1 and cm[0, 0] == 2
+    # po = 0.75, pe = (2*1 + 2*3) / 16 = 0.5
+    assert cohen_kappa(cm) == pytest.approx(0.5)
+
+
+def test_cohen_kappa_edge_cases():
+    same = np.array([K, K, D, 0], dtype=np.uint8)
+    assert cohen_kappa(confusion_matrix(same, same)) == pytest.approx(1.0)
+    assert cohen_kappa(np.zeros((3, 3), dtype=np.int64)) is None
+    # Tek kategori: beklenen uyum 1, kappa tanımsız yerine 1
+    ones = np.full(4, K, dtype=np.uint8)
+    assert cohen_kappa(confusion_matrix(ones, ones)) == 1.0
+
+
+def test_compare_identical_annotators():
+    labels = _labels((0, 50, LABEL_KATMA_DEGERLI), (50, 80, LABEL_DIGER))
+    result = compare(labels, labels, 100, FPS)
+    assert result["frame_agreement_pct"] == 100.0
+    assert result["kappa"] == 1.0
+    assert result["category_agreement_pct"][LABEL_KATMA_DEGERLI] == 100.0
+
+
+def test_consensus_majority_vote():
+    rasters = [
+        np.array([K, K, D, 0, K], dtype=np.uint8),
+        np.array([K, D, D, 0, 0], dtype=np.uint8),
+        np.array([K, 0, K, K, 0], dtype=np.uint8),
+    ]
+    assert consensus(rasters).tolist() == [K, 0, D, 0, 0]
+
+
+def test_consensus_two_annotators_keeps_agreement_only():
+    a = np.array([K, K, D, D], dtype=np.uint8)
+    b = np.array([K, D, D, 0], dtype=np.uint8)
+    assert consensus([a, b]).tolist() == [K, 0, D, 0]
+
+
+def test_consensus_drops_short_runs():
+    a = np.array([K, 0, 0, D, D, D], dtype=np.uint8)
+    assert consensus([a, a], min_frames=2).tolist() == [0, 0, 0, D, D, D]
+
+
+def test_analyze_agreement_pairs_and_merge():
+    a = _labels((0, 50, LABEL_KATMA_DEGERLI))
+    b = _labels((10, 50, LABEL_KATMA_DEGERLI))
+    result, merged = analyze_agreement([a, b], ["a", "b"], 100, FPS)
+    assert result["pairs"][0]["frame_agreement_pct"] == 90.0
+    assert [(e.start_frame, e.end_frame) for e in merged] == [(10, 50)]
+    assert result["consensus"]["disputed_segments"] == 1
+    assert result["consensus"]["longest_disputed"] == [{"start_frame": 0, "end_frame": 10}]
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from labeling_core import burnin
+from labeling_core.labels import LABEL_KATMA_DEGERLI, Label, category_code
+
+
+@pytest.fixture
+def tiny_video(make_video):
+    return make_video()
+
+
+def _run_with_deadline(fn, seconds):
+    result = {}
+
+    def target():
+        try:
+            result["value"] = fn()
+        except Exception as e:
+            result["error"] = e
+
+    t = threading.Thread(target=target, daemon=True)
+    t.start()
+    t.join(seconds)
+    assert not t.is_alive(), "aktarma kilitlendi"
+    return result
+
+
+def test_overlay_failure_raises_instead_of_hanging(tiny_video, tmp_path, monkeypatch):
+    def boom(*args, **kwargs):
+        # Kod çözücü tüm tamponları doldurup boş tampon beklemeye başlasın
+        time.sleep(0.5)
+        raise RuntimeError("çizim hatası")
+
+    monkeypatch.setattr(burnin, "draw_overlay", boom)
+    exporter = burnin.BurnInExporter(tiny_video, [], out_path=str(tmp_path / "out.mp4"), out_size=None, batch=2)
+    result = _run_with_deadline(exporter.run, 30)
+    assert isinstance(result.get("error"), RuntimeError)
+
+
+def test_export_writes_every_frame(tiny_video, tmp_path):
+    labels = [Label(10, 40, category_code(LABEL_KATMA_DEGERLI))]
+    exporter = burnin.BurnInExporter(tiny_video, labels, out_path=str(tmp_path / "out.mp4"), out_size=None, batch=4)
+    result = _run_with_deadline(exporter.run, 60)
+    assert "error" not in result
+    assert result["value"]["frames"] == exporter.total_frames == 100
+
+
+def _covers(plan, total):
+    pos = 0
+    for _, start, end in plan:
+        assert start == pos and end > start
+        pos = end
+    return pos == total
+
+
+def test_plan_copies_long_unlabeled_gaps_between_keyframes():
+    keyframes = list(range(0, 1000, 50))
+    plan = burnin.plan_segments([(100, 200)], 1000, 25.0, keyframes, min_copy_sec=10.0)
+    assert plan == [("encode", 0, 200), ("copy", 200, 950), ("encode", 950, 1000)]
+    assert _covers(plan, 1000)
+
+
+def test_plan_encodes_short_gaps_and_merges_overlaps():
+    keyframes = list(range(0, 1000, 50))
+    plan = burnin.plan_segments([(0, 400), (300, 700), (800, 1000)], 1000, 25.0, keyframes, min_copy_sec=10.0)
+    assert plan == [("encode", 0, 1000)]
+
+
+def test_plan_without_keyframes_encodes_everything():
+    assert burnin.plan_segments([], 500, 25.0, []) == [("encode", 0, 500)]
+
+
+def test_label_track_active_label_per_frame():
+    labels = [Label(5, 10, category_code(LABEL_KATMA_DEGERLI)), Label(10, 12, 1)]
+    track = burnin.LabelTrack(labels)
+    active = track.at(np.arange(14))
+    assert active.tolist() == [-1] * 5 + [0] * 5 + [1, 1, -1, -1]
+    assert track.intervals() == [[5, 12]]
+
+
+def test_export_replaces_output_only_on_success(tiny_video, tmp_path):
+    out = tmp_path / "out.mp4"
+    out.write_bytes(b"eski")
+    exporter = burnin.BurnInExporter(tiny_video, [], out_path=str(out), out_size=None)
+    exporter.cancel.set()
+    exporter.run()
+    # İptal edilen aktarma önceki çıktıya dokunmaz, geçici dosya bırakmaz
+    assert out.read_bytes() == b"eski"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.mp4", "src.mp4"]
+
+    burnin.BurnInExporter(tiny_video, [], out_path=str(out), out_size=None).run()
+    assert out.read_bytes()[4:8] == b"ftyp"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.mp4", "src.mp4"]
+
+
+def test_failed_export_leaves_no_partial_file(tiny_video, tmp_path, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("çizim hatası")
+
+    monkeypatch.setattr(burnin, "draw_overlay", boom)
+    exporter = burnin.BurnInExporter(tiny_video, [], out_path=str(tmp_path / "out.mp4"), out_size=None)
+    with pytest.raises(RuntimeError):
+        exporter.run()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["src.mp4"]
+
+
+def test_small_source_is_not_upscaled(tiny_video):
+    assert burnin.BurnInExporter(tiny_video, []).out_size == (64, 48)
+    assert burnin._fit_size((960, 540), (1920, 1080)) == (960, 540)
+
+
+def test_band_cache_is_bounded():
+    burnin._band_cache.clear()
+    for w in range(40, 40 + burnin.BAND_CACHE_SIZE + 10):
+        burnin._solid_band(4, w, (1, 2, 3))
+    assert len(burnin._band_cache) == burnin.BAND_CACHE_SIZE
+    assert (4, 40, (1, 2, 3)) not in burnin._band_cache
+    assert not burnin._solid_band(4, 40, (1, 2, 3)).flags.writeable
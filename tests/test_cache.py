@@ -0,0 +1,77 @@
+import os
+
+from labeling_core import cache
+from labeling_core.labels import LABEL_KATMA_DEGERLI, find_label_file, load_label_file, make_entry, save_label_file
+
+
+def _write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_fingerprint_is_content_based(tmp_path):
+    data = os.urandom(4096)
+    (tmp_path / "kopya").mkdir()
+    a = _write(tmp_path / "a.mp4", data)
+    b = _write(tmp_path / "kopya" / "b.mp4", data)
+    assert cache.fingerprint(a) == cache.fingerprint(b)
+    assert len(cache.fingerprint(a)) == 32
+    c = _write(tmp_path / "c.mp4", data[:-1] + bytes([data[-1] ^ 1]))
+    assert cache.fingerprint(c) != cache.fingerprint(a)
+
+
+def test_large_file_fingerprint_samples_the_tail(tmp_path):
+    size = cache.SAMPLE_COUNT * cache.SAMPLE_BYTES * 2
+    data = bytearray(size)
+    a = _write(tmp_path / "a.mp4", bytes(data))
+    data[-1] = 1
+    b = _write(tmp_path / "b.mp4", bytes(data))
+    assert cache.fingerprint(a) != cache.fingerprint(b)
+
+
+def test_missing_file_has_no_key(tmp_path):
+    path = str(tmp_path / "yok.mp4")
+    assert cache.fingerprint(path) is None
+    assert cache.entry_dir(path) is None
+    assert cache.artifact_path(path, cache.PROXY_FILE) is None
+
+
+def test_entry_dir_layout(tmp_path, cache_dir):
+    video = _write(tmp_path / "a.mp4", b"x" * 100)
+    key = cache.fingerprint(video)
+    assert cache.entry_dir(video) == os.path.join(str(cache_dir), key[:2], key)
+    assert cache.artifact_path(video, cache.PROXY_FILE) == os.path.join(str(cache_dir), key[:2], key, cache.PROXY_FILE)
+
+
+def test_store_and_read_back(tmp_path, cache_dir):
+    video = _write(tmp_path / "a.mp4", b"x" * 100)
+    assert cache.cached(video, "probe") is None
+    assert cache.store(video, "probe", {"fps": 25.0})
+    assert cache.cached(video, "probe") == {"fps": 25.0}
+    assert cache.store(video, "keyframes", [0, 50])
+    assert cache.load_results(video) == {"probe": {"fps": 25.0}, "keyframes": [0, 50]}
+
+
+def test_store_rejects_stale_key(tmp_path, cache_dir):
+    video = _write(tmp_path / "a.mp4", b"x" * 100)
+    key = cache.fingerprint(video)
+    with open(video, "ab") as f:   # NVR hâlâ yazıyor
+        f.write(b"y")
+    os.utime(video, ns=(0, 1))
+    assert not cache.store(video, "probe", {"fps": 25.0}, key)
+    assert cache.cached(video, "probe") is None
+
+
+def test_label_backup_only_for_the_video_labels(tmp_path, cache_dir):
+    video = _write(tmp_path / "video.mp4", b"\0" * 4096)
+    labels = [make_entry(0, 10, LABEL_KATMA_DEGERLI)]
+    backup = cache.artifact_path(video, cache.LABELS_FILE)
+
+    save_label_file(str(tmp_path / "merged.labels.json"), labels, video, 25.0, 100, backup=False)
+    assert not os.path.exists(backup)
+
+    save_label_file(video + ".labels.json", labels, video, 25.0, 100)
+    assert [(e.start_frame, e.end_frame) for e in load_label_file(backup)] == [(0, 10)]
+    assert find_label_file(video) == video + ".labels.json"
+    os.remove(video + ".labels.json")
+    assert find_label_file(video) == backup
@@ -0,0 +1,52 @@
+import pytest
+
+from labeling_core.cycles import analyze_cycles, kdi_arrays, recording_start_clock
+from labeling_core.labels import LABEL_DIGER, LABEL_KATMA_DEGERLI, make_entry
+
+FPS = 25.0
+
+
+def _cycles(starts_sec, kdi_sec=4.0, name=LABEL_KATMA_DEGERLI):
+    labels = []
+    for t in starts_sec:
+        s = int(t * FPS)
+        labels.append(make_entry(s, s + int(kdi_sec * FPS), name))
+        labels.append(make_entry(s + int(kdi_sec * FPS), s + int((kdi_sec + 1) * FPS), LABEL_DIGER))
+    return labels
+
+
+def test_kdi_arrays_sorted_by_start():
+    labels = _cycles([20, 0, 10])
+    starts, durations = kdi_arrays(labels, FPS)
+    assert starts.tolist() == [0.0, 10.0, 20.0]
+    assert durations.tolist() == [4.0, 4.0, 4.0]
+
+
+def test_cycle_times_and_efficiency():
+    result = analyze_cycles(_cycles([0, 10, 20, 32]), FPS)
+    assert result["cycle_count"] == 3
+    assert result["cycle_times"] == [10.0, 10.0, 12.0]
+    assert result["avg_cycle_time"] == pytest.approx(10.67, abs=0.01)
+    assert result["min_cycle_time"] == 10.0 and result["max_cycle_time"] == 12.0
+    assert result["efficiency_pct"] == pytest.approx(4.0 / (32 / 3) * 100, abs=0.01)
+
+
+def test_outlier_cycle_is_detected():
+    starts = [10.0 * i for i in range(20)] + [10.0 * 19 + 120.0]
+    result = analyze_cycles(_cycles(starts), FPS)
+    outliers = result["outliers"]
+    assert outliers["count"] == 1
+    assert outliers["cycles"][0]["cycle_time"] == 120.0
+
+
+def test_fewer_than_two_cycles_is_empty():
+    assert analyze_cycles(_cycles([0]), FPS) == {}
+    assert analyze_cycles([], FPS) == {}
+
+
+def test_hourly_breakdown_uses_clock_start():
+    start = recording_start_clock("/kayit/cam1_20240115_075930.mp4")
+    assert start == 7 * 3600 + 59 * 60 + 30
+    result = analyze_cycles(_cycles([0, 20, 40, 60]), FPS, start_clock=start)
+    assert [row["hour"] for row in result["hourly"]] == ["07:00", "08:00"]
+    assert recording_start_clock("/kayit/cam1.mp4") is None
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from labeling_core import cache
+from labeling_core.labels import (
+    CATEGORIES,
+    LABEL_DIGER,
+    LABEL_FORMAT,
+    LABEL_KATMA_DEGERLI,
+    Label,
+    load_label_document,
+    load_label_file,
+    make_entry,
+    save_label_file,
+)
+
+FPS = 25.0
+
+
+def _tuples(labels):
+    return [(e.start_frame, e.end_frame, e.label) for e in labels]
+
+
+def _write_v1(path, entries):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"fps": FPS, "total_frames": 1000, "labels": entries}, f)
+
+
+def test_v1_file_loads_frames_and_times(tmp_path):
+    path = tmp_path / "v1.labels.json"
+    _write_v1(path, [
+        {"start_frame": 10, "end_frame": 60, "label": LABEL_KATMA_DEGERLI, "id": 7, "annotator": "ali"},
+        {"start_time": 4.0, "end_time": 6.0, "label": LABEL_DIGER},
+    ])
+    labels = load_label_file(str(path))
+    assert _tuples(labels) == [(10, 60, LABEL_KATMA_DEGERLI), (100, 150, LABEL_DIGER)]
+    assert labels[0]["id"] == 7 and labels[0].get("annotator") == "ali"
+    assert labels[1].times(FPS)[2] == pytest.approx(2.0)
+
+
+def test_time_only_entry_needs_fps():
+    with pytest.raises(ValueError):
+        Label.from_dict({"start_time": 4.0, "end_time": 6.0, "label": LABEL_DIGER})
+
+
+def test_to_dict_adds_times_only_with_fps():
+    entry = make_entry(25, 75, LABEL_DIGER)
+    assert entry.to_dict() == {"start_frame": 25, "end_frame": 75, "label": LABEL_DIGER}
+    legacy = entry.to_dict(FPS)
+    assert legacy["start_time"] == 1.0 and legacy["duration"] == 2.0
+    assert (legacy["start_str"], legacy["end_str"]) == entry.time_strs(FPS)
+
+
+def test_v1_to_v2_round_trip(tmp_path):
+    v1 = tmp_path / "v1.labels.json"
+    _write_v1(v1, [
+        {"start_frame": 0, "end_frame": 25, "label": LABEL_DIGER},
+        {"start_frame": 25, "end_frame": 300, "label": LABEL_KATMA_DEGERLI, "annotator": "ayşe"},
+    ])
+    labels = load_label_file(str(v1))
+    v2 = tmp_path / "video.mp4.labels.json"
+    save_label_file(str(v2), labels, str(tmp_path / "video.mp4"), FPS, 1000)
+
+    doc = load_label_document(str(v2))
+    assert doc["format"] == LABEL_FORMAT
+    assert doc["categories"] == CATEGORIES
+    assert isinstance(doc["labels"], dict)
+    reloaded = load_label_file(str(v2))
+    assert _tuples(reloaded) == _tuples(labels)
+    assert [e.annotator for e in reloaded] == [None, "ayşe"]
+
+
+def test_v2_codes_follow_the_file_category_order(tmp_path):
+    path = tmp_path / "v2.labels.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "format": 2, "fps": FPS, "categories": [LABEL_DIGER, LABEL_KATMA_DEGERLI],
+            "labels": {"start_frame": [0, 50], "end_frame": [50, 80], "category": [0, 1]},
+        }, f)
+    assert _tuples(load_label_file(str(path))) == [(0, 50, LABEL_DIGER), (50, 80, LABEL_KATMA_DEGERLI)]
+
+
+def test_missing_file_is_empty(tmp_path):
+    assert load_label_file(str(tmp_path / "yok.labels.json")) == []
+
+
+def test_manifest_sources_are_not_fingerprinted(tmp_path, cache_dir):
+    manifest = tmp_path / "hat.session.json"
+    manifest.write_text("[]", encoding="utf-8")
+    path = tmp_path / "hat.session.json.labels.json"
+    save_label_file(str(path), [], str(manifest), FPS, 0)
+    assert load_label_document(str(path))["fingerprint"] is None
+    assert not cache_dir.exists()
+
+
+def test_document_layout(tmp_path):
+    path = tmp_path / "video.mp4.labels.json"
+    labels = [make_entry(0, 25, LABEL_KATMA_DEGERLI), make_entry(25, 50, LABEL_KATMA_DEGERLI)]
+    save_label_file(str(path), labels, str(tmp_path / "video.mp4"), FPS, 100)
+    text = path.read_text(encoding="utf-8")
+    lines = text.splitlines()
+    assert lines[0] == "{" and lines[-1] == "}"
+    assert lines[-2].startswith('  "labels": {') and lines[-2].endswith("}")
+    assert '\n    "cycle_count": 1,\n' in text   # iç içe bloklar da girintili
+    assert json.loads(text)["labels"]["category"] == [0, 0]
+
+
+def test_auto_save_skips_fingerprint_and_analytics(tmp_path, cache_dir, monkeypatch):
+    video = tmp_path / "video.mp4"
+    video.write_bytes(b"\0" * 4096)
+    fp = cache.fingerprint(str(video))
+    monkeypatch.setattr(cache, "fingerprint", lambda path: pytest.fail("parmak izi yeniden hesaplandı"))
+    path = str(video) + ".labels.json"
+    labels = [make_entry(0, 25, LABEL_KATMA_DEGERLI), make_entry(50, 75, LABEL_KATMA_DEGERLI)]
+
+    save_label_file(path, labels, str(video), FPS, 100, fingerprint=fp, analytics=False)
+    doc = load_label_document(path)
+    assert doc["fingerprint"] == fp
+    assert "cycle_time_analysis" not in doc
+
+    save_label_file(path, labels, str(video), FPS, 100, fingerprint=fp)
+    assert load_label_document(path)["cycle_time_analysis"]["cycle_times"] == [2.0]
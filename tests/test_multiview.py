@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from labeling_core.multiview import (
+    DECODE_FULL,
+    DECODE_PROXY,
+    DECODE_SKIP_LOOP,
+    MultiViewReader,
+    grid_for,
+    load_manifest,
+    save_manifest,
+)
+from labeling_core.roi import save_roi
+
+
+@pytest.mark.parametrize("count, grid", [(2, (2, 1)), (3, (2, 2)), (4, (2, 2)), (5, (3, 2)), (9, (3, 3))])
+def test_grid_for(count, grid):
+    assert grid_for(count) == grid
+
+
+def test_manifest_round_trip_resolves_relative_paths(tmp_path):
+    (tmp_path / "a.mp4").write_bytes(b"")
+    (tmp_path / "b.mp4").write_bytes(b"")
+    save_roi(str(tmp_path / "b.mp4"), (0, 0, 640, 360))
+    manifest = tmp_path / "a.mp4.multiview.json"
+    save_manifest(str(manifest), ["a.mp4", "b.mp4"], [0.0, 1.5], rois=[(10, 20, 320, 180), None])
+    paths, offsets, rois = load_manifest(str(manifest))
+    assert paths == [str(tmp_path / "a.mp4"), str(tmp_path / "b.mp4")]
+    assert offsets == [0.0, 1.5]
+    # Manifestte ROI'si olmayan kamera kendi .roi.json kaydını kullanır
+    assert rois == [(10, 20, 320, 180), (0, 0, 640, 360)]
+    assert json.loads(manifest.read_text())["videos"][1] == {"path": "b.mp4", "offset": 1.5}
+
+
+@pytest.fixture
+def three_cameras(make_video):
+    red = make_video("red.mp4", source="color=c=red")
+    blue = make_video("blue.mp4", source="color=c=blue")
+    green = make_video("green.mp4", source="color=c=green", duration=3)
+    return [red, blue, green]
+
+
+def test_offsets_shift_to_zero_and_duration_is_common_range(three_cameras):
+    reader = MultiViewReader(three_cameras, [2.0, 1.0, 1.0], out_size=(64, 48))
+    assert reader.offsets == [1.0, 0.0, 0.0]
+    assert reader.duration == pytest.approx(3.0)
+    assert reader.frame_size == (64, 48)
+
+
+def test_filter_graph_tiles_cameras_in_grid(three_cameras):
+    reader = MultiViewReader(three_cameras, out_size=(64, 48))
+    graph = reader._filter_args()[1]
+    assert "xstack=inputs=3:layout=0_0|32_0|0_24" in graph
+    assert graph.count("scale=32:24") == 3
+
+
+def test_mosaic_frame_places_each_camera_in_its_tile(three_cameras):
+    reader = MultiViewReader(three_cameras, out_size=(64, 48))
+    ok, frame = reader.read_frame_at(1.0)
+    assert ok and frame.shape == (48, 64, 3)
+    b, g, r = frame[12, 16].tolist()
+    assert r > 200 and b < 60                      # kırmızı: sol üst
+    b, g, r = frame[12, 48].tolist()
+    assert b > 200 and r < 60                      # mavi: sağ üst
+    assert frame[36, 16].argmax() == 1             # yeşil: sol alt
+    assert frame[36, 48].max() < 20                # boş döşeme siyah
+
+
+def test_source_point_maps_tile_to_camera(three_cameras):
+    reader = MultiViewReader(three_cameras, out_size=(64, 48))
+    index, sx, sy = reader.source_point(48, 12)
+    assert index == 1
+    assert (sx, sy) == pytest.approx((32.0, 24.0))
+    assert reader.source_point(48, 36) is None     # boş döşeme
+
+
+def test_full_quality_until_degraded(three_cameras):
+    reader = MultiViewReader(three_cameras, out_size=(64, 48))
+    assert "-skip_loop_filter" not in reader._input_args(0.0)
+    # Proxy yoksa proxy kademesi atlanır
+    assert reader.degrade() and reader.decode_level == DECODE_SKIP_LOOP
+    assert reader._input_args(0.0).count("-skip_loop_filter") == 3
+    assert not reader.degrade()
+    reader.reset_decode()
+    assert reader.decode_level == DECODE_FULL
+
+
+def test_proxy_level_reads_proxies_for_tiles_without_roi(three_cameras, tmp_path):
+    reader = MultiViewReader(three_cameras, out_size=(64, 48), rois=[None, (0, 0, 32, 24), None])
+    reader.proxies = [str(tmp_path / "p0.mp4"), str(tmp_path / "p1.mp4"), None]
+    assert reader.degrade() and reader.decode_level == DECODE_PROXY
+    args = reader._input_args(0.0)
+    inputs = [args[i + 1] for i, a in enumerate(args) if a == "-i"]
+    # ROI'li kamera kaynak pikselleriyle kırpıldığından kaynaktan okunur
+    assert inputs == [str(tmp_path / "p0.mp4"), three_cameras[1], three_cameras[2]]
+    assert "-skip_loop_filter" not in args
+    reader.degrade()
+    assert reader._input_args(0.0).count("-skip_loop_filter") == 2
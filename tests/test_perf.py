@@ -0,0 +1,40 @@
+import pytest
+
+from labeling_core.perf import RollingHistogram
+
+
+def test_percentile_reads_bucket_upper_edge():
+    h = RollingHistogram(window=100)
+    for _ in range(90):
+        h.add(0.1)
+    for _ in range(10):
+        h.add(10.0)
+    assert h.percentile(50) == 0.25
+    assert h.percentile(90) == 0.25
+    assert h.percentile(95) == 16
+    assert h.mean == pytest.approx(1.09)
+    assert h.max == 10.0
+
+
+def test_percentile_above_last_edge_is_max():
+    h = RollingHistogram()
+    h.add(1.0)
+    h.add(900.0)
+    assert h.percentile(100) == 900.0
+
+
+def test_window_drops_oldest_samples():
+    h = RollingHistogram(window=3)
+    for ms in (500.0, 500.0, 500.0, 1.0, 1.0, 1.0):
+        h.add(ms)
+    assert len(h) == 3
+    assert h.max == 1.0
+    assert h.mean == pytest.approx(1.0)
+    assert sum(h.counts) == 3
+    assert h.percentile(99) == 1
+
+
+def test_empty_histogram():
+    h = RollingHistogram()
+    assert len(h) == 0
+    assert h.mean == 0.0 and h.max == 0.0 and h.percentile(95) == 0.0
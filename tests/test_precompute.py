@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+
+import pytest
+
+from labeling_core import cache, precompute
+from labeling_core.precompute import PrecomputeScheduler, keyframe_frames
+
+
+@pytest.fixture
+def video_dir(cache_dir, tmp_path):
+    folder = tmp_path / "videos"
+    folder.mkdir()
+    for name in ("a.mp4", "b.mp4"):
+        (folder / name).write_bytes(name.encode() * 1000)
+    return folder
+
+
+def _take(scheduler, count):
+    taken = []
+    for _ in range(count):
+        path, job, _, _ = scheduler._next()
+        taken.append((os.path.basename(path), job))
+    return taken
+
+
+def test_cheap_jobs_first_then_focused_video(video_dir):
+    s = PrecomputeScheduler(str(video_dir), workers=8, jobs=("probe", "keyframes"), settle=0)
+    s.scan()
+    s.focus([str(video_dir / "b.mp4")])
+    assert _take(s, 4) == [("b.mp4", "probe"), ("b.mp4", "keyframes"),
+                           ("a.mp4", "probe"), ("a.mp4", "keyframes")]
+    assert s.pending() == 4   # hepsi çalışıyor sayılır
+
+
+def test_unchanged_files_are_not_requeued(video_dir):
+    s = PrecomputeScheduler(str(video_dir), jobs=("probe",), settle=0)
+    s.scan()
+    s.scan()
+    assert s.pending() == 2
+
+
+def test_throttled_runs_single_job_with_single_thread(video_dir):
+    playing = {"on": True}
+    s = PrecomputeScheduler(str(video_dir), workers=2, jobs=("probe",), settle=0, busy=lambda: playing["on"])
+    s.scan()
+    assert s._next()[3] == precompute.THROTTLED_THREADS
+    got = []
+    t = threading.Thread(target=lambda: got.append(s._next()), daemon=True)
+    t.start()
+    t.join(0.3)
+    assert t.is_alive()   # oynatma sürerken ikinci iş başlamaz
+    playing["on"] = False
+    t.join(precompute.THROTTLE_POLL_SEC + 1)
+    assert got and got[0][3] == precompute.BACKGROUND_THREADS
+    s.stop()
+
+
+def _run_until(scheduler, cond, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not cond():
+        time.sleep(0.02)
+
+
+def test_failed_job_is_retried_with_backoff(video_dir, monkeypatch):
+    (video_dir / "b.mp4").unlink()
+    calls = []
+
+    def flaky(path, threads):
+        calls.append(time.monotonic())
+        return {"ok": True} if len(calls) == 3 else None
+
+    monkeypatch.setitem(precompute.JOB_FUNCS, "probe", flaky)
+    monkeypatch.setattr(precompute, "RETRY_BASE_SEC", 0.1)
+    s = PrecomputeScheduler(str(video_dir), workers=1, jobs=("probe",), settle=0, scan_interval=0.02).start()
+    _run_until(s, lambda: s.completed)
+    s.stop(wait=True)
+    assert (s.completed, s.failed) == (1, 2)
+    # İkinci bekleme birincinin iki katı
+    assert calls[1] - calls[0] >= 0.1 and calls[2] - calls[1] >= 0.2
+    assert cache.cached(str(video_dir / "a.mp4"), "probe") == {"ok": True}
+
+
+def test_retries_stop_after_limit(video_dir, monkeypatch):
+    (video_dir / "b.mp4").unlink()
+    calls = []
+    monkeypatch.setitem(precompute.JOB_FUNCS, "probe", lambda path, threads: calls.append(path))
+    monkeypatch.setattr(precompute, "RETRY_BASE_SEC", 0.01)
+    monkeypatch.setattr(precompute, "RETRY_LIMIT", 2)
+    s = PrecomputeScheduler(str(video_dir), workers=1, jobs=("probe",), settle=0, scan_interval=0.02).start()
+    _run_until(s, lambda: s.failed >= 3)
+    time.sleep(0.3)
+    s.stop(wait=True)
+    assert len(calls) == 3 and not s._retry
+
+
+def test_keyframe_frames_computes_only_when_asked(video_dir, monkeypatch):
+    calls = []
+
+    def job(path, threads):
+        calls.append(path)
+        return [0, 25, 50]
+
+    monkeypatch.setattr(precompute, "job_keyframes", job)
+    path = str(video_dir / "a.mp4")
+    assert keyframe_frames(path) is None and calls == []
+    assert keyframe_frames(path, compute=True) == [0, 25, 50]
+    # Sonuç kaydedildi; bir daha ffprobe çalışmaz
+    assert keyframe_frames(path, compute=True) == [0, 25, 50] and len(calls) == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from labeling_core.presentation import MAX_REACTION_MS, PresentationClock
+
+
+def _playing(clock, first=10, count=5, t0=1.0, interval=0.04):
+    for i in range(count):
+        clock.presented(first + i, t0 + i * interval)
+
+
+def test_boundary_is_frame_on_screen_at_key_time():
+    clock = PresentationClock()
+    _playing(clock)   # 10 @1.00, 11 @1.04, 12 @1.08, 13 @1.12, 14 @1.16
+    assert clock.boundary(decoded_frame=17, now=1.10) == 12
+    assert clock.last["decoded_frame"] == 17
+    assert clock.last["frame_age_ms"] == pytest.approx(20.0)
+    assert clock.drift.max == 5
+
+
+def test_reaction_compensation_steps_back():
+    clock = PresentationClock(reaction_ms=50)
+    _playing(clock)
+    assert clock.boundary(decoded_frame=17, now=1.10) == 11
+
+
+def test_reaction_is_clamped():
+    assert PresentationClock(reaction_ms=-5).reaction_ms == 0.0
+    assert PresentationClock(reaction_ms=10_000).reaction_ms == MAX_REACTION_MS
+
+
+def test_boundary_without_history_uses_decoder_position():
+    clock = PresentationClock()
+    assert clock.boundary(decoded_frame=42, now=5.0) == 42
+    assert clock.last is None
+    _playing(clock)
+    clock.reset()
+    assert clock.boundary(decoded_frame=43, now=5.0) == 43
+
+
+def test_key_before_history_returns_oldest_frame():
+    clock = PresentationClock()
+    _playing(clock)
+    assert clock.frame_at(0.5) == 10
+
+
+def test_key_before_history_is_reported_as_clamped():
+    clock = PresentationClock(reaction_ms=300)
+    _playing(clock)   # geçmiş 1.00'da başlıyor, istenen an 0.80
+    assert clock.boundary(decoded_frame=15, now=1.10) == 10
+    assert clock.last["clamped_ms"] == pytest.approx(200.0)
+    assert clock.clamped == 1
+    clock.boundary(decoded_frame=15, now=1.40)
+    assert clock.last["clamped_ms"] == 0.0 and clock.clamped == 1
+    assert "geçmiş dışı 1" in clock.summary_lines()[0]
+
+
+def test_event_latency_is_relative_to_fastest_dispatch():
+    clock = PresentationClock()
+    # İlk olay taban olur; ikincisi 30 ms daha geç işlenmiş
+    t, latency = clock.key_time(event_ms=1000, now=2.0)
+    assert (t, latency) == (2.0, 0.0)
+    t, latency = clock.key_time(event_ms=1500, now=2.53)
+    assert latency == pytest.approx(30.0)
+    assert t == pytest.approx(2.5)
+
+
+def test_history_is_bounded():
+    clock = PresentationClock()
+    _playing(clock, count=200, interval=0.04)   # 8 sn
+    assert clock.frame_at(0.0) > 10
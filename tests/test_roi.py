@@ -0,0 +1,73 @@
+import pytest
+
+from labeling_core import cache
+from labeling_core.reader import FFmpegVideoReader
+from labeling_core.roi import map_point, normalize_roi, proxy_region
+
+
+def test_normalize_roi_orders_negative_drag_and_rounds_even():
+    assert normalize_roi((500, 400, -301, -201), 1920, 1080) == (198, 198, 300, 200)
+
+
+def test_normalize_roi_expands_to_aspect_around_centre():
+    x, y, w, h = normalize_roi((800, 400, 320, 100), 1920, 1080, aspect=16 / 9)
+    assert (w, h) == (320, 180)
+    assert y + h / 2 == pytest.approx(450, abs=2)
+
+
+def test_normalize_roi_clamps_inside_source():
+    assert normalize_roi((1800, 1000, 320, 180), 1920, 1080) == (1600, 900, 320, 180)
+
+
+@pytest.mark.parametrize("roi", [(0, 0, 0, 10), (0, 0, 40, 40), (0, 0, 1920, 1080)])
+def test_normalize_roi_rejects_tiny_or_full_frame(roi):
+    assert normalize_roi(roi, 1920, 1080) is None
+
+
+def test_map_point_stretched_and_letterboxed():
+    region = (100, 50, 200, 100)
+    assert map_point(480, 270, 960, 540, region, letterbox=False) == (200, 100)
+    # 200x100 bölge 400x400 kutuda 2 kat büyür, üst/alt 100 piksel boşluk
+    assert map_point(200, 100, 400, 400, region, letterbox=True) == (200, 50)
+    assert map_point(0, 0, 400, 400, region, letterbox=True) == (100, 50)
+
+
+def test_proxy_region_only_when_display_size_is_covered():
+    # 1920x1080 kaynak, 960x540 proxy: yarı boyut
+    assert proxy_region((0, 0, 1920, 1080), (1920, 1080), (960, 540), (480, 270)) == (0, 0, 960, 540)
+    assert proxy_region((960, 540, 960, 540), (1920, 1080), (960, 540), (480, 270)) == (480, 270, 480, 270)
+    assert proxy_region((960, 540, 640, 360), (1920, 1080), (960, 540), (480, 270)) is None
+
+
+@pytest.fixture
+def reader(cache_dir, make_video):
+    return FFmpegVideoReader(make_video(size="320x240"), out_size=(160, 120))
+
+
+def test_small_roi_is_cropped_without_upscaling(reader):
+    reader.set_roi((40, 40, 80, 60))
+    assert reader.frame_size == (80, 60)
+    assert reader._filter_args() == ["-vf", "crop=80:60:40:40"]
+    ok, frame = reader.read_frame_at(1.0)
+    assert ok
+    assert frame.shape[:2] == (60, 80)
+    # Çıkış karesinin ortası bölgenin ortasına düşer
+    assert reader.source_point(40, 30) == (0, 80, 70)
+
+
+def test_large_roi_is_scaled_down_to_display(reader):
+    reader.set_roi((0, 0, 240, 180))
+    assert reader.frame_size == (160, 120)
+    assert reader._filter_args()[1].startswith("crop=240:180:0:0,scale=160:120")
+
+
+def test_roi_reads_from_proxy_when_it_covers_the_display(reader, make_video):
+    proxy = make_video("proxy.mp4", size="160x120")
+    cache.store(reader.path, "proxy", {"path": proxy, "size": [160, 120]})
+    reader.proxy = proxy
+    reader.set_roi((0, 0, 160, 120))
+    # Proxy'de bölge 80x60: görüntülemeyi karşılamıyor, kaynaktan okunur
+    assert not reader._use_proxy
+    reader.out_size = (80, 60)
+    assert reader._use_proxy
+    assert reader._filter_args() == ["-vf", "crop=80:60:0:0"]
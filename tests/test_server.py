@@ -0,0 +1,218 @@
+import threading
+
+import numpy as np
+import pytest
+
+from labeling_core import server as server_mod
+from labeling_core.client import RemoteClient, RemoteError, RemoteVideoReader
+from labeling_core.labels import label_file_path, load_label_file
+from labeling_core.server import DecoderPool, LabelingServer, LabelStore
+
+
+def _held_elsewhere(lock):
+    """Kilit başka bir iş parçacığında tutuluyor mu (Condition RLock'u yeniden girilebilir)."""
+    result = []
+
+    def probe():
+        got = lock.acquire(blocking=False)
+        if got:
+            lock.release()
+        result.append(not got)
+
+    t = threading.Thread(target=probe)
+    t.start()
+    t.join()
+    return result[0]
+
+
+# ─── Kod çözücü havuzu ──────────────────────────────────────────────
+class _FakeReader:
+    fps = 25.0
+
+    def __init__(self, key, pool_ref):
+        self.key = key
+        self.pool_ref = pool_ref
+        self.pos = 0
+        self.starts = 0
+        self.released_under_lock = None
+
+    def start_streaming(self, t):
+        self.starts += 1
+        self.pos = int(t * self.fps + 1e-6)
+
+    def read_next_frame(self):
+        self.pos += 1
+        return True, self.pos - 1
+
+    def release(self):
+        self.released_under_lock = _held_elsewhere(self.pool_ref[0]._cond)
+
+
+@pytest.fixture
+def pool():
+    opened = []
+    ref = []
+
+    def open_reader(key):
+        reader = _FakeReader(key, ref)
+        opened.append(reader)
+        return reader
+
+    p = DecoderPool(open_reader, size=1)
+    ref.append(p)
+    p.opened = opened
+    return p
+
+
+def test_pool_continues_stream_for_forward_reads(pool):
+    assert pool.read(("a", None), 10) == 10
+    assert pool.read(("a", None), 12) == 12
+    assert len(pool.opened) == 1 and pool.opened[0].starts == 1
+
+
+def test_pool_evicts_idle_decoder_outside_the_lock(pool):
+    pool.read(("a", None), 0)
+    pool.read(("b", None), 0)
+    a, b = pool.opened
+    assert a.released_under_lock is False
+    assert pool.stats() == {"size": 1, "busy": 0, "idle": 1}
+    pool.close()
+    assert b.released_under_lock is False
+
+
+# ─── Etiket deposu ──────────────────────────────────────────────────
+@pytest.fixture
+def store(cache_dir, tmp_path, monkeypatch):
+    video = tmp_path / "v.mp4"
+    video.write_bytes(b"")
+    s = LabelStore(str(video), 25.0, 250)
+    writes = []
+    real_save = server_mod.save_label_file
+
+    def save(path, labels, *args, **kwargs):
+        writes.append((len(labels), _held_elsewhere(s._cond)))
+        real_save(path, labels, *args, **kwargs)
+
+    monkeypatch.setattr(server_mod, "save_label_file", save)
+    s.writes = writes
+    return s
+
+
+def test_label_store_writes_outside_condition(store):
+    added = store.add({"start_frame": 0, "end_frame": 25, "label": "diger"}, "ayse")
+    assert added["version"] == 2 and added["entry"]["annotator"] == "ayse"
+    store.delete(added["entry"]["id"])
+    assert store.writes == [(1, False), (0, False)]
+    assert load_label_file(label_file_path(store.video_path)) == []
+
+
+def test_label_store_skips_stale_snapshot(store):
+    store.add({"start_frame": 0, "end_frame": 25, "label": "diger"})
+    store._save([], 1)   # gecikmiş eski yazım daha yeni sürümün üstüne yazmaz
+    assert store.writes == [(1, False)]
+
+
+def test_label_store_rejects_bad_entries(store):
+    with pytest.raises(ValueError):
+        store.add({"start_frame": 0, "end_frame": 25, "label": "yok"})
+    with pytest.raises(ValueError):
+        store.add({"start_frame": 30, "end_frame": 25, "label": "diger"})
+    with pytest.raises(KeyError):
+        store.delete("yok")
+    assert store.version == 1 and store.writes == []
+
+
+# ─── HTTP ───────────────────────────────────────────────────────────
+@pytest.fixture
+def remote(cache_dir, make_video, tmp_path):
+    make_video("cam.mp4", size="320x240", duration=2)
+    app = LabelingServer(str(tmp_path), decoders=2, cache_mb=8, out_size=(160, 90))
+    httpd = app.make_httpd(port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield RemoteClient(f"127.0.0.1:{httpd.server_address[1]}", annotator="test")
+    httpd.shutdown()
+    httpd.server_close()
+    app.close()
+
+
+def test_http_video_and_frames(remote):
+    assert remote.list_videos() == ["cam.mp4"]
+    info = remote.video_info("cam.mp4")
+    assert info["total_frames"] == 50 and info["frame_size"] == [160, 90]
+    assert remote.frame("cam.mp4", 10)[:2] == b"\xff\xd8"
+    with pytest.raises(RemoteError, match="404"):
+        remote.frame("yok.mp4", 0)
+
+
+@pytest.mark.parametrize("roi", ["1,2,3", "a,b,c,d", "0,0,4,4", "10,10,0,40"])
+def test_http_rejects_bad_roi(remote, roi):
+    with pytest.raises(RemoteError, match="400"):
+        remote._request("GET", "/api/frame", {"id": "cam.mp4", "n": 0, "roi": roi})
+
+
+def test_http_roi_is_normalized(remote):
+    reader = RemoteVideoReader(remote, "cam.mp4")
+    # Sürükleme yönü ve tek piksel kaymalar aynı bölgeye düzelir
+    a = remote.frame("cam.mp4", 5, (200, 150, -81, -45))
+    b = remote.frame("cam.mp4", 5, (119, 105, 81, 45))
+    assert a == b
+    reader.set_roi((40, 40, 80, 45))
+    ok, frame = reader.read_frame_at(0.2)
+    assert ok and frame.shape[:2] == (44, 80)
+
+
+def test_http_label_round_trip(remote):
+    added = remote.add_label("cam.mp4", {"start_frame": 0, "end_frame": 10, "label": "diger"})
+    assert added["entry"]["annotator"] == "test"
+    assert remote.labels("cam.mp4")["version"] == added["version"]
+    with pytest.raises(RemoteError, match="400"):
+        remote.add_label("cam.mp4", {"start_frame": 0, "end_frame": 10, "label": "yok"})
+
+
+# ─── İstemci ön getirme ─────────────────────────────────────────────
+class _FakeClient:
+    def video_info(self, video_id):
+        return {"width": 64, "height": 48, "fps": 25.0, "total_frames": 200, "duration": 8.0,
+                "frame_size": [64, 48]}
+
+
+@pytest.fixture
+def remote_reader():
+    reader = RemoteVideoReader(_FakeClient(), "v.mp4")
+    reader.fetched = []
+
+    def fetch(n):
+        reader.fetched.append(n)
+        return np.full((2, 2, 3), n % 256, np.uint8)
+
+    reader._fetch = fetch
+    yield reader
+    reader.stop_streaming()
+
+
+def test_prefetch_requests_only_shown_frames(remote_reader):
+    r = remote_reader
+    r.skip_frames(3)
+    r.start_streaming(0.0)
+    shown = []
+    for _ in range(5):
+        ok, frame = r.read_next_frame()
+        shown.append(int(frame[0, 0, 0]))
+        r.skip_frames(3)
+    assert shown == [0, 4, 8, 12, 16]
+    assert all(n % 4 == 0 for n in r.fetched)
+
+
+def test_prefetch_follows_slower_speed(remote_reader):
+    r = remote_reader
+    r.skip_frames(3)
+    r.start_streaming(0.0)
+    r.read_next_frame()
+    r.skip_frames(3)
+    r.read_next_frame()
+    r.skip_frames(0)
+    # 4'er adımla istenmiş kareler atılır, gösterilecek kare yeniden istenir
+    ok, frame = r.read_next_frame()
+    assert ok and int(frame[0, 0, 0]) == 5
+    assert r.current_frame_number == 6
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from labeling_core.session import SessionReader
+
+
+def _colour(frame):
+    b, g, r = frame.reshape(-1, 3).mean(axis=0)
+    return "red" if r > b else "blue"
+
+
+@pytest.fixture
+def session(cache_dir, make_video):
+    red = make_video("a.mp4", source="color=c=red", duration=2)
+    blue = make_video("b.mp4", source="color=c=blue", duration=2)
+    reader = SessionReader([red, blue])
+    yield reader
+    reader.stop_streaming()
+
+
+def test_global_frame_ranges(session):
+    assert session.frame_starts == [0, 50]
+    assert session.total_frames == 100
+    assert session.segment_at(1.99) == 0
+    assert session.segment_at(2.0) == 1
+
+
+def test_playback_rolls_over_without_losing_frames(session):
+    session.start_streaming(1.0)
+    colours, numbers = [], []
+    while True:
+        numbers.append(session.current_frame_number)
+        ok, frame = session.read_next_frame()
+        if not ok:
+            break
+        colours.append(_colour(frame))
+    assert numbers[:-1] == list(range(25, 100))
+    assert colours == ["red"] * 25 + ["blue"] * 50
+
+
+def test_near_end_prewarms_next_segment(session):
+    session.start_streaming(1.5)
+    session.read_next_frame()
+    pending = session._next
+    assert pending is not None and pending.index == 1
+    pending.thread.join()
+    assert pending.done and _colour(pending.first[1]) == "blue"
+
+
+def test_restart_does_not_wait_for_abandoned_prewarm(session):
+    seg = session.segments[1]
+    gate = threading.Event()
+    original = seg.start_streaming
+
+    def slow_start(start_time=0.0):
+        gate.wait(5)   # ön ısıtma dosyayı açarken takılı kalır
+        original(start_time)
+
+    seg.start_streaming = slow_start
+    session.start_streaming(1.5)
+    session.read_next_frame()
+    orphan = session._next
+    session.stop_streaming()
+
+    del seg.start_streaming   # yeni okuyucu kopyası takılmasın
+    session.start_streaming(2.0)
+    assert not orphan.done
+    assert session.segments[1] is not seg
+    ok, frame = session.read_next_frame()
+    assert ok and _colour(frame) == "blue"
+
+    gate.set()
+    orphan.thread.join()
+    # Bırakılan okuyucunun akışını ön ısıtma iş parçacığı kapatır
+    assert seg._pipe_proc is None
+    assert session.read_next_frame()[0]
+
+
+def test_mixed_frame_rates_are_rejected(cache_dir, make_video):
+    a = make_video("a.mp4", fps=25, duration=1)
+    b = make_video("b.mp4", fps=30, duration=1)
+    with pytest.raises(ValueError, match="kare hızı"):
+        SessionReader([a, b])
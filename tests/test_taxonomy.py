@@ -0,0 +1,75 @@
+import pytest
+
+from labeling_core.cycles import analyze_cycles
+from labeling_core.labels import (
+    CATEGORIES,
+    CATEGORY_CODE,
+    LABEL_COLORS,
+    LABEL_DIGER,
+    LABEL_KATMA_DEGERLI,
+    category_code,
+    labels_from_document,
+    make_entry,
+    set_taxonomy,
+    taxonomy,
+)
+
+FPS = 25.0
+
+
+def test_unknown_category_is_rejected_without_touching_registry():
+    assert category_code(LABEL_KATMA_DEGERLI) == 0
+    for name in ("bekleme", ""):
+        with pytest.raises(ValueError):
+            category_code(name)
+    assert CATEGORIES == [LABEL_KATMA_DEGERLI, LABEL_DIGER]
+    assert "bekleme" not in LABEL_COLORS
+
+
+def test_foreign_file_names_every_unknown_category():
+    doc = {"format": 2, "fps": FPS, "categories": ["bekleme", LABEL_DIGER, "arıza"],
+           "labels": {"start_frame": [0, 10], "end_frame": [10, 20], "category": [0, 2]}}
+    with pytest.raises(ValueError, match="arıza, bekleme"):
+        labels_from_document(doc)
+    v1 = {"fps": FPS, "labels": [{"start_frame": 0, "end_frame": 5, "label": "bekleme"}]}
+    with pytest.raises(ValueError, match="bekleme"):
+        labels_from_document(v1)
+    assert len(CATEGORIES) == 2
+
+
+def test_unused_foreign_category_in_file_is_ignored():
+    doc = {"format": 2, "fps": FPS, "categories": ["bekleme", LABEL_DIGER],
+           "labels": {"start_frame": [0], "end_frame": [10], "category": [1]}}
+    assert [e.label for e in labels_from_document(doc)] == [LABEL_DIGER]
+
+
+def test_set_taxonomy_replaces_registry_in_place():
+    set_taxonomy([
+        {"name": "a", "color": "#000000", "key": "a"},
+        {"name": "b", "color": "#ffffff", "cycle": True},
+    ])
+    assert CATEGORIES == ["a", "b"] and CATEGORY_CODE == {"a": 0, "b": 1}
+    assert [c["cycle"] for c in taxonomy()] == [False, True]
+    assert make_entry(0, 5, "b").code == 1
+
+
+@pytest.mark.parametrize("categories", [
+    [],
+    [{"name": "a", "color": "kırmızı"}],
+    [{"name": "a", "color": "#000000"}, {"name": "a", "color": "#000000"}],
+    [{"name": "a", "color": "#000000", "key": "s"}],
+    [{"name": "a", "color": "#000000", "cycle": True}, {"name": "b", "color": "#000000", "cycle": True}],
+])
+def test_set_taxonomy_rejects_invalid_config(categories):
+    with pytest.raises(ValueError):
+        set_taxonomy(categories)
+
+
+def test_cycle_category_follows_taxonomy():
+    set_taxonomy([
+        {"name": "montaj", "color": "#00ff00", "cycle": True},
+        {"name": LABEL_DIGER, "color": "#ff0000"},
+    ])
+    labels = [make_entry(0, 100, "montaj"), make_entry(100, 375, LABEL_DIGER),
+              make_entry(375, 500, "montaj")]
+    assert analyze_cycles(labels, FPS)["cycle_times"] == [15.0]
@@ -0,0 +1,37 @@
+from labeling_core.labels import (
+    DEFAULT_TAXONOMY,
+    LABEL_DIGER,
+    LABEL_KATMA_DEGERLI,
+    category_code,
+    make_entry,
+    set_taxonomy,
+)
+from labeling_core.timeline import category_coverage, timeline_runs
+
+
+def test_runs_merge_adjacent_columns():
+    labels = [make_entry(0, 500, LABEL_KATMA_DEGERLI), make_entry(500, 1000, LABEL_DIGER)]
+    assert timeline_runs(labels, 1000, 10) == [(0, 5, LABEL_KATMA_DEGERLI), (5, 10, LABEL_DIGER)]
+
+
+def test_single_frame_label_paints_a_column():
+    labels = [make_entry(123, 124, LABEL_DIGER)]
+    assert timeline_runs(labels, 1000, 10) == [(1, 2, LABEL_DIGER)]
+
+
+def test_column_goes_to_the_majority_category():
+    labels = [make_entry(0, 30, LABEL_KATMA_DEGERLI), make_entry(30, 100, LABEL_DIGER)]
+    assert timeline_runs(labels, 100, 1) == [(0, 1, LABEL_DIGER)]
+
+
+def test_coverage_counts_frames_per_category():
+    set_taxonomy(list(DEFAULT_TAXONOMY) + [{"name": "bekleme", "color": "#7f849c"}])
+    labels = [make_entry(0, 25, "bekleme"), make_entry(50, 100, LABEL_KATMA_DEGERLI)]
+    coverage = category_coverage(labels, 100, 2)
+    assert coverage.shape == (3, 2)
+    assert coverage[category_code("bekleme")].tolist() == [25.0, 0.0]
+    assert coverage[category_code(LABEL_KATMA_DEGERLI)].tolist() == [0.0, 50.0]
+
+
+def test_empty_timeline():
+    assert timeline_runs([], 1000, 10) == []